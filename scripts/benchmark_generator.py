@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Generator Benchmark Suite
+Runs generate_data.py at several scale factors of the CONFIG volumes and records the
+wall time, rows/sec and peak RSS of every generation phase in a JSON history file.
+`compare` flags phases that got slower (or bigger) than a baseline run.
+
+Runs offline: CSV output only, into a temporary directory, without PostgreSQL insertion.
+Every scale factor runs in a fresh process so its peak RSS is its own.
+
+Usage:
+    python3 benchmark_generator.py run [--scales 0.01 0.1 1] [--set engine=numpy] [--label NAME]
+    python3 benchmark_generator.py compare [--baseline LABEL] [--threshold 0.10]
+"""
+
+import os
+import sys
+import ast
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_HISTORY_FILE = SCRIPT_DIR / 'benchmark_history.json'
+DEFAULT_SCALES = (0.01, 0.1, 1.0)
+REFERENCE_TIME = '2025-06-30 12:00:00'  # Fixed so every run generates the same rows
+
+def parse_overrides(assignments: List[str]) -> Dict:
+    """KEY=VALUE strings -> CONFIG overrides (values are Python literals, else strings)"""
+    overrides = {}
+    for assignment in assignments or ():
+        key, sep, value = assignment.partition('=')
+        if not sep:
+            raise ValueError(f"Expected KEY=VALUE, got {assignment!r}")
+        try:
+            overrides[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[key] = value
+    return overrides
+
+# ============================================================================
+# SINGLE SCALE RUN
+# ============================================================================
+
+def run_scale(scale: float, overrides: Dict = None) -> Dict:
+    """
+    Generate the data set once at `scale` times the CONFIG volumes in this process.
+
+    Phase timings are the generator's own RUN_METRICS records (see INSTRUMENTATION).
+    """
+    import generate_data
+
+    config = generate_data.CONFIG
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as work_dir:
+        generate_data.apply_scale_factor(scale)
+        config.update(output_dir=os.path.join(work_dir, 'out'), output_formats=('csv',), checkpoints=False,
+                      reference_time=REFERENCE_TIME,
+                      verticals_master_file=str(SCRIPT_DIR / config['verticals_master_file']))
+        config.update(overrides or {})
+        if 'postgres' in config['output_formats']:
+            print("⚠️  Benchmarks run offline, dropping the postgres output")
+            config['output_formats'] = tuple(fmt for fmt in config['output_formats'] if fmt != 'postgres') or ('csv',)
+
+        start = time.perf_counter()
+        counts = generate_data.generate_and_export_all()
+        total_seconds = time.perf_counter() - start
+        output_bytes = sum(entry.stat().st_size for entry in Path(config['output_dir']).rglob('*') if entry.is_file())
+
+    phases = {phase: {key: record[key] for key in ('seconds', 'rows', 'rows_per_sec', 'bytes', 'peak_rss_mb')}
+              for phase, record in generate_data.RUN_METRICS.phases.items()}
+
+    rows = sum(counts.values())
+    return {
+        'scale': scale,
+        'volumes': {key: config[key] for key in generate_data.SCALED_VOLUMES},
+        'seconds': round(total_seconds, 4),
+        'rows': rows,
+        'rows_per_sec': round(rows / total_seconds, 1),
+        'peak_rss_mb': generate_data.peak_rss_mb(),
+        'output_mb': round(output_bytes / 1024 / 1024, 2),
+        'phases': phases,
+    }
+
+def run_scale_in_subprocess(scale: float, assignments: List[str], verbose: bool = False) -> Dict:
+    """Run one scale factor in a fresh interpreter (see the `scale` command) and return its result"""
+    with tempfile.TemporaryDirectory(prefix='benchmark_result_') as result_dir:
+        result_path = os.path.join(result_dir, 'result.json')
+        command = [sys.executable, str(Path(__file__).resolve()), 'scale', str(scale), '--result', result_path]
+        for assignment in assignments or ():
+            command += ['--set', assignment]
+        output = None if verbose else subprocess.DEVNULL
+        completed = subprocess.run(command, cwd=SCRIPT_DIR, stdout=output,
+                                   stderr=None if verbose else subprocess.PIPE, text=True)
+        if completed.returncode != 0:
+            details = '' if verbose else '\n' + completed.stderr[-2000:]
+            raise RuntimeError(f"Benchmark at scale {scale} failed (exit code {completed.returncode}){details}")
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+# ============================================================================
+# HISTORY
+# ============================================================================
+
+def load_history(path: Path) -> Dict:
+    if not path.exists():
+        return {'runs': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_history(path: Path, history: Dict):
+    """Rewrite the history file through a temporary file so a crash never truncates it"""
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+
+def git_revision() -> str:
+    """`git describe` of the working tree (None outside a git checkout)"""
+    try:
+        completed = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=SCRIPT_DIR,
+                                   capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None if completed.returncode == 0 else None
+
+def find_run(history: Dict, selector: str) -> Dict:
+    """A run by label, or by index into the history (negative counts from the end)"""
+    runs = history['runs']
+    matches = [run for run in runs if run['label'] == selector]
+    if matches:
+        return matches[-1]
+    try:
+        return runs[int(selector)]
+    except (ValueError, IndexError):
+        raise ValueError(f"No benchmark run {selector!r} in the history ({len(runs)} runs)")
+
+def print_run(result: Dict):
+    """Per-phase table of one scale factor's result"""
+    print(f"\n📏 Scale {result['scale']}: " + ', '.join(f"{key[4:]}={value:,}" for key, value in result['volumes'].items()))
+    print(f"   {'phase':<24}{'seconds':>10}{'rows':>12}{'rows/sec':>12}{'peak RSS MB':>13}")
+    for phase, stats in list(result['phases'].items()) + [('total', result)]:
+        rows_per_sec = f"{stats['rows_per_sec']:,.0f}" if stats['rows_per_sec'] is not None else '-'
+        rss = f"{stats['peak_rss_mb']:,.1f}" if stats['peak_rss_mb'] is not None else '-'
+        print(f"   {phase:<24}{stats['seconds']:>10.3f}{stats['rows']:>12,}{rows_per_sec:>12}{rss:>13}")
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+
+def compare_runs(baseline: Dict, current: Dict, threshold: float, min_seconds: float) -> List[str]:
+    """
+    Print the change of every phase between two runs; returns the regressions.
+
+    A phase regresses when its time grows by more than `threshold` (phases shorter
+    than min_seconds in the baseline are too noisy to judge), or when it raised the
+    peak RSS (which only ever grows) more than `threshold` above the baseline's.
+    """
+    regressions = []
+    if baseline.get('overrides') != current.get('overrides'):
+        print(f"⚠️  Different CONFIG overrides: {baseline.get('overrides')} vs {current.get('overrides')}")
+
+    for scale, result in current['scales'].items():
+        base = baseline['scales'].get(scale)
+        if base is None:
+            print(f"\n📏 Scale {scale}: not in the baseline, skipped")
+            continue
+        print(f"\n📏 Scale {scale}")
+        print(f"   {'phase':<24}{'baseline s':>12}{'current s':>12}{'change':>10}{'peak RSS MB':>20}")
+        previous_rss = 0
+        for phase in list(result['phases']) + ['total']:
+            stats = result if phase == 'total' else result['phases'][phase]
+            base_stats = base if phase == 'total' else base['phases'].get(phase)
+            if base_stats is None:
+                continue
+            change = stats['seconds'] / base_stats['seconds'] - 1 if base_stats['seconds'] > 0 else 0.0
+            flags = []
+            if base_stats['seconds'] >= min_seconds and change > threshold:
+                flags.append('time')
+                regressions.append(f"scale {scale} {phase}: {base_stats['seconds']:.3f}s -> "
+                                   f"{stats['seconds']:.3f}s ({change:+.1%})")
+            rss = '-'
+            if stats['peak_rss_mb'] is not None and base_stats['peak_rss_mb']:
+                rss_change = stats['peak_rss_mb'] / base_stats['peak_rss_mb'] - 1
+                rss = f"{base_stats['peak_rss_mb']:.0f} -> {stats['peak_rss_mb']:.0f}"
+                if rss_change > threshold and (phase == 'total' or stats['peak_rss_mb'] > previous_rss):
+                    flags.append('memory')
+                    regressions.append(f"scale {scale} {phase}: peak RSS {rss} MB ({rss_change:+.1%})")
+                previous_rss = stats['peak_rss_mb']
+            marker = f"  ❌ {'+'.join(flags)}" if flags else ''
+            print(f"   {phase:<24}{base_stats['seconds']:>12.3f}{stats['seconds']:>12.3f}{change:>+10.1%}{rss:>20}{marker}")
+    return regressions
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark generate_data.py at several scale factors")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="benchmark every scale factor and append the results to the history")
+    run.add_argument('--scales', type=float, nargs='+', default=list(DEFAULT_SCALES),
+                     help="fractions of the CONFIG volumes (default: 0.01 0.1 1)")
+    run.add_argument('--repeat', type=int, default=1, help="runs per scale factor; the fastest is kept")
+    run.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE',
+                     help="CONFIG override for the benchmarked runs, e.g. engine=numpy (repeatable)")
+    run.add_argument('--label', help="name of this run in the history (default: git describe)")
+    run.add_argument('--history', type=Path, default=DEFAULT_HISTORY_FILE, help="JSON history file")
+    run.add_argument('--verbose', action='store_true', help="show the generator's output")
+
+    compare = commands.add_parser('compare', help="compare a run with a baseline and flag regressions")
+    compare.add_argument('--baseline', default='-2', help="label or history index of the baseline (default: -2)")
+    compare.add_argument('--current', default='-1', help="label or history index of the compared run (default: -1)")
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help="relative slowdown (or peak RSS growth) flagged as a regression (default: 0.10)")
+    compare.add_argument('--min-seconds', type=float, default=0.05,
+                         help="ignore phases that took less than this in the baseline (default: 0.05)")
+    compare.add_argument('--history', type=Path, default=DEFAULT_HISTORY_FILE, help="JSON history file")
+
+    scale = commands.add_parser('scale', help="run a single scale factor in this process (used by `run`)")
+    scale.add_argument('scale', type=float)
+    scale.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE')
+    scale.add_argument('--result', help="write the result JSON here instead of printing it")
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None):
+    """Main benchmark flow"""
+    args = parse_args(argv)
+
+    if args.command == 'scale':
+        result = run_scale(args.scale, parse_overrides(args.overrides))
+        if args.result:
+            with open(args.result, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+        else:
+            print(json.dumps(result, indent=2))
+        return
+
+    history = load_history(args.history)
+
+    if args.command == 'compare':
+        try:
+            baseline, current = find_run(history, args.baseline), find_run(history, args.current)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+        print("=" * 60)
+        print(f"📊 BENCHMARK COMPARISON: {baseline['label']} -> {current['label']}")
+        print("=" * 60)
+        regressions = compare_runs(baseline, current, args.threshold, args.min_seconds)
+        print("\n" + "=" * 60)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   • {regression}")
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.threshold:.0%}")
+        return
+
+    overrides = parse_overrides(args.overrides)
+    run = {
+        'label': args.label or git_revision() or datetime.now().strftime('%Y%m%d_%H%M%S'),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'overrides': overrides,
+        'scales': {},
+    }
+    print("=" * 60)
+    print(f"⏱️  GENERATOR BENCHMARK: {run['label']}")
+    print("=" * 60)
+    print(f"Scales: {', '.join(map(str, args.scales))} (x{args.repeat})")
+    if overrides:
+        print(f"Overrides: {overrides}")
+
+    for scale in args.scales:
+        results = [run_scale_in_subprocess(scale, args.overrides, args.verbose) for _ in range(max(1, args.repeat))]
+        result = min(results, key=lambda result: result['seconds'])
+        run['scales'][str(scale)] = result
+        print_run(result)
+
+    history['runs'].append(run)
+    save_history(args.history, history)
+    print(f"\n📁 Results appended to {args.history} ({len(history['runs'])} runs)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Determinism Check
+Checks that generate_data.py writes the same rows however a run is split up:
+
+  workers  a full run with several order workers is byte-identical to one worker
+  ranges   every RANGE_KEYS entity's tables regenerated in --range slices (against the
+           full run with --base-run, and the order tables also without one) concatenate
+           to the full run's files
+  resume   a run interrupted after an order shard and continued with --resume is
+           byte-identical to the full run
+
+Every generator run happens in a fresh process, at a small scale factor with small order
+shards and seed blocks so that the slices and the interruption fall inside the phases.
+
+Usage:
+    python3 check_determinism.py [--scale 0.01] [--workers 2] [--slices 3] [--set engine=numpy] [--keep DIR]
+"""
+
+import sys
+import math
+import pickle
+import argparse
+import filecmp
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmark_generator import parse_overrides, REFERENCE_TIME
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_SCALE = 0.01
+# Several order shards and seed blocks even at small scales
+CHECK_SETTINGS = {'order_shard_size': 250, 'block_size': 64, 'checkpoint_shards': 1, 'progress': 'none'}
+INTERRUPT_EXIT_CODE = 3
+
+# Tables regenerated together for each range entity (verticals come from the master file)
+RANGE_TABLES = {
+    'users': ('users',),
+    'consumers': ('consumers', 'address_books', 'cards'),
+    'sellers': ('sellers', 'seller_vertical'),
+    'commodities': ('commodities',),
+    'orders': ('orders', 'order_commodities', 'transactions', 'reviews'),
+}
+
+# ============================================================================
+# GENERATOR RUNS
+# ============================================================================
+
+def generate(generator_args: List[str], overrides: Dict = None, stop_after_shard: int = None):
+    """
+    Run generate_data.main(generator_args) in this process with CHECK_SETTINGS and `overrides`.
+
+    With stop_after_shard the run exits (INTERRUPT_EXIT_CODE) after checkpointing that many
+    order shards, with the rows of the next shard already on disk, like a run killed mid-phase.
+    """
+    import generate_data
+
+    generate_data.CONFIG.update(CHECK_SETTINGS, verticals_master_file=str(SCRIPT_DIR / 'verticals_master.csv'))
+    generate_data.CONFIG.update(overrides or {})
+    if stop_after_shard is not None:
+        save_orders = generate_data.RunCheckpoint.save_orders
+
+        def save_orders_or_stop(checkpoint, next_shard, aggregates, writers):
+            if next_shard > stop_after_shard:
+                for writer in writers:
+                    writer.flush()
+                print(f"⛔ Interrupted after order shard {stop_after_shard}")
+                sys.exit(INTERRUPT_EXIT_CODE)
+            save_orders(checkpoint, next_shard, aggregates, writers)
+
+        generate_data.RunCheckpoint.save_orders = save_orders_or_stop
+    generate_data.main(['--no-load', *generator_args])
+
+def generate_in_subprocess(generator_args: List[str], assignments: List[str], stop_after_shard: int = None,
+                           verbose: bool = False):
+    """Run the generator in a fresh interpreter (see the `generate` command)"""
+    command = [sys.executable, str(Path(__file__).resolve()), 'generate']
+    for assignment in assignments or ():
+        command += ['--set', assignment]
+    if stop_after_shard is not None:
+        command += ['--stop-after-shard', str(stop_after_shard)]
+    command += ['--', *generator_args]
+    completed = subprocess.run(command, cwd=SCRIPT_DIR, stdout=None if verbose else subprocess.DEVNULL,
+                               stderr=None if verbose else subprocess.PIPE, text=True)
+    expected = 0 if stop_after_shard is None else INTERRUPT_EXIT_CODE
+    if completed.returncode != expected:
+        details = '' if verbose else '\n' + completed.stderr[-2000:]
+        raise RuntimeError(f"generate_data.py {' '.join(generator_args)} failed "
+                           f"(exit code {completed.returncode}){details}")
+
+# ============================================================================
+# COMPARISONS
+# ============================================================================
+
+def csv_lines(path: Path) -> List[bytes]:
+    with open(path, 'rb') as f:
+        return f.readlines()
+
+def compare_runs(reference: Path, other: Path) -> List[str]:
+    """Differences between two runs' CSV files and generation states"""
+    differences = []
+    for path in sorted(reference.glob('*.csv')):
+        if not (other / path.name).exists():
+            differences.append(f"{path.name} missing")
+        elif not filecmp.cmp(path, other / path.name, shallow=False):
+            differences.append(f"{path.name} differs")
+    state_file = 'generation_state.pkl'
+    if (reference / state_file).exists():
+        with open(reference / state_file, 'rb') as f, open(other / state_file, 'rb') as g:
+            if pickle.load(f) != pickle.load(g):
+                differences.append(f"{state_file} differs")
+    return differences
+
+def compare_slices(reference: Path, slices: List[Path], tables: List[str]) -> List[str]:
+    """Differences between the full run's tables and the concatenated slices of them"""
+    differences = []
+    for table in tables:
+        expected = csv_lines(reference / f'{table}.csv')
+        combined = expected[:1]
+        for directory in slices:
+            lines = csv_lines(directory / f'{table}.csv')
+            if lines[:1] != expected[:1]:
+                differences.append(f"{table}.csv header differs in {directory.name}")
+            combined += lines[1:]
+        if combined != expected:
+            differences.append(f"{table}.csv: slices give {len(combined) - 1} rows, "
+                               f"{sum(a != b for a, b in zip(combined, expected))} differing "
+                               f"(full run: {len(expected) - 1} rows)")
+    return differences
+
+def slice_bounds(count: int, slices: int) -> List[int]:
+    """Cut points splitting 0..count into `slices` ranges (fewer if there are fewer entities)"""
+    return sorted({count * index // slices for index in range(slices + 1)})
+
+def entity_counts(scale: float, overrides: Dict) -> Dict[str, int]:
+    """Entities of each RANGE_TABLES key in a run at `scale`"""
+    import generate_data
+
+    config = generate_data.CONFIG
+    config.update(overrides)
+    generate_data.apply_scale_factor(scale)
+    return {'users': config['num_consumers'] + config['num_sellers'], 'consumers': config['num_consumers'],
+            'sellers': config['num_sellers'], 'commodities': config['num_commodities'], 'orders': config['num_orders']}
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that generate_data.py output does not depend on "
+                                                 "workers, index ranges or resuming")
+    commands = parser.add_subparsers(dest='command')
+
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE,
+                        help=f"fraction of the CONFIG volumes (default: {DEFAULT_SCALE})")
+    parser.add_argument('--workers', type=int, default=2, help="order workers compared with one (default: 2)")
+    parser.add_argument('--slices', type=int, default=3, help="index ranges per entity (default: 3)")
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE',
+                        help="CONFIG override for every run, e.g. engine=numpy (repeatable)")
+    parser.add_argument('--keep', type=Path, metavar='DIR', help="write the runs under DIR and keep them")
+    parser.add_argument('--verbose', action='store_true', help="show the generator's output")
+
+    generate_command = commands.add_parser('generate', help="run the generator in this process (used by the checks)")
+    generate_command.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE')
+    generate_command.add_argument('--stop-after-shard', type=int, metavar='N',
+                                  help="exit once N order shards are checkpointed")
+    generate_command.add_argument('generator_args', nargs=argparse.REMAINDER,
+                                  help="generate_data.py arguments (after --)")
+    return parser.parse_args(argv)
+
+def run_checks(work_dir: Path, args: argparse.Namespace) -> List[str]:
+    """Run every check under work_dir; returns the failures"""
+    overrides = parse_overrides(args.overrides)
+    scale = ['--scale-factor', str(args.scale)]
+
+    def run(name: str, generator_args: List[str], stop_after_shard: int = None) -> Path:
+        output_dir = work_dir / name
+        # A run against a base run takes over its reference time
+        clock = [] if '--base-run' in generator_args else ['--reference-time', REFERENCE_TIME]
+        generate_in_subprocess([*scale, *clock, '--output-dir', str(output_dir), *generator_args], args.overrides,
+                               stop_after_shard, args.verbose)
+        return output_dir
+
+    def report(check: str, differences: List[str]):
+        print(f"{'✅' if not differences else '❌'} {check}")
+        for difference in differences:
+            print(f"   • {difference}")
+        failures.extend(f"{check}: {difference}" for difference in differences)
+
+    failures = []
+    reference = run('full', ['--workers', '1'])
+    print(f"📁 Full run: {reference}")
+
+    report(f"{args.workers} order workers", compare_runs(reference, run('workers', ['--workers', str(args.workers)])))
+
+    counts = entity_counts(args.scale, overrides)
+    for base_run in (False, True):
+        for entity, tables in RANGE_TABLES.items():
+            # Aggregate totals (consumers, sellers, commodities) and the users of a
+            # consumer/seller range only come out right against a base run
+            if not base_run and entity != 'orders':
+                continue
+            bounds = slice_bounds(counts[entity], args.slices)
+            slices = [run(f"{entity}_{start}_{end}{'_base' if base_run else ''}",
+                          ['--tables', *tables, '--range', f'{start}:{end}',
+                           *(['--base-run', str(reference)] if base_run else [])])
+                      for start, end in zip(bounds, bounds[1:])]
+            report(f"{entity} ranges {bounds}{' (base run)' if base_run else ''}",
+                   compare_slices(reference, slices, list(tables)))
+
+    # Interrupt before the last shard, so the resumed run still has shards to generate
+    shard_size = overrides.get('order_shard_size', CHECK_SETTINGS['order_shard_size'])
+    shards = math.ceil(counts['orders'] / shard_size)
+    if shards < 2:
+        print(f"⏭️  resume skipped: {counts['orders']} orders fit in one order shard")
+        return failures
+    stop_after_shard = min(2, shards - 1)
+    interrupted = run('resumed', ['--workers', '1'], stop_after_shard=stop_after_shard)
+    generate_in_subprocess(['--resume', str(interrupted)], args.overrides, verbose=args.verbose)
+    report(f"resume after order shard {stop_after_shard}", compare_runs(reference, interrupted))
+    return failures
+
+def main(argv: List[str] = None):
+    """Main check flow"""
+    args = parse_args(argv)
+
+    if args.command == 'generate':
+        generator_args = args.generator_args[1:] if args.generator_args[:1] == ['--'] else args.generator_args
+        generate(generator_args, parse_overrides(args.overrides), args.stop_after_shard)
+        return
+
+    print("=" * 60)
+    print(f"🔁 DETERMINISM CHECK: scale {args.scale}")
+    print("=" * 60)
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+        failures = run_checks(args.keep.resolve(), args)
+    else:
+        with tempfile.TemporaryDirectory(prefix='determinism_') as work_dir:
+            failures = run_checks(Path(work_dir), args)
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ {len(failures)} differences")
+        sys.exit(1)
+    print("✅ Every split of the run wrote the same rows")
+
+if __name__ == '__main__':
+    main()
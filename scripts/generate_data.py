@@ -4,47 +4,143 @@ E-Commerce Data Generator
 """
 
 import os
+import re
+import argparse
+import io
+import struct
 import sys
 import csv
+import gzip
 import random
+import json
 import hashlib
+import pickle
+import shutil
+import time
+import cProfile
+import multiprocessing
+import queue
+import threading
 import uuid as uuid_module
-from datetime import datetime, timedelta
-from decimal import Decimal, ROUND_HALF_UP
-from collections import defaultdict
-from typing import List, Dict, Tuple
+from array import array
+from datetime import datetime, timedelta, date
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import repeat, chain, islice
+from types import SimpleNamespace
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional
+
+from redshift_schema import load_redshift_schema, load_postgres_schema
 
 # ============================================================================
-# OPTIONAL: Progress bar (tqdm)
+# OPTIONAL: Progress bar (tqdm), imported on first use (see progress)
 # ============================================================================
-try:
-    from tqdm import tqdm
-    TQDM_AVAILABLE = True
-except ImportError:
-    print("⚠️  tqdm not available. Install with: pip install tqdm")
-    TQDM_AVAILABLE = False
+TQDM_AVAILABLE = None  # Unknown until load_tqdm()
+
+def load_tqdm() -> bool:
+    """Import tqdm the first time a progress bar is shown; returns whether it is available"""
+    global tqdm, TQDM_AVAILABLE
+    if TQDM_AVAILABLE is None:
+        try:
+            from tqdm import tqdm
+            TQDM_AVAILABLE = True
+        except ImportError:
+            TQDM_AVAILABLE = False
+    return TQDM_AVAILABLE
+
+# ============================================================================
+# OPTIONAL: Faker library for realistic data, imported on first use
+# ============================================================================
+class _LazyFaker:
+    """Stands in for the Faker instance until a row needs it (importing faker is slow)"""
+    
+    def __getattr__(self, name):
+        return getattr(load_faker(), name)
+
+fake = _LazyFaker()
+
+def load_faker():
+    """Import faker and create the module's seeded instance, which replaces the stand-in"""
+    global fake, Faker, faker_version
+    if isinstance(fake, _LazyFaker):
+        try:
+            from faker import Faker, VERSION as faker_version
+        except ImportError:
+            print("⚠️  faker not available. Install with: pip install faker")
+            sys.exit(1)
+        fake = Faker()
+        Faker.seed(42)  # Reproducible fake data
+    return fake
+
+# ============================================================================
+# OPTIONAL: NumPy for the vectorized generation engine, imported on first use
+# ============================================================================
+NUMPY_AVAILABLE = None  # Unknown until load_numpy()
+
+def load_numpy() -> bool:
+    """Import numpy the first time the numpy engine runs; returns whether it is available"""
+    global np, NUMPY_AVAILABLE
+    if NUMPY_AVAILABLE is None:
+        try:
+            import numpy as np
+            NUMPY_AVAILABLE = True
+        except ImportError:
+            NUMPY_AVAILABLE = False
+    return NUMPY_AVAILABLE
+
+# ============================================================================
+# OPTIONAL: pyarrow for Parquet output, imported on first use
+# ============================================================================
+PYARROW_AVAILABLE = None  # Unknown until load_pyarrow()
+
+def load_pyarrow() -> bool:
+    """Import pyarrow the first time Parquet is written or read; returns whether it is available"""
+    global pa, pq, PYARROW_AVAILABLE
+    if PYARROW_AVAILABLE is None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            PYARROW_AVAILABLE = True
+        except ImportError:
+            PYARROW_AVAILABLE = False
+    return PYARROW_AVAILABLE
 
 # ============================================================================
-# OPTIONAL: Faker library for realistic data
+# OPTIONAL: zstandard for zstd-compressed CSV parts
 # ============================================================================
 try:
-    from faker import Faker
-    fake = Faker()
-    Faker.seed(42)  # Reproducible fake data
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
 except ImportError:
-    print("⚠️  faker not available. Install with: pip install faker")
-    sys.exit(1)
+    ZSTANDARD_AVAILABLE = False
 
 # ============================================================================
-# OPTIONAL: PostgreSQL support
+# OPTIONAL: resource for the peak RSS in the run metrics (not on Windows)
 # ============================================================================
 try:
-    import psycopg2
-    from psycopg2.extras import execute_batch
-    PSYCOPG2_AVAILABLE = True
+    import resource
+    RESOURCE_AVAILABLE = True
 except ImportError:
-    print("⚠️  psycopg2 not available. Install with: pip install psycopg2-binary")
-    PSYCOPG2_AVAILABLE = False
+    RESOURCE_AVAILABLE = False
+
+# ============================================================================
+# OPTIONAL: PostgreSQL support, imported when a run loads or streams into PostgreSQL
+# ============================================================================
+PSYCOPG2_AVAILABLE = None  # Unknown until load_psycopg2()
+
+def load_psycopg2() -> bool:
+    """Import psycopg2 on first use; returns whether it is available"""
+    global psycopg2, ThreadedConnectionPool, PSYCOPG2_AVAILABLE
+    if PSYCOPG2_AVAILABLE is None:
+        try:
+            import psycopg2
+            from psycopg2.pool import ThreadedConnectionPool
+            PSYCOPG2_AVAILABLE = True
+        except ImportError:
+            print("⚠️  psycopg2 not available. Install with: pip install psycopg2-binary")
+            PSYCOPG2_AVAILABLE = False
+    return PSYCOPG2_AVAILABLE
 
 # ============================================================================
 # CONFIGURATION
@@ -66,6 +162,81 @@ CONFIG = {
     'cards_per_consumer_range': (1, 3),
     'items_per_order_range': (1, 5),
     
+    # Reproducibility and parallelism
+    'seed': 42,
+    'order_workers': 1,          # Processes used for order generation
+    'order_shard_size': 10000,   # Orders per shard (own derived seed; bounds rows held in memory)
+    'block_size': 1000,          # Dimension rows per seed block (each block seeded from (seed, table, block))
+    'engine': 'python',          # 'python' (scalar) or 'numpy' (vectorized numeric/enum columns)
+    'reference_time': None,      # 'YYYY-MM-DD HH:MM:SS' all timestamps are relative to; None = now (read once)
+    
+    # Delta runs: set delta_from to an earlier output directory to generate only the rows of
+    # the delta_window_days before reference_time against that run's saved state (fix
+    # reference_time to reproduce a delta). delta_volumes counts the new rows
+    # ({'num_consumers': N, 'num_commodities': N, 'num_orders': N}); the volumes it leaves out
+    # are the full run's scaled to the window (see DELTA_VOLUME_DAYS). Sellers and verticals are kept.
+    'delta_from': None,
+    'delta_window_days': 1,
+    'delta_volumes': None,
+    
+    # Table subset: None = every table; a list of tables generates those plus the parent tables
+    # their foreign keys reference (see TABLE SELECTION). With base_run set to an earlier full
+    # run's output directory, only the listed tables are regenerated against its lookups.
+    # index_range (start, end) writes only the rows of those entity indexes, byte-identical
+    # to the same rows of a full run (see RANGE_KEYS for what each table is indexed by).
+    'tables': None,
+    'base_run': None,
+    'index_range': None,
+    
+    # Checkpoints: every completed phase (and every checkpoint_shards order shards) is recorded
+    # in <output_dir>/.checkpoint so an interrupted run continues with --resume <output_dir>.
+    # Not available with the 'postgres' output; order shards resume only for unsplit CSV output.
+    'checkpoints': True,
+    'checkpoint_shards': 10,
+    
+    # Inline validation: check every CSV row against sql/redshift_schema.sql and the foreign keys
+    # as it is written and record each file's result and SHA-256 in validation_report.json, so
+    # validate_csv.py does not read the files again (single uncompressed CSV files only)
+    'inline_validation': False,
+    
+    # Instrumentation: metrics_file records the time, rows, bytes written and RSS of every phase
+    # and PostgreSQL table load as JSON lines (or a Prometheus text file for a *.prom path);
+    # profile dumps a cProfile of each phase to <output_dir>/profiles/<phase>.prof
+    'metrics_file': None,
+    'profile': False,
+    'progress': 'log',           # 'log' (a line every progress_interval seconds), 'tqdm' or 'none'
+    'progress_interval': 5,
+    
+    # Faker value pools: 0 = call Faker per row; N = sample from N pre-generated values
+    # per provider (smaller pools are faster to build but repeat values more often)
+    'faker_pool_size': 0,
+    'faker_locale': 'en_US',
+    'faker_pool_cache_dir': '.faker_pools',
+    
+    # Output formats: 'csv' (pipe-delimited), 'parquet' (typed from sql/redshift_schema.sql) and/or
+    # 'postgres' (rows streamed into PostgreSQL with COPY ... FROM STDIN while generating, no files)
+    'output_formats': ('csv',),
+    'parquet_row_group_size': 100000,   # Rows per Parquet row group
+    'parquet_compression': 'snappy',    # snappy, gzip, zstd, lz4, brotli or none
+    
+    # Split CSV output: each table becomes N compressed parts plus a COPY manifest so
+    # Redshift loads them on every slice in parallel. Set csv_parts to the cluster's
+    # slice count (SELECT COUNT(*) FROM stv_slices) or csv_part_target_mb to cap part size.
+    # Any value other than none/1/0 switches to split output.
+    'csv_compression': 'none',          # none, gzip or zstd
+    'csv_parts': 1,                     # Parts per table (row blocks dealt round-robin)
+    'csv_part_target_mb': 0,            # >0: start a new part once the current one reaches this size on disk
+    'csv_s3_prefix': 's3://amzn-s3-url/csv_time_stamp/',  # Upload location used in manifests and COPY
+    
+    # PostgreSQL COPY loading: 'text' or 'binary' (typed from sql/create_schema.sql) COPY format,
+    # and the size of the in-memory buffer sent per COPY statement. load_into_postgres inserts
+    # the exported files once they are complete (not needed with the 'postgres' output format)
+    'load_into_postgres': True,
+    'postgres_copy_format': 'text',
+    'postgres_copy_buffer_mb': 8,
+    'postgres_load_workers': 4,         # Pooled connections loading independent tables / chunks at once
+    'postgres_chunk_rows': 50000,       # Tables with more rows are split over several connections
+    
     # PostgreSQL connection (optional)
     'postgres': {
         'host': 'localhost',
@@ -80,7 +251,7 @@ CONFIG = {
 }
 
 # Seed for reproducibility
-random.seed(42)
+random.seed(CONFIG['seed'])
 
 # ============================================================================
 # ENUMS (matching database schema)
@@ -177,13 +348,222 @@ CUSTOMER_SEGMENTS = {
     'One-time': 0,      # Rest
 }
 
+# Named weighted distributions: (values, weights). Weights must sum to 1;
+# each one is compiled once into an alias table (see SAMPLERS).
+DISTRIBUTIONS = {
+    'vertical_status': (ENUMS['status'], [0.90, 0.08, 0.02]),
+    'user_status': (ENUMS['status'], [0.95, 0.04, 0.01]),
+    'gender': (ENUMS['gender'], [0.48, 0.48, 0.02, 0.02]),
+    'seller_type': (ENUMS['seller_type'], [0.85, 0.15]),
+    'commodity_status': (ENUMS['commodity_status'], [0.85, 0.08, 0.05, 0.02]),
+    'card_provider': (ENUMS['card_provider'], [0.40, 0.30, 0.10, 0.05, 0.05, 0.05, 0.05]),
+    'card_status': (ENUMS['card_status'], [0.90, 0.05, 0.03, 0.01, 0.01]),
+    'order_status': (ENUMS['order_status'], [0.02, 0.05, 0.03, 0.10, 0.55, 0.20, 0.03, 0.02]),
+    'trans_status': (ENUMS['trans_status'], [0.05, 0.10, 0.80, 0.03, 0.01, 0.01]),
+    'review_status': (ENUMS['review_status'], [0.05, 0.90, 0.03, 0.02]),
+    'review_rate': ([1, 2, 3, 4, 5], [0.05, 0.05, 0.15, 0.35, 0.40]),
+}
+
+# Column layout of every exported table, in foreign-key load order
+TABLE_COLUMNS = {
+    'users': ['id', 'username', 'phone', 'name', 'email', 'status', 'created_at', 'updated_at'],
+    'consumers': ['id', 'birthday', 'gender', 'first_order_date', 'total_orders', 'total_spent', 'customer_segment'],
+    'sellers': ['id', 'type', 'introduction', 'address', 'city', 'province', 'country', 'rating_avg', 'total_sales', 'total_orders'],
+    'verticals': ['id', 'name', 'description', 'status'],
+    'seller_vertical': ['seller_id', 'vertical_id', 'created_at', 'updated_at'],
+    'address_books': ['id', 'user_id', 'address_line_1', 'address_line_2', 'city', 'province', 'country', 'postal_code', 'phone', 'receiver_name', 'is_default', 'latitude', 'longitude', 'created_at', 'updated_at'],
+    'cards': ['id', 'consumer_id', 'tk', 'provider', 'last4', 'card_holder', 'exp_year', 'exp_month', 'status', 'is_default', 'created_at', 'updated_at'],
+    'commodities': ['id', 'seller_id', 'sku', 'name', 'price', 'cost_price', 'quantity', 'reserved_quantity', 'reorder_level', 'reorder_quantity', 'weight_kg', 'description', 'technical_info', 'guarantee_info', 'manufacturer_name', 'vertical_id', 'status', 'rating_avg', 'review_count', 'total_sold', 'created_at', 'updated_at'],
+    'orders': ['id', 'consumer_id', 'seller_id', 'status', 'delivery_address', 'delivery_postal_code', 'delivery_receiver', 'delivery_phone', 'delivery_city', 'delivery_country', 'delivery_latitude', 'delivery_longitude', 'subtotal_amount', 'tax_amount', 'shipping_fee', 'discount_amount', 'total_amount', 'created_at', 'confirmed_at', 'paid_at', 'shipped_at', 'delivered_at', 'completed_at', 'updated_at', 'days_to_ship', 'days_to_deliver'],
+    'order_commodities': ['order_id', 'commodity_id', 'quantity', 'unit_price', 'unit_cost', 'line_total', 'discount_applied'],
+    'transactions': ['id', 'order_id', 'card_id', 'payment_method', 'transaction_type', 'amount', 'status', 'created_at', 'authorized_at', 'completed_at', 'gateway_transaction_id', 'gateway_response_code', 'gateway_response_message', 'ip_address', 'user_agent'],
+    'reviews': ['id', 'order_id', 'commodity_id', 'consumer_id', 'seller_id', 'rate', 'comment', 'status', 'is_verified_purchase', 'helpful_count', 'created_at', 'updated_at', 'published_at'],
+}
+
+# Compact row records: one namedtuple per table, fields in TABLE_COLUMNS order.
+# A tuple row is about a quarter of the size of the equivalent dict and is
+# written to CSV positionally. Module-level names keep them picklable for workers.
+UserRow = namedtuple('UserRow', TABLE_COLUMNS['users'])
+ConsumerRow = namedtuple('ConsumerRow', TABLE_COLUMNS['consumers'])
+SellerRow = namedtuple('SellerRow', TABLE_COLUMNS['sellers'])
+VerticalRow = namedtuple('VerticalRow', TABLE_COLUMNS['verticals'])
+SellerVerticalRow = namedtuple('SellerVerticalRow', TABLE_COLUMNS['seller_vertical'])
+AddressBookRow = namedtuple('AddressBookRow', TABLE_COLUMNS['address_books'])
+CardRow = namedtuple('CardRow', TABLE_COLUMNS['cards'])
+CommodityRow = namedtuple('CommodityRow', TABLE_COLUMNS['commodities'])
+OrderRow = namedtuple('OrderRow', TABLE_COLUMNS['orders'])
+OrderCommodityRow = namedtuple('OrderCommodityRow', TABLE_COLUMNS['order_commodities'])
+TransactionRow = namedtuple('TransactionRow', TABLE_COLUMNS['transactions'])
+ReviewRow = namedtuple('ReviewRow', TABLE_COLUMNS['reviews'])
+
+ROW_TYPES = {
+    'users': UserRow,
+    'consumers': ConsumerRow,
+    'sellers': SellerRow,
+    'verticals': VerticalRow,
+    'seller_vertical': SellerVerticalRow,
+    'address_books': AddressBookRow,
+    'cards': CardRow,
+    'commodities': CommodityRow,
+    'orders': OrderRow,
+    'order_commodities': OrderCommodityRow,
+    'transactions': TransactionRow,
+    'reviews': ReviewRow,
+}
+
+# Slices of dimension rows kept in memory for the order loop
+DeliveryAddress = namedtuple('DeliveryAddress', ['address_line_1', 'postal_code', 'receiver_name', 'phone',
+                                                 'city', 'country', 'latitude', 'longitude'])
+CommodityPrice = namedtuple('CommodityPrice', ['price', 'cost_price'])
+
+class ColumnBatch(list):
+    """A batch of a table's rows as a list of columns in TABLE_COLUMNS order (see write_batch)"""
+
+# Columns generated as integer fixed-point units -> number of decimals written.
+# Rows carry plain ints for these until TableWriter formats them.
+FIXED_POINT_COLUMNS = {
+    'consumers': {'total_spent': 4},
+    'sellers': {'rating_avg': 2, 'total_sales': 4},
+    'address_books': {'latitude': 7, 'longitude': 7},
+    'commodities': {'price': 4, 'cost_price': 4, 'weight_kg': 4, 'rating_avg': 2},
+    'orders': {'delivery_latitude': 7, 'delivery_longitude': 7, 'subtotal_amount': 4, 'tax_amount': 4,
+               'shipping_fee': 4, 'discount_amount': 4, 'total_amount': 4},
+    'order_commodities': {'unit_price': 4, 'unit_cost': 4, 'line_total': 4, 'discount_applied': 4},
+    'transactions': {'amount': 4},
+}
+
+# Denormalized columns filled in after the orders (see apply_*_aggregates)
+AGGREGATE_COLUMNS = {
+    'consumers': ('first_order_date', 'total_orders', 'total_spent', 'customer_segment'),
+    'sellers': ('rating_avg', 'total_sales', 'total_orders'),
+    'commodities': ('rating_avg', 'review_count', 'total_sold'),
+}
+
+# Delta runs write the new aggregates of rows loaded by an earlier run as
+# <table>_delta.csv: the id followed by the table's AGGREGATE_COLUMNS
+DELTA_COLUMNS = {f'{table}_delta': ['id', *columns] for table, columns in AGGREGATE_COLUMNS.items()}
+FIXED_POINT_COLUMNS.update({
+    f'{table}_delta': {column: decimals for column, decimals in FIXED_POINT_COLUMNS[table].items()
+                       if column in columns}
+    for table, columns in AGGREGATE_COLUMNS.items()
+})
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
 def generate_uuid() -> str:
-    """Generate UUID v4"""
-    return str(uuid_module.uuid4())
+    """Generate UUID v4 from the seeded random stream (reproducible)"""
+    return str(uuid_module.UUID(int=random.getrandbits(128), version=4))
+
+def derive_seed(*parts) -> int:
+    """Derive a stable 64-bit seed from the run seed and a label (e.g. a shard index)"""
+    key = ':'.join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big')
+
+# Rows are keyed internally by dense integer indexes (a consumer is its position among
+# all consumers generated so far) and a row's UUID is derived from (id seed, table, index)
+# when the row is built for export. The id seed is the seed of the first run, so delta
+# and base runs derive the same ids for the entities they share. Child rows are indexed
+# parent index * CHILD_ID_SLOTS + position (a consumer's cards, an order's reviews).
+CHILD_ID_SLOTS = 256
+# Odd multipliers: every step of entity_uuid's mix is a bijection on 122-bit integers
+_ID_MASK = (1 << 122) - 1
+_ID_STEP = 0x9E3779B97F4A7C15F39CC0605CEDC835
+_ID_MIX = 0xD6E8FEB86659FD93A5B2C9F1E3D4C5B7
+_ENTITY_IDS = {'seed': None, 'keys': {}, 'first_new': {}}
+
+def set_id_space(seed: int, first_new: Dict[str, int] = None):
+    """Derive ids from `seed`; first_new holds the index of each entity's first row of this run"""
+    _ENTITY_IDS.update(seed=seed, keys={}, first_new=dict(first_new or {}))
+
+def block_origin(entity: str) -> int:
+    """Index the seed blocks of `entity` count from (the previous total in a delta run, else 0)"""
+    return _ENTITY_IDS['first_new'].get(entity, 0)
+
+def _entity_id_key(table: str) -> int:
+    key = _ENTITY_IDS['keys'].get(table)
+    if key is None:
+        seed = CONFIG['seed'] if _ENTITY_IDS['seed'] is None else _ENTITY_IDS['seed']
+        digest = hashlib.sha256(f"{seed}:{table}:uuid".encode()).digest()
+        key = _ENTITY_IDS['keys'][table] = int.from_bytes(digest[:16], 'big') & _ID_MASK
+    return key
+
+def entity_uuid(table: str, index: int) -> str:
+    """UUID v4 text of row `index` of `table` (reproducible; distinct indexes get distinct ids)"""
+    x = (index * _ID_STEP ^ _entity_id_key(table)) & _ID_MASK
+    x = (x ^ (x >> 61)) * _ID_MIX & _ID_MASK
+    x = (x ^ (x >> 57)) * _ID_STEP & _ID_MASK
+    x ^= x >> 64
+    # The 122 mixed bits around the version (4) and variant (10) bits
+    h = '%032x' % (x >> 74 << 80 | (x >> 62 & 0xFFF) << 64 | x & 0x3FFFFFFFFFFFFFFF | 0x40008000000000000000)
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def seed_block_start(table: str, index: int) -> int:
+    """First index of the seed block holding `index` (see seeded_indexes)"""
+    return index - (index - block_origin(RANGE_KEYS[table])) % CONFIG['block_size']
+
+def seeded_indexes(table: str, start: int, end: int) -> Iterator[int]:
+    """
+    Entity indexes from the start of `start`'s seed block up to `end`, reseeding random and
+    Faker from (seed, table, block) at every CONFIG['block_size'] boundary. A row depends only
+    on its block, so callers generate every index but keep those >= start to reproduce any range.
+    """
+    if start >= end:
+        return
+    block_size = CONFIG['block_size']
+    origin = block_origin(RANGE_KEYS[table])
+    for index in range(seed_block_start(table, start), end):
+        if (index - origin) % block_size == 0:
+            block_seed = derive_seed(CONFIG['seed'], table, (index - origin) // block_size)
+            random.seed(block_seed)
+            fake.seed_instance(block_seed)
+        yield index
+
+class AdjacencyIndex:
+    """
+    Compressed sparse row index from parent entity indexes to their child rows: the children
+    of parent p are values[offsets[p]:offsets[p + 1]], so a parent's child count or a random
+    child is two array reads. Built in one pass while the child table is generated (children
+    arrive in parent order). Integer children are kept in an array('q'), others in a list.
+    """
+    
+    def __init__(self, values=None, offsets: array = None):
+        self.values = array('q') if values is None else values
+        self.offsets = array('q', [0]) if offsets is None else offsets
+    
+    def __len__(self) -> int:
+        """Number of parents (with or without children)"""
+        return len(self.offsets) - 1
+    
+    def add(self, parent: int, value):
+        """Append a child of `parent`; parents between the last one and `parent` get no children"""
+        if parent < len(self) - 1:
+            raise ValueError(f"Child of parent {parent} added after parent {len(self) - 1}'s")
+        self.pad(parent + 1)
+        self.values.append(value)
+        self.offsets[-1] += 1
+    
+    def pad(self, parents: int):
+        """Grow the index to `parents` parents (the new ones without children)"""
+        self.offsets.extend(repeat(self.offsets[-1], parents - len(self)))
+    
+    def count(self, parent: int) -> int:
+        """Number of children of `parent` (0 past the last parent)"""
+        return self.offsets[parent + 1] - self.offsets[parent] if parent < len(self) else 0
+    
+    def snapshot(self) -> Dict:
+        """Plain offsets/values for the generation state and checkpoints (see restore)"""
+        values = self.values if isinstance(self.values, array) else [tuple(value) for value in self.values]
+        return {'offsets': self.offsets, 'values': values}
+    
+    @classmethod
+    def restore(cls, saved: Dict = None, row_type=None) -> 'AdjacencyIndex':
+        """Index from a snapshot (empty if None); row_type rebuilds namedtuple children"""
+        if not saved:
+            return cls(None if row_type is None else [])
+        values = array('q', saved['values']) if row_type is None else list(map(row_type._make, saved['values']))
+        return cls(values, array('q', saved['offsets']))
 
 def generate_unique_sku() -> str:
     """Generate unique SKU (Stock Keeping Unit)"""
@@ -191,47 +571,151 @@ def generate_unique_sku() -> str:
     number = random.randint(100000, 999999)
     return f"{prefix}-{number}"
 
-def weighted_choice(choices: List[str], weights: List[float]) -> str:
-    """Weighted random choice"""
-    return random.choices(choices, weights=weights, k=1)[0]
+class AliasSampler:
+    """
+    Weighted sampler compiled into a Walker/Vose alias table: O(n) to build,
+    then one uniform draw and one comparison per sample (random.choices
+    rebuilds its cumulative table on every call).
+    """
+    
+    def __init__(self, name: str, values: List, weights: List[float]):
+        if len(values) != len(weights) or not values:
+            raise ValueError(f"Distribution '{name}': {len(values)} values but {len(weights)} weights")
+        if any(w < 0 for w in weights):
+            raise ValueError(f"Distribution '{name}': weights must be non-negative")
+        total = sum(weights)
+        if abs(total - 1.0) > 1e-6:
+            raise ValueError(f"Distribution '{name}': weights sum to {total}, expected 1")
+        
+        self.name = name
+        self.values = list(values)
+        n = len(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left over (rounding) keeps probability 1 and no alias
+        self._prob = prob
+        self._alias = alias
+        self._n = n
+        self._prob_array = self._alias_array = None  # numpy copies, made by the first draw_indices
+    
+    def draw(self):
+        """One value, using a single draw from the `random` stream"""
+        u = random.random() * self._n
+        i = int(u)
+        return self.values[i] if u - i < self._prob[i] else self.values[self._alias[i]]
+    
+    def draw_indices(self, rng, size: int):
+        """`size` value indices from a numpy Generator"""
+        if self._prob_array is None:
+            self._prob_array = np.array(self._prob, dtype=np.float64)
+            self._alias_array = np.array(self._alias, dtype=np.int64)
+        u = rng.random(size) * self._n
+        i = u.astype(np.int64)
+        return np.where(u - i < self._prob_array[i], i, self._alias_array[i])
+    
+    def draw_batch(self, rng, size: int) -> List:
+        """`size` values from a numpy Generator"""
+        values = self.values
+        return [values[i] for i in self.draw_indices(rng, size).tolist()]
+
+SAMPLERS: Dict[str, AliasSampler] = {
+    name: AliasSampler(name, values, weights) for name, (values, weights) in DISTRIBUTIONS.items()
+}
+
+def weighted_choice(distribution: str):
+    """Weighted random choice from a named distribution in DISTRIBUTIONS"""
+    return SAMPLERS[distribution].draw()
+
+# Money and other fixed-point columns are carried as integer counts of
+# 10**-decimals units (ten-thousandths for money) and only turned into
+# strings by TableWriter, using the scales in FIXED_POINT_COLUMNS.
+MONEY_SCALE = 10000
+RATING_SCALE = 100
+COORDINATE_SCALE = 10 ** 7
 
-def random_decimal(min_val: float, max_val: float, decimals: int = 2) -> Decimal:
-    """Generate random decimal"""
-    # Convert to float in case Decimal is passed
-    min_val = float(min_val)
-    max_val = float(max_val)
-    value = random.uniform(min_val, max_val)
-    return round(Decimal(str(value)), decimals)
+def random_units(min_units: float, max_units: float) -> int:
+    """Draw a uniform fixed-point value, already expressed in integer units"""
+    return round(random.uniform(min_units, max_units))
 
+def div_round_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounding halves away from zero (non-negative operands)"""
+    return (2 * numerator + denominator) // (2 * denominator)
 
-def quantize_decimal(value: Decimal, decimals: int = 4) -> Decimal:
-    """Quantize a Decimal to a fixed precision"""
-    if not isinstance(value, Decimal):
-        value = Decimal(str(value))
-    quantizer = Decimal('1').scaleb(-decimals)
-    return value.quantize(quantizer, rounding=ROUND_HALF_UP)
+def format_fixed(units: int, decimals: int = 4) -> str:
+    """Format integer units as a fixed-point string with the given scale"""
+    sign = '-' if units < 0 else ''
+    whole, frac = divmod(abs(units), 10 ** decimals)
+    return f"{sign}{whole}.{frac:0{decimals}d}"
 
+def parse_fixed(text: str, decimals: int = 4) -> int:
+    """Parse a fixed-point string (as written by format_fixed) back into integer units"""
+    text = text.strip()
+    sign = -1 if text.startswith('-') else 1
+    whole, _, frac = text.lstrip('+-').partition('.')
+    return sign * (int(whole or 0) * 10 ** decimals + int(frac[:decimals].ljust(decimals, '0')))
 
-def format_decimal(value: Decimal, decimals: int = 4) -> str:
-    """Format Decimal with fixed precision for CSV output"""
-    return str(quantize_decimal(value, decimals=decimals))
+def average_rating_units(rating_sum: int, rating_count: int) -> int:
+    """Average rating in hundredths, rounded half-up like the Decimal version"""
+    if not rating_count:
+        return 0
+    return div_round_half_up(rating_sum * RATING_SCALE, rating_count)
 
+# Timestamps are integer seconds since 1970-01-01 (naive, like the CSV output),
+# measured from one reference instant per run so reruns with the same seed and
+# CONFIG['reference_time'] reproduce the same values.
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_RUN_CLOCK = {'reference': None, 'window': None}
+_DATE_PREFIXES: Dict[int, str] = {}
+_TWO_DIGITS = ['%02d' % i for i in range(60)]
+# ' HH:MM:SS' of every second of a day, concatenated (formatting 86400 strings slows the import)
+_CLOCK_TEXT = [hour_minute + second for hour_minute in [f" {h}:{m}:" for h in _TWO_DIGITS[:24] for m in _TWO_DIGITS]
+               for second in _TWO_DIGITS]
 
-def format_rating(value: Decimal) -> str:
-    """Format rating values with two decimal places"""
-    return format_decimal(value, decimals=2)
+def to_epoch(dt: datetime) -> int:
+    """Naive datetime -> integer epoch seconds"""
+    delta = dt - _EPOCH
+    return delta.days * SECONDS_PER_DAY + delta.seconds
 
-def random_date_in_range(days_back: int) -> datetime:
-    """Generate random date within range"""
-    return datetime.now() - timedelta(days=random.randint(0, days_back))
+def run_reference_time() -> int:
+    """Reference instant of the run in epoch seconds (resolved once)"""
+    if _RUN_CLOCK['reference'] is None:
+        configured = CONFIG['reference_time']
+        reference = datetime.strptime(configured, '%Y-%m-%d %H:%M:%S') if configured else datetime.now()
+        _RUN_CLOCK['reference'] = to_epoch(reference.replace(microsecond=0))
+    return _RUN_CLOCK['reference']
 
-def format_timestamp(dt: datetime) -> str:
-    """Format timestamp for CSV"""
-    return dt.strftime('%Y-%m-%d %H:%M:%S')
+def random_date_in_range(days_back: int) -> int:
+    """Generate random timestamp within `days_back` days (or the delta run's window) before the reference time"""
+    if _RUN_CLOCK['window']:
+        return run_reference_time() - random.randrange(_RUN_CLOCK['window'])
+    return run_reference_time() - random.randint(0, days_back) * SECONDS_PER_DAY
 
-def format_date(dt: datetime) -> str:
-    """Format date for CSV"""
-    return dt.strftime('%Y-%m-%d')
+def format_date(ts: int) -> str:
+    """Format epoch seconds as 'YYYY-MM-DD' (cached per day)"""
+    day = ts // SECONDS_PER_DAY
+    prefix = _DATE_PREFIXES.get(day)
+    if prefix is None:
+        prefix = _DATE_PREFIXES[day] = (_EPOCH + timedelta(days=day)).strftime('%Y-%m-%d')
+    return prefix
+
+def format_timestamp(ts: int) -> str:
+    """Format epoch seconds as 'YYYY-MM-DD HH:MM:SS' without strftime"""
+    day, second = divmod(ts, SECONDS_PER_DAY)
+    prefix = _DATE_PREFIXES.get(day)
+    if prefix is None:
+        prefix = format_date(ts)
+    return prefix + _CLOCK_TEXT[second]
 
 def clean_text_field(text: str) -> str:
     """Clean text field (remove pipes, newlines, quotes)"""
@@ -246,14 +730,13 @@ def clean_text_field(text: str) -> str:
     text = ' '.join(text.split())
     return text.strip()
 
-def calculate_customer_segment(total_spent: Decimal) -> str:
-    """Calculate customer segment based on spending"""
-    spent = float(total_spent)
-    if spent >= CUSTOMER_SEGMENTS['VIP']:
+def calculate_customer_segment(total_spent: int) -> str:
+    """Calculate customer segment based on spending (in money units)"""
+    if total_spent >= CUSTOMER_SEGMENTS['VIP'] * MONEY_SCALE:
         return 'VIP'
-    elif spent >= CUSTOMER_SEGMENTS['Regular']:
+    elif total_spent >= CUSTOMER_SEGMENTS['Regular'] * MONEY_SCALE:
         return 'Regular'
-    elif spent >= CUSTOMER_SEGMENTS['Occasional']:
+    elif total_spent >= CUSTOMER_SEGMENTS['Occasional'] * MONEY_SCALE:
         return 'Occasional'
     else:
         return 'One-time'
@@ -262,11 +745,353 @@ def hash_card_number(card_number: str) -> str:
     """Hash card number (simulate tokenization)"""
     return hashlib.sha256(card_number.encode()).hexdigest()
 
+# ============================================================================
+# FAKER VALUE POOLS
+# ============================================================================
+# Faker calls dominate generation time. With CONFIG['faker_pool_size'] set, each
+# provider below is called N times once (cached on disk per seed/locale/size)
+# and rows sample from the pool by index. Providers backing UNIQUE columns
+# (user_name, email, users.phone) and card numbers are never pooled.
+
+POOLED_PROVIDERS = {
+    'name': lambda f: f.name(),
+    'company': lambda f: f.company(),
+    'domain_name': lambda f: f.domain_name(),
+    'paragraph': lambda f: f.paragraph(nb_sentences=3),
+    'street_address': lambda f: f.street_address(),
+    'secondary_address': lambda f: f.secondary_address(),
+    'city': lambda f: f.city(),
+    'state': lambda f: f.state(),
+    'country': lambda f: f.country(),
+    'postcode': lambda f: f.postcode(),
+    'phone_number': lambda f: f.phone_number(),
+    'catch_phrase': lambda f: f.catch_phrase(),
+    'text_200': lambda f: f.text(max_nb_chars=200),
+    'text_500': lambda f: f.text(max_nb_chars=500),
+    'ipv4': lambda f: f.ipv4(),
+    'user_agent': lambda f: f.user_agent(),
+}
+
+# provider -> list of pre-generated values (empty: call Faker directly)
+FAKER_POOLS: Dict[str, List[str]] = {}
+
+def load_or_build_faker_pools(size: int, seed: int, locale: str) -> Dict[str, List[str]]:
+    """Load the value pools for (seed, locale, size) from the cache, or build and cache them"""
+    load_faker()
+    cache_dir = CONFIG['faker_pool_cache_dir']
+    cache_file = os.path.join(cache_dir, f"faker_pool_{locale}_{seed}_{size}_{faker_version}.json")
+    
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            pools = json.load(f)
+        if set(pools) == set(POOLED_PROVIDERS):
+            print(f"📦 Loaded Faker pools ({size} values per provider) from {cache_file}")
+            return pools
+    
+    print(f"📦 Building Faker pools ({size} values x {len(POOLED_PROVIDERS)} providers)...")
+    # Dedicated instance so the pools do not depend on (or disturb) the main Faker stream
+    pool_faker = Faker(locale)
+    pool_faker.seed_instance(derive_seed(seed, 'faker_pool', locale))
+    pools = {name: [generate(pool_faker) for _ in range(size)] for name, generate in POOLED_PROVIDERS.items()}
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = cache_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(pools, f)
+    os.replace(tmp_file, cache_file)
+    print(f"✅ Cached Faker pools to {cache_file}")
+    return pools
+
+def fake_value(provider: str) -> str:
+    """One value from a pooled provider (sampled with the seeded `random` stream)"""
+    pool = FAKER_POOLS.get(provider)
+    if pool is None:
+        return POOLED_PROVIDERS[provider](fake)
+    return pool[int(random.random() * len(pool))]
+
+def fake_value_batch(provider: str, rng, size: int) -> List[str]:
+    """`size` values from a pooled provider, sampled with an index array from `rng`"""
+    pool = FAKER_POOLS.get(provider)
+    if pool is None:
+        generate = POOLED_PROVIDERS[provider]
+        return [generate(fake) for _ in range(size)]
+    return [pool[i] for i in rng.integers(0, len(pool), size).tolist()]
+
+class _SkippedFaker:
+    """Stands in for the Faker instance while nobody reads the text: every call returns ''"""
+    
+    def __init__(self, faker):
+        self.faker = faker
+    
+    def __getattr__(self, name):
+        return _no_text
+
+def _no_text(*args, **kwargs) -> str:
+    return ''
+
+def skip_faker_text(skip: bool):
+    """
+    Replace the Faker instance with a stand-in returning '' (skip=True), or put it back.
+    For rows generated only for their lookups: pooled values still draw from `random`, and
+    Faker's own stream is reseeded at every seed block and order shard, so the other columns
+    and the next blocks' text come out as in a run that calls Faker.
+    """
+    global fake
+    if skip and not isinstance(fake, _SkippedFaker):
+        fake = _SkippedFaker(fake)
+    elif not skip and isinstance(fake, _SkippedFaker):
+        fake = fake.faker
+
+@contextmanager
+def faker_text(enabled: bool):
+    """Call Faker inside the block only if `enabled` (see skip_faker_text)"""
+    skip_faker_text(not enabled)
+    try:
+        yield
+    finally:
+        skip_faker_text(False)
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+# RUN_METRICS records every completed phase (RunCheckpoint.save) and every PostgreSQL
+# table load: wall time, rows, bytes added to the output directory and the RSS.
+# Records go to CONFIG['metrics_file'] as they happen: one JSON line each, or a
+# rewritten Prometheus text file for a *.prom path (node_exporter textfile collector).
+# With CONFIG['profile'], each phase's cProfile goes to <output_dir>/profiles/<phase>.prof;
+# only the main thread of the parent process is profiled (not the order workers).
+
+# Tables written by each phase; the *_aggregates phases rewrite their staged table
+PHASE_TABLES = {
+    'verticals': ('verticals',),
+    'users': ('users', 'consumers', 'sellers'),
+    'seller_vertical': ('seller_vertical',),
+    'address_books': ('address_books',),
+    'commodities': ('commodities',),
+    'cards': ('cards',),
+    'orders': ('orders', 'order_commodities', 'transactions', 'reviews'),
+    'consumers_aggregates': ('consumers',),
+    'sellers_aggregates': ('sellers',),
+    'commodities_aggregates': ('commodities',),
+}
+PROFILE_DIR = 'profiles'
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (None where /proc is not available)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process or its order workers so far, in MB (None without resource)"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+class RunMetrics:
+    """Timers, row/byte counters and RSS samples of one run (see INSTRUMENTATION)"""
+    
+    def __init__(self):
+        self.directory = None
+        self.records = []
+        self._lock = threading.Lock()
+        self._profiler = None
+    
+    def start(self, directory: str, resumed: bool = False):
+        """Begin a run writing into `directory`; the first phase is timed from here"""
+        self.directory = directory
+        self.records = []
+        self.started = self._last = time.perf_counter()
+        self._sizes = self._file_sizes()
+        path = CONFIG['metrics_file']
+        if path and not path.endswith('.prom') and not resumed:
+            open(path, 'w').close()
+        if CONFIG['profile']:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+    
+    def _file_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [name for name in dirs if name not in (CHECKPOINT_DIR, PROFILE_DIR)]
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError:
+                    pass
+        return sizes
+    
+    def _bytes_written(self) -> int:
+        """Bytes added to the output files since the previous call (removed files are ignored)"""
+        sizes = self._file_sizes()
+        written = sum(max(0, size - self._sizes.get(path, 0)) for path, size in sizes.items())
+        self._sizes = sizes
+        return written
+    
+    def _emit(self, record: Dict):
+        record.update(rss_mb=current_rss_mb(), peak_rss_mb=peak_rss_mb(),
+                      elapsed=round(time.perf_counter() - self.started, 4))
+        with self._lock:
+            self.records.append(record)
+            path = CONFIG['metrics_file']
+            if path and path.endswith('.prom'):
+                self.write_prometheus(path)
+            elif path:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + '\n')
+    
+    @property
+    def phases(self) -> Dict[str, Dict]:
+        return {record['phase']: record for record in self.records if record['event'] == 'phase'}
+    
+    def phase_done(self, phase: str, counts: Dict[str, int] = None, rows: int = None):
+        """Record the phase that just completed (rows default to its PHASE_TABLES counts)"""
+        if self.directory is None:
+            return
+        now = time.perf_counter()
+        seconds = now - self._last
+        if rows is None:
+            rows = sum((counts or {}).get(table, 0) for table in PHASE_TABLES.get(phase, ()))
+        if self._profiler is not None:
+            self._profiler.disable()
+            os.makedirs(os.path.join(self.directory, PROFILE_DIR), exist_ok=True)
+            self._profiler.dump_stats(os.path.join(self.directory, PROFILE_DIR, f'{phase}.prof'))
+        self._emit({
+            'event': 'phase', 'phase': phase, 'seconds': round(seconds, 4), 'rows': rows,
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+            'bytes': self._bytes_written(),
+        })
+        if self._profiler is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        # Bookkeeping (directory walk, metrics file) is not charged to the next phase
+        self._last = time.perf_counter()
+    
+    def table_loaded(self, table_name: str, rows: int, seconds: float, chunks: int, error: str = None):
+        """Record one table's PostgreSQL load (called from the loader threads)"""
+        if self.directory is None:
+            return
+        self._emit({
+            'event': 'load', 'table': table_name, 'seconds': round(seconds, 4), 'rows': rows,
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+            'chunks': chunks, 'error': error,
+        })
+    
+    def finish(self, counts: Dict[str, int]):
+        """Record the whole run and stop profiling"""
+        if self.directory is None:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+            print(f"🔬 Phase profiles: {os.path.join(self.directory, PROFILE_DIR)}/ (python -m pstats <phase>.prof)")
+        seconds = time.perf_counter() - self.started
+        rows = sum(counts.values())
+        self._emit({
+            'event': 'run', 'seconds': round(seconds, 4), 'rows': rows,
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+            'bytes': sum(self._sizes.values()), 'counts': dict(counts),
+        })
+        if CONFIG['metrics_file']:
+            print(f"📈 Run metrics: {CONFIG['metrics_file']}")
+        self.directory = None
+    
+    def write_prometheus(self, path: str):
+        """Write the records as gauges in the Prometheus text exposition format"""
+        metrics = defaultdict(list)
+        for record in self.records:
+            if record['event'] == 'phase':
+                labels = f'{{phase="{record["phase"]}"}}'
+                for key in ('seconds', 'rows', 'bytes'):
+                    metrics[f'generator_phase_{key}'].append((labels, record[key]))
+            elif record['event'] == 'load':
+                labels = f'{{table="{record["table"]}"}}'
+                metrics['generator_load_seconds'].append((labels, record['seconds']))
+                metrics['generator_load_rows'].append((labels, record['rows']))
+                metrics['generator_load_failed'].append((labels, int(record['error'] is not None)))
+            else:
+                for key in ('seconds', 'rows', 'bytes'):
+                    metrics[f'generator_run_{key}'].append(('', record[key]))
+            if record['peak_rss_mb'] is not None:
+                metrics['generator_peak_rss_bytes'] = [('', int(record['peak_rss_mb'] * 1024 * 1024))]
+        
+        lines = []
+        for name, samples in metrics.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(f'{name}{labels} {value}' for labels, value in samples)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(path + '.tmp', path)
+
+RUN_METRICS = RunMetrics()
+
+class ProgressReporter:
+    """
+    Low-overhead progress of a generation loop: items pass through in islice blocks
+    and the clock is read only between blocks (blocks grow while they take under
+    50 ms), printing a line at most every CONFIG['progress_interval'] seconds.
+    """
+    
+    MAX_BLOCK = 65536
+    
+    def __init__(self, iterable: Iterable, desc: str, unit: str, total: int = None):
+        self.iterable = iterable
+        self.desc = desc
+        self.unit = unit
+        self.total = total if total is not None else (len(iterable) if hasattr(iterable, '__len__') else None)
+    
+    def _report(self, done: int, seconds: float):
+        rate = f", {done / seconds:,.0f} {self.unit}s/s" if seconds > 0 else ""
+        if self.total:
+            print(f"⏳ {self.desc}: {done:,}/{self.total:,} {self.unit}s ({done / self.total:.0%}{rate})", flush=True)
+        else:
+            print(f"⏳ {self.desc}: {done:,} {self.unit}s{rate}", flush=True)
+    
+    def __iter__(self):
+        items = iter(self.iterable)
+        interval = CONFIG['progress_interval']
+        started = last_check = last_report = time.perf_counter()
+        block = done = 0
+        reported = False
+        while True:
+            yield from islice(items, block)
+            done += block
+            for item in items:
+                break
+            else:
+                break
+            done += 1
+            now = time.perf_counter()
+            if now - last_check < 0.05:
+                block = min(self.MAX_BLOCK, block * 2 + 1)
+            last_check = now
+            if now - last_report >= interval:
+                self._report(done, now - started)
+                last_report = now
+                reported = True
+            yield item
+        if reported:
+            print(f"⏳ {self.desc}: {self.total or done:,} {self.unit}s in {time.perf_counter() - started:.1f}s", flush=True)
+
+def progress(iterable: Iterable, desc: str, unit: str, total: int = None) -> Iterable:
+    """Wrap a generation loop in the CONFIG['progress'] display"""
+    if CONFIG['progress'] == 'none':
+        return iterable
+    if CONFIG['progress'] == 'tqdm' and load_tqdm():
+        return tqdm(iterable, desc=desc, unit=unit, total=total)
+    return ProgressReporter(iterable, desc, unit, total)
+
 # ============================================================================
 # DATA GENERATION FUNCTIONS
 # ============================================================================
 
-def load_or_generate_verticals() -> List[Dict]:
+def load_or_generate_verticals() -> List[VerticalRow]:
     """
     Load verticals from persistent master file, or generate once if not exists.
     This ensures verticals are consistent across all data generation runs.
@@ -281,7 +1106,7 @@ def load_or_generate_verticals() -> List[Dict]:
         with open(master_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f, delimiter='|')
             for row in reader:
-                verticals.append(row)
+                verticals.append(VerticalRow(**{column: row[column] for column in VerticalRow._fields}))
         
         print(f"✅ Loaded {len(verticals)} verticals from master file")
         print(f"   Verticals are consistent across all data generation runs")
@@ -292,24 +1117,20 @@ def load_or_generate_verticals() -> List[Dict]:
     print(f"   This file will be reused for all future data generation")
     verticals = []
     
-    iterator = enumerate(ENUMS['verticals'])
-    if TQDM_AVAILABLE:
-        iterator = tqdm(list(iterator), desc="Creating verticals", unit="vertical")
-    
-    for i, name in iterator:
-        vertical = {
-            'id': generate_uuid(),
-            'name': name,
-            'description': clean_text_field(fake.text(max_nb_chars=200)),
-            'status': weighted_choice(ENUMS['status'], [0.90, 0.08, 0.02]),
-        }
+    for i, name in progress(enumerate(ENUMS['verticals']), "Creating verticals", "vertical",
+                            total=len(ENUMS['verticals'])):
+        vertical = VerticalRow(
+            id=generate_uuid(),
+            name=name,
+            description=clean_text_field(fake.text(max_nb_chars=200)),
+            status=weighted_choice('vertical_status'),
+        )
         verticals.append(vertical)
     
     # Save to master file
-    fieldnames = ['id', 'name', 'description', 'status']
     with open(master_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter='|')
-        writer.writeheader()
+        writer = csv.writer(f, delimiter='|')
+        writer.writerow(VerticalRow._fields)
         writer.writerows(verticals)
     
     print(f"✅ Created and saved {len(verticals)} verticals to {master_file}")
@@ -317,683 +1138,3095 @@ def load_or_generate_verticals() -> List[Dict]:
     
     return verticals
 
-def generate_users_and_consumers() -> Tuple[List[Dict], List[Dict]]:
-    """Generate users and consumer profiles"""
-    print(f"👥 Generating {CONFIG['num_consumers']} consumers...")
-    users = []
-    consumers = []
+def generate_users_and_consumers(start: int = 0, end: int = None) -> Iterator[Tuple[UserRow, ConsumerRow]]:
+    """Generate users and consumer profiles for consumer indexes start..end-1, yielding (user, consumer) pairs"""
+    end = CONFIG['num_consumers'] if end is None else end
+    print(f"👥 Generating {end - start} consumers...")
+    now = run_reference_time()
     
-    iterator = range(CONFIG['num_consumers'])
-    if TQDM_AVAILABLE:
-        iterator = tqdm(iterator, desc="Creating consumers", unit="consumer")
-    
-    for i in iterator:
-        user_id = generate_uuid()
+    for i in progress(seeded_indexes('consumers', start, end), "Creating consumers", "consumer",
+                      total=end - seed_block_start('consumers', start)):
+        user_id = entity_uuid('consumers', i)
         
         # User record
-        user = {
-            'id': user_id,
-            'username': fake.user_name() + str(random.randint(100, 9999)),
-            'phone': fake.phone_number()[:15],
-            'name': clean_text_field(fake.name()[:100]),
-            'email': fake.email(),
-            'status': weighted_choice(ENUMS['status'], [0.95, 0.04, 0.01]),
-            'created_at': format_timestamp(random_date_in_range(730)),
-            'updated_at': format_timestamp(datetime.now()),
-        }
-        users.append(user)
+        user = UserRow(
+            id=user_id,
+            username=fake.user_name() + str(random.randint(100, 9999)),
+            phone=fake.phone_number()[:15],
+            name=clean_text_field(fake_value('name')[:100]),
+            email=fake.email(),
+            status=weighted_choice('user_status'),
+            created_at=format_timestamp(random_date_in_range(730)),
+            updated_at=format_timestamp(now),
+        )
         
         # Consumer record (will be populated with aggregates later)
-        consumer = {
-            'id': user_id,
-            'birthday': format_date(fake.date_of_birth(minimum_age=18, maximum_age=80)),
-            'gender': weighted_choice(ENUMS['gender'], [0.48, 0.48, 0.02, 0.02]),
-            'first_order_date': '',
-            'total_orders': 0,
-            'total_spent': format_decimal(Decimal('0'), 4),
-            'customer_segment': 'One-time',
-        }
-        consumers.append(consumer)
-    
-    print(f"✅ Created {len(users)} consumer users")
-    return users, consumers
+        consumer = ConsumerRow(
+            id=user_id,
+            birthday=format_date(now - random.randint(18 * 365, 80 * 365) * SECONDS_PER_DAY),
+            gender=weighted_choice('gender'),
+            first_order_date='',
+            total_orders=0,
+            total_spent=0,
+            customer_segment='One-time',
+        )
+        if i >= start:
+            yield user, consumer
 
-def generate_sellers(num_sellers: int) -> Tuple[List[Dict], List[Dict]]:
-    """Generate sellers and their user accounts"""
-    print(f"🏪 Generating {num_sellers} sellers...")
-    users = []
-    sellers = []
+def generate_sellers(start: int = 0, end: int = None) -> Iterator[Tuple[UserRow, SellerRow]]:
+    """Generate sellers for seller indexes start..end-1 and their user accounts, yielding (user, seller) pairs"""
+    end = CONFIG['num_sellers'] if end is None else end
+    print(f"🏪 Generating {end - start} sellers...")
+    now = run_reference_time()
     
-    iterator = range(num_sellers)
-    if TQDM_AVAILABLE:
-        iterator = tqdm(iterator, desc="Creating sellers", unit="seller")
-    
-    for i in iterator:
-        user_id = generate_uuid()
+    for i in progress(seeded_indexes('sellers', start, end), "Creating sellers", "seller",
+                      total=end - seed_block_start('sellers', start)):
+        user_id = entity_uuid('sellers', i)
         
         # User record
-        user = {
-            'id': user_id,
-            'username': 'seller_' + fake.user_name() + str(random.randint(100, 9999)),
-            'phone': fake.phone_number()[:15],
-            'name': clean_text_field(fake.company()[:100]),
-            'email': f"seller{i}@{fake.domain_name()}",
-            'status': weighted_choice(ENUMS['status'], [0.95, 0.04, 0.01]),
-            'created_at': format_timestamp(random_date_in_range(1095)),
-            'updated_at': format_timestamp(datetime.now()),
-        }
-        users.append(user)
+        user = UserRow(
+            id=user_id,
+            username='seller_' + fake.user_name() + str(random.randint(100, 9999)),
+            phone=fake.phone_number()[:15],
+            name=clean_text_field(fake_value('company')[:100]),
+            email=f"seller{i}@{fake_value('domain_name')}",
+            status=weighted_choice('user_status'),
+            created_at=format_timestamp(random_date_in_range(1095)),
+            updated_at=format_timestamp(now),
+        )
         
         # Seller record
-        seller = {
-            'id': user_id,
-            'type': weighted_choice(ENUMS['seller_type'], [0.85, 0.15]),
-            'introduction': clean_text_field(fake.paragraph(nb_sentences=3))[:400],
-            'address': clean_text_field(fake.street_address()[:150]),
-            'city': clean_text_field(fake.city()[:50]),
-            'province': clean_text_field(fake.state()[:50]),
-            'country': clean_text_field(fake.country()[:60]),
-            'rating_avg': format_rating(Decimal('0')),
-            'total_sales': format_decimal(Decimal('0'), 4),
-            'total_orders': 0,
-        }
-        sellers.append(seller)
-    
-    print(f"✅ Created {len(sellers)} sellers")
-    return users, sellers
+        seller = SellerRow(
+            id=user_id,
+            type=weighted_choice('seller_type'),
+            introduction=clean_text_field(fake_value('paragraph'))[:400],
+            address=clean_text_field(fake_value('street_address')[:150]),
+            city=clean_text_field(fake_value('city')[:50]),
+            province=clean_text_field(fake_value('state')[:50]),
+            country=clean_text_field(fake_value('country')[:60]),
+            rating_avg=0,
+            total_sales=0,
+            total_orders=0,
+        )
+        if i >= start:
+            yield user, seller
 
-def generate_address_books(consumers: List[Dict]) -> List[Dict]:
-    """Generate shipping addresses for consumers"""
+def generate_address_books(start: int = 0, end: int = None) -> Iterator[Tuple[int, AddressBookRow]]:
+    """Generate shipping addresses for consumer indexes start..end-1, yielding (consumer index, address) pairs"""
+    end = CONFIG['num_consumers'] if end is None else end
     print("📍 Generating address books...")
-    addresses = []
+    now = run_reference_time()
     
-    iterator = consumers
-    if TQDM_AVAILABLE:
-        iterator = tqdm(consumers, desc="Creating addresses", unit="consumer")
-    
-    for consumer in iterator:
+    for index in progress(seeded_indexes('address_books', start, end), "Creating addresses", "consumer",
+                          total=end - seed_block_start('address_books', start)):
+        consumer_id = entity_uuid('consumers', index)
         num_addresses = random.randint(*CONFIG['address_per_consumer_range'])
         
         for i in range(num_addresses):
-            address = {
-                'id': generate_uuid(),
-                'user_id': consumer['id'],
-                'address_line_1': clean_text_field(fake.street_address()[:100]),
-                'address_line_2': clean_text_field(fake.secondary_address()[:100]) if random.random() > 0.7 else '',
-                'city': clean_text_field(fake.city()[:50]),
-                'province': clean_text_field(fake.state()[:50]),
-                'country': clean_text_field(fake.country()[:30]),
-                'postal_code': fake.postcode()[:10],
-                'phone': fake.phone_number()[:15],
-                'receiver_name': clean_text_field(fake.name()[:100]),
-                'is_default': 'true' if i == 0 else 'false',
-                'latitude': str(random_decimal(-90, 90, 7)),
-                'longitude': str(random_decimal(-180, 180, 7)),
-                'created_at': format_timestamp(datetime.now() - timedelta(days=random.randint(0, 365))),
-                'updated_at': format_timestamp(datetime.now()),
-            }
-            addresses.append(address)
-    
-    print(f"✅ Created {len(addresses)} addresses")
-    return addresses
-
-def generate_seller_verticals(sellers: List[Dict], verticals: List[Dict]) -> List[Dict]:
-    """Generate seller-vertical relationships"""
+            address = AddressBookRow(
+                id=entity_uuid('address_books', index * CHILD_ID_SLOTS + i),
+                user_id=consumer_id,
+                address_line_1=clean_text_field(fake_value('street_address')[:100]),
+                address_line_2=clean_text_field(fake_value('secondary_address')[:100]) if random.random() > 0.7 else '',
+                city=clean_text_field(fake_value('city')[:50]),
+                province=clean_text_field(fake_value('state')[:50]),
+                country=clean_text_field(fake_value('country')[:30]),
+                postal_code=fake_value('postcode')[:10],
+                phone=fake_value('phone_number')[:15],
+                receiver_name=clean_text_field(fake_value('name')[:100]),
+                is_default='true' if i == 0 else 'false',
+                latitude=random_units(-90 * COORDINATE_SCALE, 90 * COORDINATE_SCALE),
+                longitude=random_units(-180 * COORDINATE_SCALE, 180 * COORDINATE_SCALE),
+                created_at=format_timestamp(random_date_in_range(365)),
+                updated_at=format_timestamp(now),
+            )
+            # Consumers before start only advance the block's random stream
+            if index >= start:
+                yield index, address
+
+def generate_seller_verticals(verticals: List[VerticalRow], start: int = 0,
+                              end: int = None) -> Iterator[Tuple[int, int, SellerVerticalRow]]:
+    """Generate seller-vertical relationships for seller indexes start..end-1, yielding (seller index, vertical index, rel)"""
+    end = CONFIG['num_sellers'] if end is None else end
     print("🔗 Generating seller-vertical relationships...")
-    relationships = []
+    now = run_reference_time()
     
-    for seller in sellers:
+    for index in seeded_indexes('seller_vertical', start, end):
+        seller_id = entity_uuid('sellers', index)
         # Each seller operates in 1-5 verticals
         num_verticals = random.randint(1, min(5, len(verticals)))
-        selected_verticals = random.sample(verticals, num_verticals)
+        selected_verticals = random.sample(range(len(verticals)), num_verticals)
         
         for vertical in selected_verticals:
-            rel = {
-                'seller_id': seller['id'],
-                'vertical_id': vertical['id'],
-                'created_at': format_timestamp(datetime.now() - timedelta(days=random.randint(0, 730))),
-                'updated_at': format_timestamp(datetime.now()),
-            }
-            relationships.append(rel)
-    
-    print(f"✅ Created {len(relationships)} seller-vertical links")
-    return relationships
-
-def generate_commodities(sellers: List[Dict], verticals: List[Dict], seller_verticals: List[Dict]) -> List[Dict]:
-    """Generate product catalog"""
-    print(f"📦 Generating {CONFIG['num_commodities']} commodities...")
-    commodities = []
-    
-    # Build lookup: seller_id -> list of vertical_ids
-    seller_to_verticals = defaultdict(list)
-    for sv in seller_verticals:
-        seller_to_verticals[sv['seller_id']].append(sv['vertical_id'])
+            rel = SellerVerticalRow(
+                seller_id=seller_id,
+                vertical_id=verticals[vertical].id,
+                created_at=format_timestamp(random_date_in_range(730)),
+                updated_at=format_timestamp(now),
+            )
+            # Sellers before start only advance the block's random stream
+            if index >= start:
+                yield index, vertical, rel
+
+def generate_commodities(verticals: List[VerticalRow], seller_to_verticals: AdjacencyIndex,
+                         start: int = 0, end: int = None) -> Iterator[CommodityRow]:
+    """Generate product catalog for commodity indexes start..end-1 (seller_to_verticals: vertical indexes per seller)"""
+    end = CONFIG['num_commodities'] if end is None else end
+    print(f"📦 Generating {end - start} commodities...")
+    now = run_reference_time()
     
     # VALIDATION: Ensure all sellers have at least one vertical
-    sellers_with_verticals = [s for s in sellers if s['id'] in seller_to_verticals]
+    sellers_with_verticals = [s for s in range(len(seller_to_verticals)) if seller_to_verticals.count(s)]
     if not sellers_with_verticals:
         print("⚠️  WARNING: No sellers have verticals assigned. Using all sellers with random verticals.")
-        sellers_with_verticals = sellers
+        sellers_with_verticals = list(range(len(seller_to_verticals)))
+    
+    if CONFIG['engine'] == 'numpy':
+        yield from _generate_commodities_numpy(sellers_with_verticals, seller_to_verticals, verticals, start, end)
+        return
     
-    iterator = range(CONFIG['num_commodities'])
-    if TQDM_AVAILABLE:
-        iterator = tqdm(iterator, desc="Creating commodities", unit="product")
+    vertical_offsets, vertical_indexes = seller_to_verticals.offsets, seller_to_verticals.values
     
-    for i in iterator:
+    for i in progress(seeded_indexes('commodities', start, end), "Creating commodities", "product",
+                      total=end - seed_block_start('commodities', start)):
         seller = random.choice(sellers_with_verticals)
         
         # Choose vertical from seller's verticals (STRONG REFERENTIAL INTEGRITY)
-        if seller['id'] in seller_to_verticals:
-            vertical_id = random.choice(seller_to_verticals[seller['id']])
+        first = vertical_offsets[seller]
+        num_verticals = vertical_offsets[seller + 1] - first
+        if num_verticals:
+            vertical_id = verticals[vertical_indexes[first + random.randrange(num_verticals)]].id
         else:
-            vertical_id = random.choice(verticals)['id']
-        
-        price = random_decimal(5.0, 2000.0, decimals=4)
-        cost_price = price * random_decimal(0.4, 0.8, decimals=4)  # 40-80% of selling price
-        
-        commodity = {
-            'id': generate_uuid(),
-            'seller_id': seller['id'],
-            'sku': generate_unique_sku(),
-            'name': clean_text_field(fake.catch_phrase()[:255]),
-            'price': format_decimal(price, 4),
-            'cost_price': format_decimal(cost_price, 4),
-            'quantity': random.randint(0, 5000),
-            'reserved_quantity': 0,
-            'reorder_level': random.randint(5, 50),
-            'reorder_quantity': random.randint(50, 500),
-            'weight_kg': format_decimal(random_decimal(0.1, 50.0, decimals=4), 4),
-            'description': clean_text_field(fake.text(max_nb_chars=200)) if random.random() > 0.3 else '',
-            'technical_info': clean_text_field(fake.text(max_nb_chars=200)) if random.random() > 0.6 else '',
-            'guarantee_info': clean_text_field(fake.text(max_nb_chars=200)) if random.random() > 0.7 else '',
-            'manufacturer_name': clean_text_field(fake.company()[:100]) if random.random() > 0.4 else '',
-            'vertical_id': vertical_id,
-            'status': weighted_choice(ENUMS['commodity_status'], [0.85, 0.08, 0.05, 0.02]),
-            'rating_avg': format_rating(Decimal('0')),
-            'review_count': 0,
-            'total_sold': 0,
-            'created_at': format_timestamp(random_date_in_range(180)),
-            'updated_at': format_timestamp(datetime.now()),
-        }
-        commodities.append(commodity)
-    
-    print(f"✅ Created {len(commodities)} commodities")
-    return commodities
+            vertical_id = random.choice(verticals).id
+        
+        price = random_units(5 * MONEY_SCALE, 2000 * MONEY_SCALE)
+        cost_ratio = random_units(0.4 * MONEY_SCALE, 0.8 * MONEY_SCALE)  # 40-80% of selling price
+        cost_price = div_round_half_up(price * cost_ratio, MONEY_SCALE)
+        
+        commodity = CommodityRow(
+            id=entity_uuid('commodities', i),
+            seller_id=entity_uuid('sellers', seller),
+            sku=generate_unique_sku(),
+            name=clean_text_field(fake_value('catch_phrase')[:255]),
+            price=price,
+            cost_price=cost_price,
+            quantity=random.randint(0, 5000),
+            reserved_quantity=0,
+            reorder_level=random.randint(5, 50),
+            reorder_quantity=random.randint(50, 500),
+            weight_kg=random_units(0.1 * MONEY_SCALE, 50 * MONEY_SCALE),
+            description=clean_text_field(fake_value('text_200')) if random.random() > 0.3 else '',
+            technical_info=clean_text_field(fake_value('text_200')) if random.random() > 0.6 else '',
+            guarantee_info=clean_text_field(fake_value('text_200')) if random.random() > 0.7 else '',
+            manufacturer_name=clean_text_field(fake_value('company')[:100]) if random.random() > 0.4 else '',
+            vertical_id=vertical_id,
+            status=weighted_choice('commodity_status'),
+            rating_avg=0,
+            review_count=0,
+            total_sold=0,
+            created_at=format_timestamp(random_date_in_range(180)),
+            updated_at=format_timestamp(now),
+        )
+        if i >= start:
+            yield commodity
 
-def generate_cards(consumers: List[Dict]) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
-    """Generate payment cards for consumers"""
+def generate_cards(start: int = 0, end: int = None) -> Iterator[Tuple[int, CardRow]]:
+    """Generate payment cards for consumer indexes start..end-1, yielding (consumer index, card) pairs"""
+    end = CONFIG['num_consumers'] if end is None else end
     print("💳 Generating credit cards...")
-    cards = []
-    consumer_cards_map = {}  # Track cards per consumer
-    
-    iterator = consumers
-    if TQDM_AVAILABLE:
-        iterator = tqdm(consumers, desc="Creating cards", unit="consumer")
+    now = run_reference_time()
     
-    for consumer in iterator:
+    for index in progress(seeded_indexes('cards', start, end), "Creating cards", "consumer",
+                          total=end - seed_block_start('cards', start)):
+        consumer_id = entity_uuid('consumers', index)
         num_cards = random.randint(*CONFIG['cards_per_consumer_range'])
-        consumer_cards = []
         
         for i in range(num_cards):
             card_number = fake.credit_card_number()
             
-            card = {
-                'id': generate_uuid(),
-                'consumer_id': consumer['id'],
-                'tk': hash_card_number(card_number),
-                'provider': weighted_choice(ENUMS['card_provider'], [0.40, 0.30, 0.10, 0.05, 0.05, 0.05, 0.05]),
-                'last4': card_number[-4:],
-                'card_holder': clean_text_field(fake.name()[:100]),
-                'exp_year': random.randint(2024, 2030),
-                'exp_month': random.randint(1, 12),
-                'status': weighted_choice(ENUMS['card_status'], [0.90, 0.05, 0.03, 0.01, 0.01]),
-                'is_default': 'true' if i == 0 else 'false',
-                'created_at': format_timestamp(random_date_in_range(1095)),
-                'updated_at': format_timestamp(datetime.now()),
-            }
-            cards.append(card)
-            consumer_cards.append(card)
-        
-        consumer_cards_map[consumer['id']] = consumer_cards
-    
-    print(f"✅ Created {len(cards)} cards")
-    return cards, consumer_cards_map
+            card = CardRow(
+                id=entity_uuid('cards', index * CHILD_ID_SLOTS + i),
+                consumer_id=consumer_id,
+                tk=hash_card_number(card_number),
+                provider=weighted_choice('card_provider'),
+                last4=card_number[-4:],
+                card_holder=clean_text_field(fake_value('name')[:100]),
+                exp_year=random.randint(2024, 2030),
+                exp_month=random.randint(1, 12),
+                status=weighted_choice('card_status'),
+                is_default='true' if i == 0 else 'false',
+                created_at=format_timestamp(random_date_in_range(1095)),
+                updated_at=format_timestamp(now),
+            )
+            # Consumers before start only advance the block's random stream
+            if index >= start:
+                yield index, card
 
-def generate_orders_and_related(
-    consumers: List[Dict],
-    sellers: List[Dict],
-    commodities: List[Dict],
-    cards_map: Dict[str, List[Dict]],
-    addresses: List[Dict]
-) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
-    """Generate orders, order_commodities, transactions, and reviews"""
-    print(f"🛒 Generating {CONFIG['num_orders']} orders with line items...")
+# Per-process context for order shards (set in the parent or by the pool initializer)
+_ORDER_CONTEXT = {}
+
+def _init_order_worker(context: Dict):
+    """Pool initializer: receive the lookups every order shard needs"""
+    _ORDER_CONTEXT.clear()
+    _ORDER_CONTEXT.update(context)
+    _RUN_CLOCK['reference'] = context['reference_time']
+    _RUN_CLOCK['window'] = context['window']
+    skip_faker_text(not context['faker_text'])
+    if context['engine'] == 'numpy':
+        load_numpy()
+    if context['id_seed'] != _ENTITY_IDS['seed']:
+        set_id_space(context['id_seed'])
+    if context.get('faker_pools') and context['faker_pools'] is not FAKER_POOLS:
+        FAKER_POOLS.clear()
+        FAKER_POOLS.update(context['faker_pools'])
+
+def _generate_order_shard(shard: Tuple[int, int, int]) -> Tuple:
+    """
+    Generate one contiguous range of orders with its own derived seed.
+    Returns the rows plus the shard's aggregate rows, which the parent merges in shard order.
+    Only the orders inside the context's index_range are kept (and aggregated).
+    """
+    shard_index, start, end = shard
+    ctx = _ORDER_CONTEXT
+    if ctx['engine'] == 'numpy':
+        return _generate_order_shard_numpy(shard)
+    
+    # Consumers, sellers and commodities are picked by index
+    consumers = range(ctx['num_consumers'])
+    sellers = range(ctx['num_sellers'])
+    commodities = ctx['commodities']
+    commodity_indexes = range(len(commodities))
+    # Consumer -> addresses/cards are CSR indexes: a pick is an offset read and a value read
+    address_offsets, addresses = ctx['consumer_addresses'].offsets, ctx['consumer_addresses'].values
+    card_offsets, card_indexes = ctx['consumer_cards'].offsets, ctx['consumer_cards'].values
+    
+    shard_seed = derive_seed(ctx['seed'], 'orders', shard_index)
+    random.seed(shard_seed)
+    fake.seed_instance(shard_seed)
+    now = run_reference_time()
+    first_kept, keep_end = max(start, ctx['index_range'][0]), ctx['index_range'][1]
+    # Rows of the other tables are drawn (their draws feed the aggregates and the later
+    # columns) but not built
+    build_orders, build_items, build_transactions, build_reviews = (table in ctx['tables'] for table in ORDER_TABLES)
     
     orders = []
     order_commodities = []
     transactions = []
     reviews = []
     
-    # Build lookups
-    consumer_addresses = defaultdict(list)
-    for addr in addresses:
-        consumer_addresses[addr['user_id']].append(addr)
-    
-    # Track aggregates for denormalization
-    consumer_stats = defaultdict(lambda: {'orders': 0, 'spent': Decimal('0.0000'), 'first_order': None})
-    seller_stats = defaultdict(lambda: {'orders': 0, 'sales': Decimal('0.0000'), 'ratings': []})
-    commodity_stats = defaultdict(lambda: {'sold': 0, 'ratings': []})
+    # Track aggregates for denormalization: (index, *AGGREGATE_FIELDS values) rows
+    consumer_stats = []
+    seller_stats = []
+    commodity_stats = []
     
-    iterator = range(CONFIG['num_orders'])
-    if TQDM_AVAILABLE:
-        iterator = tqdm(iterator, desc="Creating orders", unit="order")
-    
-    for i in iterator:
+    for i in range(start, min(end, keep_end)):
+        if i == first_kept and i > start:
+            # The orders before the index range only advanced the shard's random stream
+            for rows in (orders, order_commodities, transactions, reviews,
+                         consumer_stats, seller_stats, commodity_stats):
+                rows.clear()
+        
         consumer = random.choice(consumers)
         seller = random.choice(sellers)
         
         # Get consumer's address
-        consumer_addrs = consumer_addresses.get(consumer['id'], [])
-        if not consumer_addrs:
+        first_address = address_offsets[consumer]
+        num_addresses = address_offsets[consumer + 1] - first_address
+        if not num_addresses:
             continue  # Skip if no address
         
-        delivery_addr = random.choice(consumer_addrs)
+        delivery_addr = addresses[first_address + random.randrange(num_addresses)]
         
         # Order timestamps
         created_at = random_date_in_range(90)
-        order_status = weighted_choice(ENUMS['order_status'], [0.02, 0.05, 0.03, 0.10, 0.55, 0.20, 0.03, 0.02])
+        order_status = weighted_choice('order_status')
         
         # Generate order line items
-        num_items = random.randint(*CONFIG['items_per_order_range'])
-        selected_commodities = random.sample(commodities, min(num_items, len(commodities)))
+        num_items = random.randint(*ctx['items_per_order_range'])
+        selected_commodities = random.sample(commodity_indexes, min(num_items, len(commodities)))
         
-        subtotal = Decimal('0.0000')
-        order_items = []
+        # All money below is integer ten-thousandths (see MONEY_SCALE)
+        subtotal = 0
+        line_items = []
         
-        for commodity in selected_commodities:
+        for commodity_index in selected_commodities:
+            commodity = commodities[commodity_index]
             quantity = random.randint(1, 5)
-            unit_price = Decimal(commodity['price'])
-            unit_cost = Decimal(commodity['cost_price']) if commodity['cost_price'] else unit_price * Decimal('0.6')
+            unit_price = commodity.price
+            unit_cost = commodity.cost_price if commodity.cost_price else div_round_half_up(unit_price * 6, 10)
             line_total = unit_price * quantity
-            unit_cost = quantize_decimal(unit_cost, 4)
-            discount = quantize_decimal(random_decimal(0, line_total * Decimal('0.2'), decimals=4), 4)
-            net_total = quantize_decimal(line_total - discount, 4)
+            discount = random_units(0, line_total * 0.2)
+            net_total = line_total - discount
             
-            order_item = {
-                'order_id': '',  # Will be filled
-                'commodity_id': commodity['id'],
-                'quantity': quantity,
-                'unit_price': format_decimal(unit_price, 4),
-                'unit_cost': format_decimal(unit_cost, 4),
-                'line_total': format_decimal(net_total, 4),
-                'discount_applied': format_decimal(discount, 4),
-            }
-            order_items.append(order_item)
-            subtotal = quantize_decimal(subtotal + net_total, 4)
+            # order_commodities columns after order_id, with the commodity index in place of its id
+            line_items.append((commodity_index, quantity, unit_price, unit_cost, net_total, discount))
+            subtotal += net_total
         
         # Calculate order totals
-        tax_amount = quantize_decimal(subtotal * Decimal('0.08'), 4)  # 8% tax
-        shipping_fee = quantize_decimal(random_decimal(0, 20, decimals=4), 4)
-        discount_amount = quantize_decimal(random_decimal(0, subtotal * Decimal('0.1'), decimals=4), 4)
-        total_amount = quantize_decimal(subtotal + tax_amount + shipping_fee - discount_amount, 4)
-        
-        # Order record
-        order_id = generate_uuid()
-        order = {
-            'id': order_id,
-            'consumer_id': consumer['id'],
-            'seller_id': seller['id'],
-            'status': order_status,
-            'delivery_address': delivery_addr['address_line_1'],
-            'delivery_postal_code': delivery_addr['postal_code'],
-            'delivery_receiver': delivery_addr['receiver_name'],
-            'delivery_phone': delivery_addr['phone'],
-            'delivery_city': delivery_addr['city'],
-            'delivery_country': delivery_addr['country'],
-            'delivery_latitude': delivery_addr['latitude'],
-            'delivery_longitude': delivery_addr['longitude'],
-            'subtotal_amount': format_decimal(subtotal, 4),
-            'tax_amount': format_decimal(tax_amount, 4),
-            'shipping_fee': format_decimal(shipping_fee, 4),
-            'discount_amount': format_decimal(discount_amount, 4),
-            'total_amount': format_decimal(total_amount, 4),
-            'created_at': format_timestamp(created_at),
-            'confirmed_at': '',
-            'paid_at': '',
-            'shipped_at': '',
-            'delivered_at': '',
-            'completed_at': '',
-            'updated_at': format_timestamp(datetime.now()),
-            'days_to_ship': '',
-            'days_to_deliver': '',
-        }
+        tax_amount = div_round_half_up(subtotal * 8, 100)  # 8% tax
+        shipping_fee = random_units(0, 20 * MONEY_SCALE)
+        discount_amount = random_units(0, subtotal * 0.1)
+        total_amount = subtotal + tax_amount + shipping_fee - discount_amount
+        
+        order_id = entity_uuid('orders', i)
+        consumer_id = entity_uuid('consumers', consumer)
+        seller_id = entity_uuid('sellers', seller)
         
         # Set timestamps based on status
+        confirmed = paid = shipped = delivered = completed = days_to_ship = days_to_deliver = ''
         if order_status != 'draft':
-            order['confirmed_at'] = format_timestamp(created_at + timedelta(hours=random.randint(1, 24)))
+            confirmed = format_timestamp(created_at + random.randint(1, 24) * SECONDS_PER_HOUR)
         
         if order_status in ['inprogress', 'shipped', 'delivered', 'done']:
-            paid_at = created_at + timedelta(hours=random.randint(1, 48))
-            order['paid_at'] = format_timestamp(paid_at)
+            paid_at = created_at + random.randint(1, 48) * SECONDS_PER_HOUR
+            paid = format_timestamp(paid_at)
             
             if order_status in ['shipped', 'delivered', 'done']:
-                shipped_at = paid_at + timedelta(days=random.randint(1, 5))
-                order['shipped_at'] = format_timestamp(shipped_at)
-                order['days_to_ship'] = str((shipped_at - paid_at).days)
+                shipped_at = paid_at + random.randint(1, 5) * SECONDS_PER_DAY
+                shipped = format_timestamp(shipped_at)
+                days_to_ship = str((shipped_at - paid_at) // SECONDS_PER_DAY)
                 
                 if order_status in ['delivered', 'done']:
-                    delivered_at = shipped_at + timedelta(days=random.randint(1, 7))
-                    order['delivered_at'] = format_timestamp(delivered_at)
-                    order['days_to_deliver'] = str((delivered_at - shipped_at).days)
+                    delivered_at = shipped_at + random.randint(1, 7) * SECONDS_PER_DAY
+                    delivered = format_timestamp(delivered_at)
+                    days_to_deliver = str((delivered_at - shipped_at) // SECONDS_PER_DAY)
                     
                     if order_status == 'done':
-                        order['completed_at'] = format_timestamp(delivered_at + timedelta(days=random.randint(7, 14)))
+                        completed = format_timestamp(delivered_at + random.randint(7, 14) * SECONDS_PER_DAY)
         
-        orders.append(order)
+        if build_orders:
+            orders.append(OrderRow(
+                id=order_id,
+                consumer_id=consumer_id,
+                seller_id=seller_id,
+                status=order_status,
+                delivery_address=delivery_addr.address_line_1,
+                delivery_postal_code=delivery_addr.postal_code,
+                delivery_receiver=delivery_addr.receiver_name,
+                delivery_phone=delivery_addr.phone,
+                delivery_city=delivery_addr.city,
+                delivery_country=delivery_addr.country,
+                delivery_latitude=delivery_addr.latitude,
+                delivery_longitude=delivery_addr.longitude,
+                subtotal_amount=subtotal,
+                tax_amount=tax_amount,
+                shipping_fee=shipping_fee,
+                discount_amount=discount_amount,
+                total_amount=total_amount,
+                created_at=format_timestamp(created_at),
+                confirmed_at=confirmed,
+                paid_at=paid,
+                shipped_at=shipped,
+                delivered_at=delivered,
+                completed_at=completed,
+                updated_at=format_timestamp(now),
+                days_to_ship=days_to_ship,
+                days_to_deliver=days_to_deliver,
+            ))
         
-        # Add order_id to line items
-        for item in order_items:
-            item['order_id'] = order_id
-            order_commodities.append(item)
+        if build_items:
+            order_commodities.extend(OrderCommodityRow(order_id, entity_uuid('commodities', commodity_index), *line_item)
+                                     for commodity_index, *line_item in line_items)
         
         # Generate transaction
         if order_status in ['inprogress', 'shipped', 'delivered', 'done', 'captured']:
-            consumer_cards = cards_map.get(consumer['id'], [])
-            if consumer_cards:
-                card = random.choice(consumer_cards)
+            first_card = card_offsets[consumer]
+            card_count = card_offsets[consumer + 1] - first_card
+            if card_count:
+                card = card_indexes[first_card + random.randrange(card_count)]
                 
-                trans_created = created_at + timedelta(hours=random.randint(0, 2))
-                trans_status = 'captured' if order_status in ['inprogress', 'shipped', 'delivered', 'done'] else weighted_choice(ENUMS['trans_status'], [0.05, 0.10, 0.80, 0.03, 0.01, 0.01])
+                trans_created = created_at + random.randint(0, 2) * SECONDS_PER_HOUR
+                trans_status = 'captured' if order_status in ['inprogress', 'shipped', 'delivered', 'done'] else weighted_choice('trans_status')
+                authorized_at = trans_created + random.randint(1, 60) if trans_status != 'draft' else None
+                trans_completed = trans_created + random.randint(60, 300) if trans_status == 'captured' else None
+                gateway_id = random.randint(100000000, 999999999)
+                response_code = '00' if trans_status == 'captured' else str(random.randint(1, 99)).zfill(2)
+                ip_address = fake_value('ipv4')
+                user_agent = fake_value('user_agent')
                 
-                transaction = {
-                    'id': generate_uuid(),
-                    'order_id': order_id,
-                    'card_id': card['id'],
-                    'payment_method': 'card',
-                    'transaction_type': 'sale',
-                    'amount': format_decimal(total_amount, 4),
-                    'status': trans_status,
-                    'created_at': format_timestamp(trans_created),
-                    'authorized_at': format_timestamp(trans_created + timedelta(seconds=random.randint(1, 60))) if trans_status != 'draft' else '',
-                    'completed_at': format_timestamp(trans_created + timedelta(seconds=random.randint(60, 300))) if trans_status == 'captured' else '',
-                    'gateway_transaction_id': f"GTW-{random.randint(100000000, 999999999)}",
-                    'gateway_response_code': '00' if trans_status == 'captured' else str(random.randint(1, 99)).zfill(2),
-                    'gateway_response_message': 'Approved' if trans_status == 'captured' else 'Declined',
-                    'ip_address': fake.ipv4(),
-                    'user_agent': clean_text_field(fake.user_agent()[:255]),
-                }
-                transactions.append(transaction)
+                if build_transactions:
+                    transactions.append(TransactionRow(
+                        id=entity_uuid('transactions', i),
+                        order_id=order_id,
+                        card_id=entity_uuid('cards', card),
+                        payment_method='card',
+                        transaction_type='sale',
+                        amount=total_amount,
+                        status=trans_status,
+                        created_at=format_timestamp(trans_created),
+                        authorized_at=format_timestamp(authorized_at) if authorized_at is not None else '',
+                        completed_at=format_timestamp(trans_completed) if trans_completed is not None else '',
+                        gateway_transaction_id=f"GTW-{gateway_id}",
+                        gateway_response_code=response_code,
+                        gateway_response_message='Approved' if trans_status == 'captured' else 'Declined',
+                        ip_address=ip_address,
+                        user_agent=clean_text_field(user_agent[:255]),
+                    ))
         
         # Generate review (60% chance for delivered/done orders)
         if order_status in ['delivered', 'done'] and random.random() < 0.6:
-            for item in order_items:
+            for position, (commodity_index, *_) in enumerate(line_items):
                 if random.random() < 0.6:  # 60% of items get reviewed
-                    rate = weighted_choice([1, 2, 3, 4, 5], [0.05, 0.05, 0.15, 0.35, 0.40])
+                    rate = weighted_choice('review_rate')
+                    comment = fake_value('text_500') if random.random() > 0.2 else ''
+                    review_status = weighted_choice('review_status')
+                    helpful_count = random.randint(0, 100)
+                    review_created = delivered_at + random.randint(1, 30) * SECONDS_PER_DAY
+                    review_published = delivered_at + random.randint(1, 31) * SECONDS_PER_DAY
                     
-                    review = {
-                        'id': generate_uuid(),
-                        'order_id': order_id,
-                        'commodity_id': item['commodity_id'],
-                        'consumer_id': consumer['id'],
-                        'seller_id': seller['id'],
-                        'rate': rate,
-                        'comment': clean_text_field(fake.text(max_nb_chars=500)) if random.random() > 0.2 else '',
-                        'status': weighted_choice(ENUMS['review_status'], [0.05, 0.90, 0.03, 0.02]),
-                        'is_verified_purchase': 'true',
-                        'helpful_count': random.randint(0, 100),
-                        'created_at': format_timestamp(datetime.strptime(order['delivered_at'], '%Y-%m-%d %H:%M:%S') + timedelta(days=random.randint(1, 30))),
-                        'updated_at': format_timestamp(datetime.now()),
-                        'published_at': format_timestamp(datetime.strptime(order['delivered_at'], '%Y-%m-%d %H:%M:%S') + timedelta(days=random.randint(1, 31))),
-                    }
-                    reviews.append(review)
+                    if build_reviews:
+                        reviews.append(ReviewRow(
+                            id=entity_uuid('reviews', i * CHILD_ID_SLOTS + position),
+                            order_id=order_id,
+                            commodity_id=entity_uuid('commodities', commodity_index),
+                            consumer_id=consumer_id,
+                            seller_id=seller_id,
+                            rate=rate,
+                            comment=clean_text_field(comment),
+                            status=review_status,
+                            is_verified_purchase='true',
+                            helpful_count=helpful_count,
+                            created_at=format_timestamp(review_created),
+                            updated_at=format_timestamp(now),
+                            published_at=format_timestamp(review_published),
+                        ))
                     
                     # Track for aggregation
-                    commodity_stats[item['commodity_id']]['ratings'].append(rate)
-                    seller_stats[seller['id']]['ratings'].append(rate)
+                    commodity_stats.append((commodity_index, 0, rate, 1))
+                    seller_stats.append((seller, 0, 0, rate, 1))
         
         # Track aggregates for completed orders
         if order_status in ['delivered', 'done']:
-            consumer_stats[consumer['id']]['orders'] += 1
-            consumer_stats[consumer['id']]['spent'] += total_amount
-            if consumer_stats[consumer['id']]['first_order'] is None:
-                consumer_stats[consumer['id']]['first_order'] = created_at
+            consumer_stats.append((consumer, 1, total_amount, created_at))
+            seller_stats.append((seller, 1, total_amount, 0, 0))
             
-            seller_stats[seller['id']]['orders'] += 1
-            seller_stats[seller['id']]['sales'] += total_amount
-            
-            for item in order_items:
-                commodity_stats[item['commodity_id']]['sold'] += item['quantity']
-    
-    print(f"✅ Created {len(orders)} orders")
-    print(f"✅ Created {len(order_commodities)} order line items")
-    print(f"✅ Created {len(transactions)} transactions")
-    print(f"✅ Created {len(reviews)} reviews")
-    
-    # Update denormalized fields
-    print("📊 Updating denormalized aggregates...")
+            for commodity_index, quantity, *_ in line_items:
+                commodity_stats.append((commodity_index, quantity, 0, 0))
     
-    for consumer in consumers:
-        stats = consumer_stats[consumer['id']]
-        consumer['total_orders'] = stats['orders']
-        consumer['total_spent'] = format_decimal(stats['spent'], 4)
-        consumer['customer_segment'] = calculate_customer_segment(stats['spent'])
-        if stats['first_order']:
-            consumer['first_order_date'] = format_date(stats['first_order'])
-    
-    for seller in sellers:
-        stats = seller_stats[seller['id']]
-        seller['total_orders'] = stats['orders']
-        seller['total_sales'] = format_decimal(stats['sales'], 4)
-        if stats['ratings']:
-            avg_rating = Decimal(sum(stats['ratings'])) / Decimal(len(stats['ratings']))
-            seller['rating_avg'] = format_rating(avg_rating)
-        else:
-            seller['rating_avg'] = format_rating(Decimal('0'))
-    
-    for commodity in commodities:
-        stats = commodity_stats[commodity['id']]
-        commodity['total_sold'] = stats['sold']
-        commodity['review_count'] = len(stats['ratings'])
-        if stats['ratings']:
-            avg_rating = Decimal(sum(stats['ratings'])) / Decimal(len(stats['ratings']))
-            commodity['rating_avg'] = format_rating(avg_rating)
-        else:
-            commodity['rating_avg'] = format_rating(Decimal('0'))
+    return orders, order_commodities, transactions, reviews, consumer_stats, seller_stats, commodity_stats
+
+# Accumulator fields of the denormalized columns, one integer array per field indexed
+# by entity index (first_order is the epoch second of the first completed order, 0 for none)
+AGGREGATE_FIELDS = {
+    'consumers': ('orders', 'spent', 'first_order'),
+    'sellers': ('orders', 'sales', 'rating_sum', 'rating_count'),
+    'commodities': ('sold', 'rating_sum', 'rating_count'),
+}
+
+def new_order_aggregates(sizes: Dict[str, int]) -> Dict[str, Dict[str, array]]:
+    """Zeroed accumulators for `sizes` consumers/sellers/commodities (see AGGREGATE_FIELDS)"""
+    return {table: {field: array('q', bytes(8 * sizes[table])) for field in fields}
+            for table, fields in AGGREGATE_FIELDS.items()}
+
+def merge_order_stats(aggregates: Dict[str, Dict[str, array]], consumer_rows: List[Tuple],
+                      seller_rows: List[Tuple], commodity_rows: List[Tuple]):
+    """Add aggregate rows (index, *AGGREGATE_FIELDS values) to the accumulators (call in shard order)"""
+    consumers = aggregates['consumers']
+    orders, spent, first_order = consumers['orders'], consumers['spent'], consumers['first_order']
+    for index, count, amount, first in consumer_rows:
+        orders[index] += count
+        spent[index] += amount
+        if not first_order[index]:
+            first_order[index] = first
     
-    return orders, order_commodities, transactions, reviews
+    for table, rows in (('sellers', seller_rows), ('commodities', commodity_rows)):
+        columns = tuple(aggregates[table].values())
+        for index, *values in rows:
+            for column, value in zip(columns, values):
+                column[index] += value
 
-# ============================================================================
-# CSV EXPORT
-# ============================================================================
+def aggregate_rows(stats: Dict[str, array]) -> List[Tuple]:
+    """(index, *values) of every entity with a non-zero accumulator"""
+    return [(index, *values) for index, values in enumerate(zip(*stats.values())) if any(values)]
 
-def export_to_csv(filename: str, data: List[Dict], fieldnames: List[str]):
-    """Export data to CSV file with Unix line endings (required for Redshift)"""
-    output_path = os.path.join(CONFIG['output_dir'], filename)
+def generate_orders_and_related(
+    num_sellers: int,
+    commodities: List[CommodityPrice],
+    consumer_cards: AdjacencyIndex,
+    consumer_addresses: AdjacencyIndex,
+    aggregates: Dict[str, Dict[str, array]],
+    first_shard: int = 0,
+    index_range: Tuple[int, int] = None
+) -> Iterator[Tuple[List[OrderRow], List[OrderCommodityRow], List[TransactionRow], List[ReviewRow]]]:
+    """
+    Generate orders, order_commodities, transactions, and reviews.
     
-    # Force Unix line endings (\n) for Redshift compatibility
-    with open(output_path, 'w', newline='\n', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=CONFIG['delimiter'], 
-                               extrasaction='ignore', lineterminator='\n')
-        writer.writeheader()
-        writer.writerows(data)
+    Yields one (orders, order_commodities, transactions, reviews) batch per shard (row lists,
+    or ColumnBatches from the numpy engine; see write_batch) and merges the shard's aggregate rows into `aggregates` (see new_order_aggregates).
+    Consumers, sellers and commodities are picked by index: `commodities` holds the
+    (price, cost_price) of every commodity, `consumer_cards` the card indexes and
+    `consumer_addresses` the delivery addresses of every consumer (see AdjacencyIndex).
     
-    print(f"📁 Exported {len(data)} rows to {filename}")
-
-def export_all_data(users, consumers, sellers, verticals, seller_verticals, address_books, 
-                    commodities, cards, orders, order_commodities, transactions, reviews):
-    """Export all data to CSV files"""
-    print("\n" + "=" * 60)
-    print("💾 EXPORTING DATA TO CSV FILES")
-    print("=" * 60)
+    The order range is split into shards of CONFIG['order_shard_size'] orders, each
+    seeded from (seed, shard index), and processed by CONFIG['order_workers'] processes.
+    Output depends only on the seed and shard size, not on the number of workers.
+    Only the shards overlapping `index_range` (start, end order indexes; default all) run, and
+    only the tables whose rows are read are built (see rows_read); the others come out empty.
+    A resumed run starts at `first_shard` with the aggregates of the shards before it.
+    """
+    # A delta run's orders follow the previous runs' (see block_origin)
+    first_order = block_origin('orders')
+    end_order = first_order + CONFIG['num_orders']
+    shard_size = CONFIG['order_shard_size']
+    workers = max(1, CONFIG['order_workers'])
+    range_start, range_end = index_range or (first_order, end_order)
+    print(f"🛒 Generating {range_end - range_start} orders with line items...")
     
-    # Create output directory
-    os.makedirs(CONFIG['output_dir'], exist_ok=True)
+    context = {
+        'seed': CONFIG['seed'],
+        'id_seed': _ENTITY_IDS['seed'],
+        'reference_time': run_reference_time(),
+        'window': _RUN_CLOCK['window'],
+        'engine': CONFIG['engine'],
+        'faker_pools': FAKER_POOLS,
+        'items_per_order_range': CONFIG['items_per_order_range'],
+        'num_consumers': len(consumer_addresses),
+        'num_sellers': num_sellers,
+        'commodities': commodities,
+        'consumer_cards': consumer_cards,
+        'consumer_addresses': consumer_addresses,
+        'index_range': (range_start, range_end),
+        # Tables whose rows are read, and whether any of them has Faker text (see skip_faker_text)
+        'tables': frozenset(table for table in ORDER_TABLES if rows_read(table)),
+        'faker_text': rows_read('transactions') or rows_read('reviews'),
+    }
+    shards = [(index, start, min(start + shard_size, end_order))
+              for index, start in enumerate(range(first_order, end_order, shard_size))
+              if index >= first_shard and start < range_end and start + shard_size > range_start]
     
-    # Define fieldnames for each table
-    exports = [
-        ('users.csv', users, ['id', 'username', 'phone', 'name', 'email', 'status', 'created_at', 'updated_at']),
-        ('consumers.csv', consumers, ['id', 'birthday', 'gender', 'first_order_date', 'total_orders', 'total_spent', 'customer_segment']),
-        ('sellers.csv', sellers, ['id', 'type', 'introduction', 'address', 'city', 'province', 'country', 'rating_avg', 'total_sales', 'total_orders']),
-        ('verticals.csv', verticals, ['id', 'name', 'description', 'status']),
-        ('seller_vertical.csv', seller_verticals, ['seller_id', 'vertical_id', 'created_at', 'updated_at']),
-        ('address_books.csv', address_books, ['id', 'user_id', 'address_line_1', 'address_line_2', 'city', 'province', 'country', 'postal_code', 'phone', 'receiver_name', 'is_default', 'latitude', 'longitude', 'created_at', 'updated_at']),
-        ('commodities.csv', commodities, ['id', 'seller_id', 'sku', 'name', 'price', 'cost_price', 'quantity', 'reserved_quantity', 'reorder_level', 'reorder_quantity', 'weight_kg', 'description', 'technical_info', 'guarantee_info', 'manufacturer_name', 'vertical_id', 'status', 'rating_avg', 'review_count', 'total_sold', 'created_at', 'updated_at']),
-        ('cards.csv', cards, ['id', 'consumer_id', 'tk', 'provider', 'last4', 'card_holder', 'exp_year', 'exp_month', 'status', 'is_default', 'created_at', 'updated_at']),
-        ('orders.csv', orders, ['id', 'consumer_id', 'seller_id', 'status', 'delivery_address', 'delivery_postal_code', 'delivery_receiver', 'delivery_phone', 'delivery_city', 'delivery_country', 'delivery_latitude', 'delivery_longitude', 'subtotal_amount', 'tax_amount', 'shipping_fee', 'discount_amount', 'total_amount', 'created_at', 'confirmed_at', 'paid_at', 'shipped_at', 'delivered_at', 'completed_at', 'updated_at', 'days_to_ship', 'days_to_deliver']),
-        ('order_commodities.csv', order_commodities, ['order_id', 'commodity_id', 'quantity', 'unit_price', 'unit_cost', 'line_total', 'discount_applied']),
-        ('transactions.csv', transactions, ['id', 'order_id', 'card_id', 'payment_method', 'transaction_type', 'amount', 'status', 'created_at', 'authorized_at', 'completed_at', 'gateway_transaction_id', 'gateway_response_code', 'gateway_response_message', 'ip_address', 'user_agent']),
-        ('reviews.csv', reviews, ['id', 'order_id', 'commodity_id', 'consumer_id', 'seller_id', 'rate', 'comment', 'status', 'is_verified_purchase', 'helpful_count', 'created_at', 'updated_at', 'published_at']),
-    ]
+    pool = None
+    if workers > 1 and len(shards) > 1:
+        print(f"   Using {workers} worker processes for {len(shards)} shards")
+        pool = multiprocessing.Pool(processes=workers, initializer=_init_order_worker, initargs=(context,))
+        results = pool.imap(_generate_order_shard, shards)
+    else:
+        _init_order_worker(context)
+        results = map(_generate_order_shard, shards)
     
-    for filename, data, fieldnames in exports:
-        export_to_csv(filename, data, fieldnames)
+    results = progress(results, "Creating orders", "shard", total=len(shards))
     
-    print(f"\n✅ All data exported to '{CONFIG['output_dir']}' directory")
+    try:
+        # imap yields in shard order, so the merged output is independent of scheduling
+        for shard_orders, shard_items, shard_transactions, shard_reviews, *shard_stats in results:
+            merge_order_stats(aggregates, *shard_stats)
+            yield shard_orders, shard_items, shard_transactions, shard_reviews
+    finally:
+        skip_faker_text(False)
+        if pool:
+            pool.close()
+            pool.join()
+
+def apply_consumer_aggregates(consumer: ConsumerRow, index: int, consumer_stats: Dict[str, array]) -> ConsumerRow:
+    """Fill the denormalized columns of the consumer row with index `index`"""
+    first_order = consumer_stats['first_order'][index]
+    spent = consumer_stats['spent'][index]
+    return consumer._replace(
+        first_order_date=format_date(first_order) if first_order else consumer.first_order_date,
+        total_orders=consumer_stats['orders'][index],
+        total_spent=spent,
+        customer_segment=calculate_customer_segment(spent),
+    )
+
+def apply_seller_aggregates(seller: SellerRow, index: int, seller_stats: Dict[str, array]) -> SellerRow:
+    """Fill the denormalized columns of the seller row with index `index`"""
+    return seller._replace(
+        rating_avg=average_rating_units(seller_stats['rating_sum'][index], seller_stats['rating_count'][index]),
+        total_sales=seller_stats['sales'][index],
+        total_orders=seller_stats['orders'][index],
+    )
+
+def apply_commodity_aggregates(commodity: CommodityRow, index: int,
+                               commodity_stats: Dict[str, array]) -> CommodityRow:
+    """Fill the denormalized columns of the commodity row with index `index`"""
+    return commodity._replace(
+        rating_avg=average_rating_units(commodity_stats['rating_sum'][index], commodity_stats['rating_count'][index]),
+        review_count=commodity_stats['rating_count'][index],
+        total_sold=commodity_stats['sold'][index],
+    )
 
 # ============================================================================
-# POSTGRESQL INSERTION
+# VECTORIZED ENGINE (NumPy)
 # ============================================================================
+# Draws whole batches of numeric and categorical columns from a seeded
+# numpy Generator and formats them in bulk. Money is computed in integer
+# ten-thousandths (NUMERIC(x,4)); text columns are sampled from the Faker pools
+# with index arrays (or generated per row when pools are disabled).
 
-def get_postgres_connection():
-    """Connect to PostgreSQL"""
-    if not PSYCOPG2_AVAILABLE:
-        print("❌ PostgreSQL insertion skipped - psycopg2 not available")
-        return None
+# entity_uuid on uint64 (low, high) halves of the 122-bit values: a product keeps the
+# full 128 bits of low * constant low (from 32-bit halves) and wraps the cross terms
+_UINT64_MASK = (1 << 64) - 1
+_ID_HIGH_MASK = (1 << 58) - 1  # _ID_MASK above the low 64 bits
+_HEX_PAIRS = None  # '%02x' of every byte value as one uint16, built by the first entity_uuid_batch
+
+def _id_mul_batch(low, high, constant: int):
+    """(x * constant) & _ID_MASK for x = high << 64 | low, as (low, high) arrays"""
+    c_low, c_high = np.uint64(constant & _UINT64_MASK), np.uint64(constant >> 64 & _UINT64_MASK)
+    m32, s32 = np.uint64(0xFFFFFFFF), np.uint64(32)
+    a0, a1 = low & m32, low >> s32
+    b0, b1 = c_low & m32, c_low >> s32
+    p00, p01, p10 = a0 * b0, a0 * b1, a1 * b0
+    middle = (p00 >> s32) + (p01 & m32) + (p10 & m32)
+    carry = a1 * b1 + (p01 >> s32) + (p10 >> s32) + (middle >> s32)
+    return low * c_low, (carry + low * c_high + high * c_low) & np.uint64(_ID_HIGH_MASK)
+
+def _id_xorshift_batch(low, high, shift: int):
+    """x ^ (x >> shift) for 0 < shift < 64, as (low, high) arrays"""
+    return low ^ (low >> np.uint64(shift) | high << np.uint64(64 - shift)), high ^ (high >> np.uint64(shift))
+
+def entity_uuid_batch(table: str, indexes) -> List[str]:
+    """entity_uuid of every index in an integer array, vectorized (the ids match the python engine's)"""
+    global _HEX_PAIRS
+    low = np.asarray(indexes, dtype=np.int64).astype(np.uint64)
+    n = len(low)
+    key = _entity_id_key(table)
+    low, high = _id_mul_batch(low, np.zeros(n, dtype=np.uint64), _ID_STEP)
+    low ^= np.uint64(key & _UINT64_MASK)
+    high ^= np.uint64(key >> 64)
+    low, high = _id_mul_batch(*_id_xorshift_batch(low, high, 61), _ID_MIX)
+    low, high = _id_mul_batch(*_id_xorshift_batch(low, high, 57), _ID_STEP)
+    low ^= high
     
-    try:
-        conn = psycopg2.connect(**CONFIG['postgres'])
-        print(f"✅ Connected to PostgreSQL: {CONFIG['postgres']['database']}")
-        return conn
-    except Exception as e:
-        print(f"❌ PostgreSQL connection failed: {e}")
-        return None
+    # The 128-bit UUID value big-endian, then its 32 hex digits with the dashes put in
+    words = np.empty((n, 2), dtype='>u8')
+    words[:, 0] = (high >> np.uint64(10) << np.uint64(16) | np.uint64(0x4000)
+                   | (low >> np.uint64(62) | high << np.uint64(2)) & np.uint64(0xFFF))
+    words[:, 1] = low & np.uint64(0x3FFFFFFFFFFFFFFF) | np.uint64(0x8000000000000000)
+    if _HEX_PAIRS is None:
+        _HEX_PAIRS = np.frombuffer(''.join('%02x' % i for i in range(256)).encode(), dtype='<u2')
+    digits = _HEX_PAIRS[words.view(np.uint8)].view(np.uint8).reshape(n, 32)
+    text = np.empty((n, 36), dtype=np.uint8)
+    text[:, [8, 13, 18, 23]] = ord('-')
+    for dashes, start, end in ((0, 0, 8), (1, 8, 12), (2, 12, 16), (3, 16, 20), (4, 20, 32)):
+        text[:, dashes + start:dashes + end] = digits[:, start:end]
+    text = text.tobytes().decode('ascii')
+    return [text[i:i + 36] for i in range(0, 36 * n, 36)]
 
-def insert_into_table(table_name: str, data: List[Dict]):
-    """Insert data into PostgreSQL table"""
-    if not data:
-        print(f"⚠️  Skipping {table_name} - no data")
-        return
+def format_money_batch(units) -> List[str]:
+    """Format non-negative integer ten-thousandths as 'N.NNNN' strings"""
+    return [f"{u // 10000}.{u % 10000:04d}" for u in units.tolist()]
+
+def format_timestamp_batch(values) -> List[str]:
+    """Format datetime64[s] values as 'YYYY-MM-DD HH:MM:SS' ('' for NaT)"""
+    text = np.datetime_as_string(values, unit='s').tolist()
+    return ['' if t == 'NaT' else t.replace('T', ' ') for t in text]
+
+def _run_clock_numpy():
+    """The run's reference time as datetime64[s]"""
+    return np.datetime64(run_reference_time(), 's')
+
+def _dates_back_numpy(rng, days_back: int, size: int):
+    """Vectorized random_date_in_range: `size` datetime64[s] values"""
+    if _RUN_CLOCK['window']:
+        return _run_clock_numpy() - rng.integers(0, _RUN_CLOCK['window'], size) * np.timedelta64(1, 's')
+    return _run_clock_numpy() - rng.integers(0, days_back + 1, size) * np.timedelta64(1, 'D')
+
+def _generate_commodities_numpy(sellers_with_verticals: List[int], seller_to_verticals: AdjacencyIndex,
+                                verticals: List[VerticalRow], start: int, end: int) -> Iterator[CommodityRow]:
+    """
+    Vectorized body of generate_commodities: numeric/enum columns are drawn per seed block.
+    Blocks are always drawn whole (a shorter draw changes every column), then cut to start..end-1.
+    """
+    origin = block_origin('commodities')
+    end_commodity = origin + CONFIG['num_commodities']
+    block_size = CONFIG['block_size']
     
-    conn = get_postgres_connection()
-    if not conn:
-        return
+    # A vertical pick reads the seller's offsets, then the vertical (any vertical if no seller has one)
+    sellers = np.array(sellers_with_verticals, dtype=np.int64)
+    vertical_offsets = np.frombuffer(seller_to_verticals.offsets, dtype=np.int64)
+    vertical_indexes = np.frombuffer(seller_to_verticals.values, dtype=np.int64)
+    vertical_counts = np.diff(vertical_offsets)
+    vertical_ids = [vertical.id for vertical in verticals]
+    seller_ids = entity_uuid_batch('sellers', sellers_with_verticals)
+    sku_prefixes = ['ELEC', 'FASH', 'HOME', 'FOOD', 'SPRT', 'BABY', 'AUTO', 'BOOK']
     
-    try:
-        cur = conn.cursor()
-        
-        # Get column names from first record
-        columns = list(data[0].keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        insert_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+    for batch_start in range(seed_block_start('commodities', start), end, block_size):
+        n = min(block_size, end_commodity - batch_start)
+        block_seed = derive_seed(CONFIG['seed'], 'commodities', (batch_start - origin) // block_size)
+        rng = np.random.default_rng(block_seed)
+        fake.seed_instance(block_seed)
         
-        # Prepare data
-        values = [[record.get(col, None) or None for col in columns] for record in data]
-        
-        # Batch insert
-        execute_batch(cur, insert_query, values, page_size=1000)
-        conn.commit()
+        seller_pick = rng.integers(0, len(sellers_with_verticals), n)
+        seller = sellers[seller_pick]
+        if len(vertical_indexes):
+            vertical_pick = vertical_indexes[vertical_offsets[seller]
+                                             + (rng.random(n) * vertical_counts[seller]).astype(np.int64)]
+        else:
+            vertical_pick = (rng.random(n) * len(verticals)).astype(np.int64)
+        price = np.rint(rng.uniform(5.0, 2000.0, n) * 10000).astype(np.int64)
+        cost_ratio = np.rint(rng.uniform(0.4, 0.8, n) * 10000).astype(np.int64)
+        cost_price = (price * cost_ratio + 5000) // 10000  # ROUND_HALF_UP to 4 decimals
+        weight = np.rint(rng.uniform(0.1, 50.0, n) * 10000).astype(np.int64)
+        quantity = rng.integers(0, 5001, n).tolist()
+        reorder_level = rng.integers(5, 51, n).tolist()
+        reorder_quantity = rng.integers(50, 501, n).tolist()
+        text_flags = rng.random((4, n))
+        status = SAMPLERS['commodity_status'].draw_batch(rng, n)
+        created_at = format_timestamp_batch(_dates_back_numpy(rng, 180, n))
+        sku_prefix = rng.integers(0, len(sku_prefixes), n).tolist()
+        sku_number = rng.integers(100000, 1000000, n).tolist()
+        ids = entity_uuid_batch('commodities', np.arange(batch_start, batch_start + n))
+        updated_at = format_timestamp(run_reference_time())
         
-        print(f"✅ Inserted {len(data)} rows into {table_name}")
+        price = price.tolist()
+        cost_price = cost_price.tolist()
+        weight = weight.tolist()
+        has_description, has_technical, has_guarantee, has_manufacturer = (
+            text_flags[0] > 0.3, text_flags[1] > 0.6, text_flags[2] > 0.7, text_flags[3] > 0.4)
+        seller_pick = seller_pick.tolist()
+        vertical_pick = vertical_pick.tolist()
+        names = fake_value_batch('catch_phrase', rng, n)
+        descriptions = iter(fake_value_batch('text_200', rng, int(has_description.sum())))
+        technical_infos = iter(fake_value_batch('text_200', rng, int(has_technical.sum())))
+        guarantee_infos = iter(fake_value_batch('text_200', rng, int(has_guarantee.sum())))
+        manufacturers = iter(fake_value_batch('company', rng, int(has_manufacturer.sum())))
         
-        cur.close()
-        conn.close()
-    
-    except Exception as e:
-        print(f"❌ Error inserting into {table_name}: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
+        for j in range(n):
+            commodity = CommodityRow(
+                id=ids[j],
+                seller_id=seller_ids[seller_pick[j]],
+                sku=f"{sku_prefixes[sku_prefix[j]]}-{sku_number[j]}",
+                name=clean_text_field(names[j][:255]),
+                price=price[j],
+                cost_price=cost_price[j],
+                quantity=quantity[j],
+                reserved_quantity=0,
+                reorder_level=reorder_level[j],
+                reorder_quantity=reorder_quantity[j],
+                weight_kg=weight[j],
+                description=clean_text_field(next(descriptions)) if has_description[j] else '',
+                technical_info=clean_text_field(next(technical_infos)) if has_technical[j] else '',
+                guarantee_info=clean_text_field(next(guarantee_infos)) if has_guarantee[j] else '',
+                manufacturer_name=clean_text_field(next(manufacturers)[:100]) if has_manufacturer[j] else '',
+                vertical_id=vertical_ids[vertical_pick[j]],
+                status=status[j],
+                rating_avg=0,
+                review_count=0,
+                total_sold=0,
+                created_at=created_at[j],
+                updated_at=updated_at,
+            )
+            if start <= batch_start + j < end:
+                yield commodity
 
-# ============================================================================
-# MAIN EXECUTION
-# ============================================================================
+def _prepare_numpy_order_context(ctx: Dict):
+    """View the per-consumer CSR indexes and the commodity prices as numpy arrays for batch indexing"""
+    ctx['address_offsets'] = np.frombuffer(ctx['consumer_addresses'].offsets, dtype=np.int64)
+    ctx['address_counts'] = np.diff(ctx['address_offsets'])
+    ctx['card_offsets'] = np.frombuffer(ctx['consumer_cards'].offsets, dtype=np.int64)
+    ctx['card_counts'] = np.diff(ctx['card_offsets'])
+    ctx['card_indexes'] = np.frombuffer(ctx['consumer_cards'].values, dtype=np.int64)
+    
+    commodities = ctx['commodities']
+    ctx['price_units'] = np.array([c.price for c in commodities], dtype=np.int64)
+    ctx['cost_units'] = np.array(
+        [c.cost_price if c.cost_price else div_round_half_up(c.price * 6, 10) for c in commodities],
+        dtype=np.int64)
 
-def main():
-    """Main execution flow"""
-    print("=" * 60)
-    print("🚀 E-COMMERCE DATA GENERATOR")
-    print("=" * 60)
-    print(f"Output directory: {CONFIG['output_dir']}")
-    print(f"Delimiter: '{CONFIG['delimiter']}'")
-    print(f"Consumers: {CONFIG['num_consumers']}")
-    print(f"Sellers: {CONFIG['num_sellers']}")
-    print(f"Commodities: {CONFIG['num_commodities']}")
-    print(f"Orders: {CONFIG['num_orders']}")
-    print("=" * 60)
+def _generate_order_shard_numpy(shard: Tuple[int, int, int]) -> Tuple:
+    """Vectorized counterpart of _generate_order_shard (same return shape, with a ColumnBatch per table)"""
+    shard_index, start, end = shard
+    ctx = _ORDER_CONTEXT
+    if 'price_units' not in ctx:
+        _prepare_numpy_order_context(ctx)
     
-    # Step 1: Generate verticals (persistent)
-    verticals = load_or_generate_verticals()
+    shard_seed = derive_seed(ctx['seed'], 'orders', shard_index)
+    rng = np.random.default_rng(shard_seed)
+    random.seed(shard_seed)
+    fake.seed_instance(shard_seed)
     
-    # Step 2: Generate users and profiles
-    consumer_users, consumers = generate_users_and_consumers()
-    seller_users, sellers = generate_sellers(CONFIG['num_sellers'])
-    all_users = consumer_users + seller_users
+    num_commodities = len(ctx['commodities'])
+    order_statuses = ENUMS['order_status']
+    n = end - start
+    # The whole shard is always drawn (a shorter draw changes every column); rows outside
+    # the index range are dropped when the rows are assembled
+    order_index = np.arange(start, end)
+    in_range = (order_index >= ctx['index_range'][0]) & (order_index < ctx['index_range'][1])
+    hour = np.timedelta64(3600, 's')
+    day = np.timedelta64(86400, 's')
+    nat = np.datetime64('NaT', 's')
     
-    # Step 3: Generate related data
-    seller_verticals = generate_seller_verticals(sellers, verticals)
-    address_books = generate_address_books(consumers)
-    commodities = generate_commodities(sellers, verticals, seller_verticals)
-    cards, cards_map = generate_cards(consumers)
+    # ---- Order-level columns ----
+    consumer_idx = rng.integers(0, ctx['num_consumers'], n)
+    seller_idx = rng.integers(0, ctx['num_sellers'], n)
+    address_count = ctx['address_counts'][consumer_idx]
+    valid = address_count > 0  # Skip consumers without an address
+    address_pick = ctx['address_offsets'][consumer_idx] + (rng.random(n) * address_count).astype(np.int64)
+    created = _dates_back_numpy(rng, 90, n)
+    status = SAMPLERS['order_status'].draw_indices(rng, n)
     
-    # Step 4: Generate orders and related data
-    orders, order_commodities, transactions, reviews = generate_orders_and_related(
-        consumers, sellers, commodities, cards_map, address_books
-    )
+    # ---- Line items (sampled without replacement within each order) ----
+    low, high = ctx['items_per_order_range']
+    num_items = np.minimum(rng.integers(low, high + 1, n), num_commodities)
+    item_offsets = np.concatenate(([0], np.cumsum(num_items)))
+    item_order = np.repeat(np.arange(n), num_items)
+    item_commodity = rng.integers(0, num_commodities, int(item_offsets[-1]))
+    keys = np.sort(item_order * num_commodities + item_commodity)
+    for order in np.unique(keys[1:][keys[1:] == keys[:-1]] // num_commodities).tolist():
+        a, b = item_offsets[order], item_offsets[order + 1]
+        item_commodity[a:b] = rng.choice(num_commodities, size=b - a, replace=False)
     
-    # Step 5: Export to CSV
-    export_all_data(all_users, consumers, sellers, verticals, seller_verticals, address_books,
-                    commodities, cards, orders, order_commodities, transactions, reviews)
+    quantity = rng.integers(1, 6, len(item_commodity))
+    unit_price = ctx['price_units'][item_commodity]
+    unit_cost = ctx['cost_units'][item_commodity]
+    line_gross = unit_price * quantity
+    item_discount = np.rint(rng.random(len(item_commodity)) * line_gross * 0.2).astype(np.int64)
+    line_net = line_gross - item_discount
+    running = np.concatenate(([0], np.cumsum(line_net)))
     
-    # Step 6: Insert into PostgreSQL
-    # IMPORTANT: Follow correct dependency order for foreign keys
-    print("=" * 60)
-    print("🔄 INSERTING DATA INTO POSTGRESQL...")
-    print("=" * 60)
+    # ---- Order totals (integer ten-thousandths, ROUND_HALF_UP for tax) ----
+    subtotal = running[item_offsets[1:]] - running[item_offsets[:-1]]
+    tax = (subtotal * 8 + 50) // 100
+    shipping = np.rint(rng.random(n) * 20 * 10000).astype(np.int64)
+    order_discount = np.rint(rng.random(n) * subtotal * 0.1).astype(np.int64)
+    total = subtotal + tax + shipping - order_discount
+    
+    # ---- Lifecycle timestamps, masked by status ----
+    status_names = np.array(order_statuses)[status]
+    has_confirmed = status_names != 'draft'
+    has_paid = np.isin(status_names, ['inprogress', 'shipped', 'delivered', 'done'])
+    has_shipped = np.isin(status_names, ['shipped', 'delivered', 'done'])
+    has_delivered = np.isin(status_names, ['delivered', 'done'])
+    has_completed = status_names == 'done'
+    ship_days = rng.integers(1, 6, n)
+    deliver_days = rng.integers(1, 8, n)
+    confirmed = created + rng.integers(1, 25, n) * hour
+    paid = created + rng.integers(1, 49, n) * hour
+    shipped = paid + ship_days * day
+    delivered = shipped + deliver_days * day
+    completed = delivered + rng.integers(7, 15, n) * day
+    
+    # ---- Transactions (captured card payment for paid orders) ----
+    card_count = ctx['card_counts'][consumer_idx]
+    has_transaction = has_paid & (card_count > 0) & valid
+    card_pick = ctx['card_offsets'][consumer_idx] + (rng.random(n) * card_count).astype(np.int64)
+    trans_created = created + rng.integers(0, 3, n) * hour
+    authorized = trans_created + rng.integers(1, 61, n) * np.timedelta64(1, 's')
+    trans_completed = trans_created + rng.integers(60, 301, n) * np.timedelta64(1, 's')
+    gateway_id = rng.integers(100000000, 1000000000, n).tolist()
+    
+    # ---- Reviews (60% of delivered orders, 60% of their items) ----
+    reviewed_order = has_delivered & valid & (rng.random(n) < 0.6)
+    review_items = np.nonzero(reviewed_order[item_order] & (rng.random(len(item_commodity)) < 0.6))[0]
+    num_reviews = len(review_items)
+    review_order = item_order[review_items]
+    rate = SAMPLERS['review_rate'].draw_indices(rng, num_reviews) + 1
+    has_comment = (rng.random(num_reviews) > 0.2).tolist()
+    review_status = SAMPLERS['review_status'].draw_batch(rng, num_reviews)
+    helpful = rng.integers(0, 101, num_reviews).tolist()
+    review_created = delivered[review_order] + rng.integers(1, 31, num_reviews) * day
+    review_published = delivered[review_order] + rng.integers(1, 32, num_reviews) * day
     
-    # 1. Base table (no dependencies)
-    insert_into_table('users', all_users)
+    # ---- Draws that depend on the row counts above ----
+    num_transactions = int(has_transaction.sum())
+    ip_addresses = fake_value_batch('ipv4', rng, num_transactions)
+    user_agents = fake_value_batch('user_agent', rng, num_transactions)
+    comments = iter(fake_value_batch('text_500', rng, sum(has_comment)))
+    updated_at = format_timestamp(run_reference_time())
     
-    # 2. User role tables (depend on users)
-    insert_into_table('consumers', consumers)
-    insert_into_table('sellers', sellers)
+    # ---- Assemble the tables column-wise: each column is formatted in bulk and handed to the
+    # writers as a ColumnBatch, so no row tuple is built before the CSV writer's own ----
+    kept = np.nonzero(valid & in_range)[0]  # Orders whose consumer has an address
+    kept_items = np.nonzero((valid & in_range)[item_order])[0]
+    paid_orders = np.nonzero(has_transaction)[0]
     
-    # 3. Verticals (no dependencies except self-reference)
-    insert_into_table('verticals', verticals)
+    def pick(values: List, indices) -> List:
+        return [values[i] for i in indices.tolist()]
     
-    # 4. Tables depending on consumers, sellers, verticals
-    insert_into_table('seller_vertical', seller_verticals)
-    insert_into_table('address_books', address_books)
-    insert_into_table('cards', cards)
+    order_ids = entity_uuid_batch('orders', order_index)
+    # A review is keyed by its order and the item's position in the order
+    review_positions = review_items - item_offsets[review_order]
     
-    # 5. Commodities (depends on sellers and verticals)
-    insert_into_table('commodities', commodities)
+    num_kept, num_paid = len(kept), len(paid_orders)
+    # Every column above is drawn; only the tables whose rows are read are assembled
+    tables = ctx['tables']
+    orders, order_commodities, transactions, reviews = (ColumnBatch() for _ in ORDER_TABLES)
+    if 'orders' in tables:
+        addresses = pick(ctx['consumer_addresses'].values, address_pick[kept])
+        orders = ColumnBatch((
+            pick(order_ids, kept),
+            entity_uuid_batch('consumers', consumer_idx[kept]),
+            entity_uuid_batch('sellers', seller_idx[kept]),
+            status_names[kept].tolist(),
+            *(list(zip(*addresses)) or [()] * len(DeliveryAddress._fields)),  # delivery_address ... delivery_longitude
+            format_money_batch(subtotal[kept]),
+            format_money_batch(tax[kept]),
+            format_money_batch(shipping[kept]),
+            format_money_batch(order_discount[kept]),
+            format_money_batch(total[kept]),
+            format_timestamp_batch(created[kept]),
+            format_timestamp_batch(np.where(has_confirmed, confirmed, nat)[kept]),
+            format_timestamp_batch(np.where(has_paid, paid, nat)[kept]),
+            format_timestamp_batch(np.where(has_shipped, shipped, nat)[kept]),
+            format_timestamp_batch(np.where(has_delivered, delivered, nat)[kept]),
+            format_timestamp_batch(np.where(has_completed, completed, nat)[kept]),
+            [updated_at] * num_kept,
+            [str(d) if flag else '' for d, flag in zip(ship_days[kept].tolist(), has_shipped[kept].tolist())],
+            [str(d) if flag else '' for d, flag in zip(deliver_days[kept].tolist(), has_delivered[kept].tolist())],
+        ))
     
-    # 6. Orders (depends on consumers and sellers)
-    insert_into_table('orders', orders)
+    if 'order_commodities' in tables:
+        order_commodities = ColumnBatch((
+            pick(order_ids, item_order[kept_items]),
+            entity_uuid_batch('commodities', item_commodity[kept_items]),
+            quantity[kept_items].tolist(),
+            format_money_batch(unit_price[kept_items]),
+            format_money_batch(unit_cost[kept_items]),
+            format_money_batch(line_net[kept_items]),
+            format_money_batch(item_discount[kept_items]),
+        ))
     
-    # 7. Tables depending on orders
-    insert_into_table('order_commodities', order_commodities)
-    insert_into_table('transactions', transactions)
-    insert_into_table('reviews', reviews)
+    if 'transactions' in tables:
+        transactions = ColumnBatch((
+            entity_uuid_batch('transactions', order_index[paid_orders]),
+            pick(order_ids, paid_orders),
+            entity_uuid_batch('cards', ctx['card_indexes'][card_pick[paid_orders]]),
+            ['card'] * num_paid,
+            ['sale'] * num_paid,
+            format_money_batch(total[paid_orders]),
+            ['captured'] * num_paid,
+            format_timestamp_batch(trans_created[paid_orders]),
+            format_timestamp_batch(authorized[paid_orders]),
+            format_timestamp_batch(trans_completed[paid_orders]),
+            [f"GTW-{gateway_id[j]}" for j in paid_orders.tolist()],
+            ['00'] * num_paid,
+            ['Approved'] * num_paid,
+            ip_addresses,
+            [clean_text_field(user_agent[:255]) for user_agent in user_agents],
+        ))
+    
+    if 'reviews' in tables:
+        reviews = ColumnBatch((
+            entity_uuid_batch('reviews', order_index[review_order] * CHILD_ID_SLOTS + review_positions),
+            pick(order_ids, review_order),
+            entity_uuid_batch('commodities', item_commodity[review_items]),
+            entity_uuid_batch('consumers', consumer_idx[review_order]),
+            entity_uuid_batch('sellers', seller_idx[review_order]),
+            rate.tolist(),
+            [clean_text_field(next(comments)) if flag else '' for flag in has_comment],
+            review_status,
+            ['true'] * num_reviews,
+            helpful,
+            format_timestamp_batch(review_created),
+            [updated_at] * num_reviews,
+            format_timestamp_batch(review_published),
+        ))
+    
+    if not in_range.all():
+        reviewed = np.nonzero(in_range[review_order])[0]
+        transactions = ColumnBatch(pick(column, np.nonzero(in_range[paid_orders])[0]) for column in transactions)
+        reviews = ColumnBatch(pick(column, reviewed) for column in reviews)
+        review_order, review_items, rate = review_order[reviewed], review_items[reviewed], rate[reviewed]
+    
+    # ---- Aggregate rows (index, *AGGREGATE_FIELDS values) for completed orders ----
+    done = np.nonzero(has_delivered & valid & in_range)[0]
+    done_items = np.nonzero((has_delivered & valid & in_range)[item_order])[0]
+    
+    def sums(keys, indexes, values) -> List[int]:
+        """Sum of `values` per entry of the sorted `keys`, over the events of `indexes`"""
+        totals = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(totals, np.searchsorted(keys, indexes), values)
+        return totals.tolist()
+    
+    done_consumers, first_positions = np.unique(consumer_idx[done], return_index=True)
+    first_created = created[done][first_positions].astype(np.int64).tolist()  # epoch seconds
+    consumer_stats = list(zip(done_consumers.tolist(),
+                              sums(done_consumers, consumer_idx[done], 1),
+                              sums(done_consumers, consumer_idx[done], total[done]),
+                              first_created))
+    
+    review_sellers = seller_idx[review_order]
+    sellers = np.unique(np.concatenate((seller_idx[done], review_sellers)))
+    seller_stats = list(zip(sellers.tolist(),
+                            sums(sellers, seller_idx[done], 1),
+                            sums(sellers, seller_idx[done], total[done]),
+                            sums(sellers, review_sellers, rate),
+                            sums(sellers, review_sellers, 1)))
+    
+    review_commodities = item_commodity[review_items]
+    commodities = np.unique(np.concatenate((item_commodity[done_items], review_commodities)))
+    commodity_stats = list(zip(commodities.tolist(),
+                               sums(commodities, item_commodity[done_items], quantity[done_items]),
+                               sums(commodities, review_commodities, rate),
+                               sums(commodities, review_commodities, 1)))
+    
+    return orders, order_commodities, transactions, reviews, consumer_stats, seller_stats, commodity_stats
+
+# ============================================================================
+# CSV EXPORT
+# ============================================================================
+
+CSV_COMPRESSION_SUFFIXES = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+CSV_COMPRESSION_LEVELS = {'gzip': 6, 'zstd': 3}
+
+def open_csv_file(path: str, mode: str = 'r', compression: str = None):
+    """Open a CSV as text, (de)compressing on the fly; compression defaults to the file extension"""
+    if compression is None:
+        compression = next((name for name, suffix in CSV_COMPRESSION_SUFFIXES.items()
+                            if suffix and path.endswith(suffix)), 'none')
+    # Force Unix line endings (\n) for Redshift compatibility
+    newline = '\n' if mode in ('w', 'a') else ''
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', compresslevel=CSV_COMPRESSION_LEVELS['gzip'],
+                         encoding='utf-8', newline=newline)
+    if compression == 'zstd':
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=CSV_COMPRESSION_LEVELS['zstd']).stream_writer(open(path, 'wb'))
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+        return io.TextIOWrapper(stream, encoding='utf-8', newline=newline)
+    return open(path, mode, newline=newline, encoding='utf-8')
+
+class TableWriter:
+    """Append rows to a table's CSV as they are produced (Unix line endings for Redshift)"""
+    
+    def __init__(self, table_name: str, directory: str = None, compression: str = 'none', part: int = None,
+                 offset: int = None):
+        self.table_name = table_name
+        self.fieldnames = TABLE_COLUMNS.get(table_name) or DELTA_COLUMNS[table_name]
+        part_suffix = '' if part is None else f'.part{part:04d}'
+        self.path = os.path.join(directory or CONFIG['output_dir'],
+                                 f'{table_name}{part_suffix}.csv{CSV_COMPRESSION_SUFFIXES[compression]}')
+        self.row_count = 0
+        
+        if offset is None:
+            self._file = open_csv_file(self.path, 'w', compression)
+        else:
+            # Continue an uncompressed file from a checkpointed size (see RunCheckpoint)
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+            self._file = open_csv_file(self.path, 'a', compression)
+        # With inline validation, rows are buffered as text and checked before they are written
+        self._check = open_inline_check(table_name, self.path, self.fieldnames, offset) if compression == 'none' else None
+        self._pending = []
+        sink = SimpleNamespace(write=self._pending.append) if self._check else self._file
+        self._writer = csv.writer(sink, delimiter=CONFIG['delimiter'], lineterminator='\n')
+        if offset is None:
+            self._writer.writerow(self.fieldnames)
+            if self._check:
+                self._file.write(self._check.add_header(self._pending.pop()))
+        self._fixed_columns = [(self.fieldnames.index(column), decimals)
+                               for column, decimals in FIXED_POINT_COLUMNS.get(table_name, {}).items()]
+    
+    def _values(self, row: Tuple) -> List:
+        """Row values with integer fixed-point units formatted"""
+        values = list(row)
+        for index, decimals in self._fixed_columns:
+            value = values[index]
+            if type(value) is int:
+                values[index] = format_fixed(value, decimals)
+        return values
+    
+    def _drain(self):
+        """Check the rows buffered for inline validation and write them"""
+        if self._pending:
+            self._file.write(self._check.check(self._pending))
+            self._pending.clear()
+    
+    def write(self, row: Tuple):
+        """Write one row given positionally, in TABLE_COLUMNS order"""
+        self._writer.writerow(self._values(row) if self._fixed_columns else row)
+        self.row_count += 1
+        if self._check and len(self._pending) >= INLINE_CHECK_ROWS:
+            self._drain()
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        if self._fixed_columns:
+            rows = map(self._values, rows)
+        self._write_formatted(rows)
+    
+    def write_columns(self, columns: List[List]):
+        """Write rows given as columns in TABLE_COLUMNS order, formatting fixed-point columns whole"""
+        if self._fixed_columns:
+            columns = list(columns)
+            for index, decimals in self._fixed_columns:
+                columns[index] = [format_fixed(value, decimals) if type(value) is int else value
+                                  for value in columns[index]]
+        if self._check:
+            self._write_formatted(zip(*columns))
+        elif columns and columns[0]:
+            text = self._text_columns(columns)
+            if text is None:
+                self._writer.writerows(zip(*columns))
+            else:
+                self._file.write('\n'.join(map(CONFIG['delimiter'].join, zip(*text))) + '\n')
+            self.row_count += len(columns[0])
+    
+    @staticmethod
+    def _text_columns(columns: List[List]) -> Optional[List[List[str]]]:
+        """Columns as strings if joining them writes what csv.writer would (nothing to quote), else None"""
+        text = []
+        for column in columns:
+            try:
+                joined = '\x1f'.join(column)
+            except TypeError:
+                column = ['' if value is None else str(value) for value in column]
+                joined = '\x1f'.join(column)
+            if CONFIG['delimiter'] in joined or '"' in joined or '\n' in joined or '\r' in joined:
+                return None
+            text.append(column)
+        return text
+    
+    def _write_formatted(self, rows: Iterable[Tuple]):
+        if self._check:
+            # Whole blocks are checked at once; the block ends with the call, so the ids of
+            # a table written before its children (orders, then order_commodities) are known
+            rows = iter(rows)
+            for block in iter(lambda: list(islice(rows, INLINE_CHECK_ROWS)), []):
+                self._writer.writerows(block)
+                self.row_count += len(block)
+                self._drain()
+            return
+        writerow = self._writer.writerow
+        for row in rows:
+            writerow(row)
+            self.row_count += 1
+    
+    def flush(self) -> int:
+        """Push buffered rows to disk; returns the file size in bytes"""
+        if self._check:
+            self._drain()
+        self._file.flush()
+        return os.path.getsize(self.path)
+    
+    def close(self):
+        if self._file is not None:
+            if self._check:
+                self._drain()
+            self._file.close()
+            if self._check:
+                self._check.close()
+            # A closed zstd stream keeps its compressor's memory until it is released
+            self._file = self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_csv_rows(path: str) -> Iterator[List[str]]:
+    """Stream rows (without the header) back from a pipe-delimited CSV written by TableWriter"""
+    with open_csv_file(path) as f:
+        reader = csv.reader(f, delimiter=CONFIG['delimiter'])
+        next(reader, None)
+        yield from reader
+
+def csv_split_output() -> bool:
+    """Whether CSV tables are written as compressed/multi-part files with a COPY manifest"""
+    return (CONFIG['csv_compression'] != 'none' or CONFIG['csv_parts'] > 1
+            or CONFIG['csv_part_target_mb'] > 0)
+
+class PartitionedCsvWriter:
+    """
+    Write a table as several CSV parts plus a Redshift COPY manifest (same interface as TableWriter).
+    
+    Rows are dealt to the parts in blocks of BLOCK_ROWS, round-robin across
+    CONFIG['csv_parts'] parts (the rows left for the last round are split evenly,
+    so a small table still puts rows in every part), or sequentially into parts of
+    about CONFIG['csv_part_target_mb'] each, measured in compressed bytes. Every
+    part keeps the header row, so the COPY options (IGNOREHEADER 1) are the same
+    as for a single file.
+    """
+    
+    BLOCK_ROWS = 1000
+    
+    def __init__(self, table_name: str, directory: str = None):
+        self.table_name = table_name
+        self.fieldnames = TABLE_COLUMNS[table_name]
+        self.directory = directory or CONFIG['output_dir']
+        self.path = os.path.join(self.directory, f'{table_name}.manifest')
+        self.compression = CONFIG['csv_compression']
+        self.row_count = 0
+        self.parts = []
+        self._target_bytes = int(CONFIG['csv_part_target_mb'] * 1024 * 1024)
+        self._pending = []
+        self._blocks = 0
+        self._roll_over = False
+        self._part_bytes = 0
+        self._row_bytes = 0
+        self._closed = False
+        for _ in range(1 if self._target_bytes else max(1, CONFIG['csv_parts'])):
+            self._open_part()
+    
+    def _open_part(self):
+        self.parts.append(TableWriter(self.table_name, self.directory, self.compression, part=len(self.parts)))
+    
+    def _write_block(self, block: List[Tuple]):
+        if not self._target_bytes:
+            self.parts[self._blocks % len(self.parts)].write_rows(block)
+            self._blocks += 1
+            return
+        while block:
+            if self._roll_over:
+                self.parts[-1].close()  # Frees the compressor
+                self._open_part()
+                self._roll_over = False
+                self._part_bytes = 0
+            part = self.parts[-1]
+            # Only the rows expected to fill the part, at the compressed bytes per row seen so far
+            # (a first probe of a tenth of a block gives the estimate)
+            count = min(len(block), self.BLOCK_ROWS // 10)
+            if self._row_bytes:
+                count = max(1, int(-(-(self._target_bytes - self._part_bytes) // self._row_bytes)))
+            part.write_rows(block[:count])
+            # Flushing pushes the compressor's buffered output to disk, so the file size is the part's size
+            self._part_bytes = part.flush()
+            self._row_bytes = self._part_bytes / part.row_count
+            self._roll_over = self._part_bytes >= self._target_bytes
+            block = block[count:]
+    
+    def write(self, row: Tuple):
+        """Write one row given positionally, in TABLE_COLUMNS order"""
+        self._pending.append(row)
+        self.row_count += 1
+        # Round-robin holds a whole round back, so close() can share out the last one
+        if len(self._pending) >= self.BLOCK_ROWS * (1 if self._target_bytes else len(self.parts)):
+            for start in range(0, len(self._pending), self.BLOCK_ROWS):
+                self._write_block(self._pending[start:start + self.BLOCK_ROWS])
+            self._pending = []
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        for row in rows:
+            self.write(row)
+    
+    def write_columns(self, columns: List[List]):
+        self.write_rows(zip(*columns))
+    
+    def close(self):
+        if self._closed:
+            return
+        if self._pending:
+            if self._target_bytes:
+                self._write_block(self._pending)
+            else:
+                parts = len(self.parts)
+                for index in range(parts):
+                    self._write_block(self._pending[len(self._pending) * index // parts:
+                                                    len(self._pending) * (index + 1) // parts])
+            self._pending = []
+        for part in self.parts:
+            part.close()
+        self._closed = True
+        
+        # One entry per part; mandatory makes COPY fail instead of skipping a missing part
+        entries = [{
+            'url': CONFIG['csv_s3_prefix'] + os.path.basename(part.path),
+            'mandatory': True,
+            'meta': {'content_length': os.path.getsize(part.path)},
+        } for part in self.parts]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': entries}, f, indent=2)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_csv_writer(table_name: str, directory: str = None):
+    """Single CSV file per table, or compressed parts + manifest when split output is configured"""
+    if csv_split_output():
+        return PartitionedCsvWriter(table_name, directory)
+    return TableWriter(table_name, directory)
+
+def csv_part_paths(table_name: str, directory: str = None) -> List[str]:
+    """Local paths of a split table's parts, in manifest order"""
+    directory = directory or CONFIG['output_dir']
+    with open(os.path.join(directory, f'{table_name}.manifest'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return [os.path.join(directory, entry['url'].rsplit('/', 1)[-1]) for entry in manifest['entries']]
+
+LOAD_SCRIPT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sql', 'redshift_load_data.sql')
+COPY_COMPRESSION_OPTIONS = {'none': '', 'gzip': 'GZIP\n', 'zstd': 'ZSTD\n'}
+_COPY_SOURCE_RE = re.compile(r"^(COPY (\w+) FROM )'[^']*'\n(IAM_ROLE [^\n]*\n)", re.MULTILINE)
+
+def write_manifest_copy_script(directory: str = None) -> str:
+    """
+    Write redshift_load_data.sql next to the split CSV output.
+    
+    Generated from sql/redshift_load_data.sql with each COPY reading its table's
+    manifest under CONFIG['csv_s3_prefix'] plus MANIFEST and the compression flag;
+    all other COPY options and the verification queries are kept. Returns the path.
+    """
+    directory = directory or CONFIG['output_dir']
+    with open(LOAD_SCRIPT_TEMPLATE, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    options = 'MANIFEST\n' + COPY_COMPRESSION_OPTIONS[CONFIG['csv_compression']]
+    sql = _COPY_SOURCE_RE.sub(
+        lambda m: f"{m.group(1)}'{CONFIG['csv_s3_prefix']}{m.group(2)}.manifest'\n{m.group(3)}{options}", sql)
+    
+    path = os.path.join(directory, 'redshift_load_data.sql')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"-- Generated by generate_data.py from sql/redshift_load_data.sql: "
+                f"{CONFIG['csv_compression']} CSV parts loaded through COPY manifests\n")
+        f.write(sql)
+    return path
+
+# ============================================================================
+# INLINE VALIDATION
+# ============================================================================
+# With CONFIG['inline_validation'], TableWriter hands the text of every block of rows
+# of an output CSV file to a CsvFileCheck before writing it: validate_csv.py's schema
+# checks (sql/redshift_schema.sql) and foreign keys run on the rows as they are
+# produced, and validation_report.json records each file's rows, errors and SHA-256.
+
+INLINE_CHECK_ROWS = 10000  # Rows buffered per check
+_INLINE_VALIDATION = {'validator': None}
+
+def load_validate_csv():
+    """Import validate_csv.py (and the numpy it uses) once a run validates inline"""
+    global validate_csv
+    import validate_csv
+    return validate_csv
+
+class CsvFileCheck:
+    """Inline validation of one CSV file: row checks, key collection and checksum"""
+    
+    def __init__(self, validator: 'InlineValidator', table_name: str, path: str, fieldnames: List[str],
+                 offset: int = None):
+        self.validator = validator
+        self.table_name = table_name
+        self.path = path
+        self.header = list(fieldnames)
+        specs = {column.name: column for column in validate_csv.TABLES[table_name]}
+        self.columns = tuple(specs.get(field) for field in fieldnames)
+        self.rows = 0
+        self.errors = []
+        self.sha256 = hashlib.sha256()
+        
+        positions = {field: index for index, field in enumerate(fieldnames)}
+        self.id_index = positions.get('id') if table_name in validate_csv.REFERENCED_TABLES else None
+        self.references = [(column, positions[column], referenced)
+                           for column, referenced in validate_csv.FOREIGN_KEYS.get(table_name, ())
+                           if column in positions]
+        
+        if offset is not None:
+            # Resumed file: the rows before `offset` were checked before the interruption
+            saved = validator.saved_open.get(table_name, {'rows': 0, 'errors': []})
+            self.rows, self.errors = saved['rows'], list(saved['errors'])
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(8 * 1024 * 1024), b''):
+                    self.sha256.update(block)
+    
+    def add_header(self, text: str) -> str:
+        self.sha256.update(text.encode('utf-8'))
+        return text
+    
+    def check(self, texts: List[str]) -> str:
+        """Check a block of rows (csv.writer output, one string per row); returns the text to write"""
+        text = ''.join(texts)
+        self.sha256.update(text.encode('utf-8'))
+        lines = [row_text[:-1] for row_text in texts]
+        first_row = self.rows + 1
+        if len(self.errors) < validate_csv.MAX_ERRORS:
+            validate_csv.check_lines(lines, first_row, self.header, self.columns, self.errors)
+        
+        if self.id_index is not None or self.references:
+            width = max([index for _, index, _ in self.references] + [self.id_index or 0]) + 1
+            fields = [line.split(CONFIG['delimiter'], width) if '"' not in line
+                      else validate_csv.parse_lines([line])[0] for line in lines]
+            if self.id_index is not None:
+                self.validator.ids[self.table_name].update(
+                    row[self.id_index] for row in fields if len(row) > self.id_index)
+            for column, index, referenced in self.references:
+                values = [row[index] if len(row) > index else '' for row in fields]
+                known = self.validator.ids[referenced]
+                missing = set(values) - known - {''}
+                for offset, value in enumerate(values):
+                    if value in missing and len(self.errors) < validate_csv.MAX_ERRORS:
+                        self.errors.append((first_row + offset, f"Invalid {column} {value} (no {referenced} row)"))
+        
+        self.rows += len(lines)
+        return text
+    
+    def close(self):
+        self.validator.file_closed(self)
+    
+    def entry(self) -> Dict:
+        """This file's validation_report.json entry"""
+        errors = [message if row is None else f"Row {row}: {message}" for row, message in self.errors]
+        return {'table': self.table_name, 'rows': self.rows, 'bytes': os.path.getsize(self.path),
+                'sha256': self.sha256.hexdigest(), 'errors': errors}
+
+class InlineValidator:
+    """
+    Inline validation state of a run: the ids foreign keys are checked against and
+    the report entries of the finished files. `saved` is a snapshot() from a checkpoint.
+    """
+    
+    def __init__(self, directory: str, saved: Dict = None):
+        load_validate_csv()
+        saved = saved or {}
+        self.directory = os.path.abspath(directory)
+        self.files = dict(saved.get('files', {}))
+        self.saved_open = saved.get('open', {})
+        self.open_checks = {}
+        self.ids = defaultdict(set)
+    
+    def open_file(self, table_name: str, path: str, fieldnames: List[str], offset: int = None) -> CsvFileCheck:
+        check = CsvFileCheck(self, table_name, path, fieldnames, offset)
+        self.open_checks[table_name] = check
+        return check
+    
+    def file_closed(self, check: CsvFileCheck):
+        self.open_checks.pop(check.table_name, None)
+        self.files[os.path.basename(check.path)] = check.entry()
+    
+    def snapshot(self) -> Dict:
+        """Plain state for a checkpoint (open files are re-hashed when resumed)"""
+        return {'files': dict(self.files),
+                'open': {table_name: {'rows': check.rows, 'errors': list(check.errors)}
+                         for table_name, check in self.open_checks.items()}}
+    
+    def write_report(self) -> str:
+        return validate_csv.write_validation_report(self.directory, self.files)
+
+def open_inline_check(table_name: str, path: str, fieldnames: List[str], offset: int = None):
+    """CsvFileCheck for a schema table's file in the output directory, or None without inline validation"""
+    validator = _INLINE_VALIDATION['validator']
+    if (validator is None or table_name not in validate_csv.TABLES
+            or os.path.abspath(os.path.dirname(path)) != validator.directory):
+        return None
+    return validator.open_file(table_name, path, fieldnames, offset)
+
+def add_validation_ids(table_name: str, ids: Iterable[str]):
+    """Ids the foreign keys may reference that were written earlier (staged tables, resumed or delta runs)"""
+    validator = _INLINE_VALIDATION['validator']
+    if validator is not None:
+        validator.ids[table_name].update(ids)
+
+def finish_inline_validation():
+    """Write validation_report.json and print the errors found while generating"""
+    validator = _INLINE_VALIDATION['validator']
+    if validator is None:
+        return
+    _INLINE_VALIDATION['validator'] = None
+    path = validator.write_report()
+    invalid = {name: entry for name, entry in validator.files.items() if entry['errors']}
+    if not invalid:
+        print(f"🔍 Inline validation: {len(validator.files)} files valid ({path})")
+        return
+    print(f"❌ Inline validation found errors in {len(invalid)} files ({path}):")
+    for name, entry in invalid.items():
+        print(f"   {name}: {len(entry['errors'])} errors")
+        for error in entry['errors'][:3]:
+            print(f"      • {error}")
+
+# ============================================================================
+# PARQUET EXPORT
+# ============================================================================
+# Column types come from sql/redshift_schema.sql so COPY ... FORMAT AS PARQUET
+# maps them directly: NUMERIC -> decimal128(p,s), TIMESTAMP -> timestamp[us],
+# DATE -> date32, BOOLEAN -> bool, INTEGER -> int32, VARCHAR/TEXT -> string.
+# Empty strings become NULL, like EMPTYASNULL in the CSV COPY.
+
+def _parquet_column(table_name: str, spec):
+    """(arrow type, converter) for one schema column; converters take a tuple of raw values"""
+    if spec.type in ('NUMERIC', 'DECIMAL'):
+        arrow_type = pa.decimal128(spec.precision, spec.scale)
+        decimals = FIXED_POINT_COLUMNS.get(table_name, {}).get(spec.name, spec.scale)
+        def convert(values):
+            text = [None if v == '' else (format_fixed(v, decimals) if type(v) is int else v) for v in values]
+            return pa.array(text, pa.string()).cast(arrow_type)
+    elif spec.type in ('TIMESTAMP', 'DATE'):
+        arrow_type = pa.timestamp('us') if spec.type == 'TIMESTAMP' else pa.date32()
+        def convert(values):
+            return pa.array([v or None for v in values], pa.string()).cast(arrow_type)
+    elif spec.type in ('INTEGER', 'INT', 'INT4', 'BIGINT', 'INT8', 'SMALLINT', 'INT2'):
+        arrow_type = {'BIGINT': pa.int64(), 'INT8': pa.int64(), 'SMALLINT': pa.int16(), 'INT2': pa.int16()}.get(
+            spec.type, pa.int32())
+        def convert(values):
+            return pa.array([None if v == '' else int(v) for v in values], arrow_type)
+    elif spec.type in ('BOOLEAN', 'BOOL'):
+        arrow_type = pa.bool_()
+        def convert(values):
+            return pa.array([None if v == '' else (v is True or v == 'true') for v in values], arrow_type)
+    else:
+        arrow_type = pa.string()
+        def convert(values):
+            return pa.array([None if v == '' else str(v) for v in values], arrow_type)
+    return arrow_type, convert
+
+class ParquetTableWriter:
+    """Buffer a table's rows and write them as Parquet row groups (same interface as TableWriter)"""
+    
+    _schema_specs = None
+    
+    def __init__(self, table_name: str, directory: str = None):
+        if ParquetTableWriter._schema_specs is None:
+            ParquetTableWriter._schema_specs = load_redshift_schema()
+        specs = ParquetTableWriter._schema_specs[table_name]
+        if [spec.name for spec in specs] != TABLE_COLUMNS[table_name]:
+            raise ValueError(f"Column order of {table_name} differs between TABLE_COLUMNS and redshift_schema.sql")
+        
+        self.table_name = table_name
+        self.fieldnames = TABLE_COLUMNS[table_name]
+        self.path = os.path.join(directory or CONFIG['output_dir'], f'{table_name}.parquet')
+        self.row_count = 0
+        
+        columns = [_parquet_column(table_name, spec) for spec in specs]
+        self._schema = pa.schema([pa.field(spec.name, arrow_type) for spec, (arrow_type, _) in zip(specs, columns)])
+        self._converters = [convert for _, convert in columns]
+        self._row_group_size = CONFIG['parquet_row_group_size']
+        self._buffer = []
+        compression = CONFIG['parquet_compression']
+        self._writer = pq.ParquetWriter(self.path, self._schema,
+                                        compression=None if compression == 'none' else compression)
+    
+    def _flush(self):
+        if not self._buffer:
+            return
+        arrays = [convert(values) for convert, values in zip(self._converters, zip(*self._buffer))]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema),
+                                 row_group_size=self._row_group_size)
+        self._buffer = []
+    
+    def write(self, row: Tuple):
+        """Write one row given positionally, in TABLE_COLUMNS order"""
+        self._buffer.append(row)
+        self.row_count += 1
+        if len(self._buffer) >= self._row_group_size:
+            self._flush()
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        for row in rows:
+            self.write(row)
+    
+    def write_columns(self, columns: List[List]):
+        self.write_rows(zip(*columns))
+    
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_parquet_rows(path: str) -> Iterator[Tuple]:
+    """Stream rows back from a Parquet file written by ParquetTableWriter"""
+    if not load_pyarrow():
+        raise ImportError("Reading the Parquet output needs pyarrow. Install with: pip install pyarrow")
+    for batch in pq.ParquetFile(path).iter_batches():
+        yield from zip(*(column.to_pylist() for column in batch.columns))
+
+# ============================================================================
+# POSTGRESQL COPY LOADING
+# ============================================================================
+# Rows reach PostgreSQL through COPY ... FROM STDIN. Each table's rows are encoded
+# into an in-memory buffer (text or binary COPY format) and sent as one COPY once
+# the buffer is full. Buffers are flushed in TABLE_COLUMNS (foreign key) order, so
+# a child table's rows never reach the server before its parents' rows, and the
+# whole run is committed once at the end.
+
+PG_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+PG_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+PG_BINARY_TRAILER = struct.pack('!h', -1)
+PG_BINARY_NULL = struct.pack('!i', -1)
+_INT2 = struct.Struct('!h')
+_INT4 = struct.Struct('!i')
+_INT8 = struct.Struct('!q')
+_PG_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_PG_TEXT_SPECIAL = re.compile(r'[\\\n\r]')
+
+def _pg_text_value(value) -> str:
+    """One field in COPY text format, escaped (COPY runs with NULL '', so '' and None are NULL)"""
+    if value is None:
+        return ''
+    return str(value).translate(_PG_TEXT_ESCAPES)
+
+def _pg_binary_numeric(units: int, dscale: int) -> bytes:
+    """NUMERIC in COPY binary format: base-10000 digits of a fixed-point value"""
+    sign = 0x4000 if units < 0 else 0
+    frac_groups = -(-dscale // 4)
+    units = abs(units) * 10 ** (frac_groups * 4 - dscale)
+    digits = []
+    while units:
+        units, digit = divmod(units, 10000)
+        digits.append(digit)
+    digits.reverse()
+    weight = len(digits) - frac_groups - 1
+    while digits and digits[-1] == 0:
+        digits.pop()
+    if not digits:
+        sign = weight = 0
+    return struct.pack(f'!hhHh{len(digits)}H', len(digits), weight, sign, dscale, *digits)
+
+_PG_CLOCK_SECONDS = {text: seconds for seconds, text in enumerate(_CLOCK_TEXT)}
+
+def _pg_binary_days(text: str) -> int:
+    return date.fromisoformat(text[:10]).toordinal() - PG_EPOCH_ORDINAL
+
+def _pg_binary_encoder(spec, decimals: int):
+    """Encoder from a row value to its COPY binary field for one sql/create_schema.sql column"""
+    if spec.type == 'UUID':
+        return lambda v: bytes.fromhex(str(v).replace('-', ''))
+    if spec.type in ('INTEGER', 'INT', 'INT4'):
+        return lambda v: _INT4.pack(int(v))
+    if spec.type in ('BIGINT', 'INT8'):
+        return lambda v: _INT8.pack(int(v))
+    if spec.type in ('SMALLINT', 'INT2'):
+        return lambda v: _INT2.pack(int(v))
+    if spec.type in ('BOOLEAN', 'BOOL'):
+        return lambda v: b'\x01' if v is True or v == 'true' else b'\x00'
+    if spec.type in ('NUMERIC', 'DECIMAL'):
+        return lambda v: _pg_binary_numeric(v if type(v) is int else parse_fixed(str(v), decimals), decimals)
+    if spec.type == 'DATE':
+        return lambda v: _INT4.pack(_pg_binary_days(str(v)))
+    if spec.type == 'TIMESTAMP':
+        def encode(v):
+            v = str(v)
+            return _INT8.pack((_pg_binary_days(v) * SECONDS_PER_DAY + _PG_CLOCK_SECONDS[v[10:19]]) * 1000000)
+        return encode
+    # VARCHAR, TEXT and enum types are sent as their UTF-8 text
+    return lambda v: str(v).encode('utf-8')
+
+class PostgresCopyLoader:
+    """Stream rows of every table into PostgreSQL over one connection with COPY ... FROM STDIN"""
+    
+    _schema_specs = None
+    
+    def __init__(self, conn, copy_format: str = None, buffer_mb: float = None, report_errors: bool = True):
+        self.conn = conn
+        self.copy_format = copy_format or CONFIG['postgres_copy_format']
+        if self.copy_format not in ('text', 'binary'):
+            raise ValueError(f"Unknown postgres_copy_format {self.copy_format!r}; expected text or binary")
+        self.buffer_bytes = int((buffer_mb or CONFIG['postgres_copy_buffer_mb']) * 1024 * 1024)
+        self.row_counts = defaultdict(int)
+        self.copy_seconds = 0.0
+        self.failed = {}
+        self.report_errors = report_errors
+        self._cursor = conn.cursor()
+        self._encoders = {}
+        self._buffers = {}
+    
+    def _encoder(self, table_name: str, columns: Tuple[str, ...]):
+        """Function turning one row (values in `columns` order) into its COPY text line or binary tuple"""
+        fixed_point = FIXED_POINT_COLUMNS.get(table_name, {})
+        if self.copy_format == 'text':
+            fixed_columns = [(index, fixed_point[column]) for index, column in enumerate(columns)
+                             if column in fixed_point]
+            separators = len(columns) - 1
+            def encode(row):
+                if fixed_columns:
+                    row = list(row)
+                    for index, decimals in fixed_columns:
+                        if type(row[index]) is int:
+                            row[index] = format_fixed(row[index], decimals)
+                line = '\t'.join([v if type(v) is str else ('' if v is None else str(v)) for v in row])
+                # Escaping is rarely needed, so it is only done for lines that contain
+                # a backslash, newline, carriage return or a tab inside a value
+                if line.count('\t') != separators or _PG_TEXT_SPECIAL.search(line):
+                    line = '\t'.join(map(_pg_text_value, row))
+                return line + '\n'
+            return encode
+        
+        if PostgresCopyLoader._schema_specs is None:
+            PostgresCopyLoader._schema_specs = load_postgres_schema()
+        specs = {spec.name: spec for spec in PostgresCopyLoader._schema_specs[table_name]}
+        encoders = [_pg_binary_encoder(specs[column], fixed_point.get(column, specs[column].scale))
+                    for column in columns]
+        field_count = _INT2.pack(len(columns))
+        def encode(row):
+            fields = [field_count]
+            for encode_value, value in zip(encoders, row):
+                if value is None or value == '':
+                    fields.append(PG_BINARY_NULL)
+                else:
+                    data = encode_value(value)
+                    fields.append(_INT4.pack(len(data)))
+                    fields.append(data)
+            return b''.join(fields)
+        return encode
+    
+    def write_rows(self, table_name: str, rows: Iterable[Tuple]):
+        """Buffer rows given positionally in TABLE_COLUMNS order; full buffers are sent right away"""
+        if table_name not in self._encoders:
+            self._encoders[table_name] = self._encoder(table_name, TABLE_COLUMNS[table_name])
+            self._buffers[table_name] = [[], 0]
+        encode = self._encoders[table_name]
+        buffer = self._buffers[table_name]
+        chunks = buffer[0]
+        count = 0
+        for row in rows:
+            chunk = encode(row)
+            chunks.append(chunk)
+            buffer[1] += len(chunk)
+            count += 1
+            if buffer[1] >= self.buffer_bytes:
+                self.flush(table_name)
+                chunks = buffer[0]
+        self.row_counts[table_name] += count
+    
+    def _copy(self, target: str, columns: Tuple[str, ...], chunks: List):
+        """Send buffered COPY data for one table (skipped once a COPY into it has failed)"""
+        if target in self.failed:
+            return
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        sql = f'COPY "{target}" ({column_list}) FROM STDIN'
+        if self.copy_format == 'binary':
+            stream = io.BytesIO(PG_BINARY_HEADER + b''.join(chunks) + PG_BINARY_TRAILER)
+            sql += ' WITH (FORMAT binary)'
+        else:
+            stream = io.StringIO(''.join(chunks))
+            sql += " WITH (NULL '')"
+        # A failed COPY only discards its own buffer: the run's transaction stays usable
+        started = datetime.now()
+        self._cursor.execute('SAVEPOINT copy_buffer')
+        try:
+            self._cursor.copy_expert(sql, stream, size=1024 * 1024)
+        except psycopg2.Error as e:
+            self._cursor.execute('ROLLBACK TO SAVEPOINT copy_buffer')
+            self.failed[target] = str(e).strip()
+            if self.report_errors:
+                print(f"❌ Error loading {target}: {self.failed[target]}")
+            return
+        self._cursor.execute('RELEASE SAVEPOINT copy_buffer')
+        self.copy_seconds += (datetime.now() - started).total_seconds()
+    
+    def flush(self, table_name: str = None):
+        """Send the buffered rows of a table and of every table before it in foreign key order"""
+        tables = list(TABLE_COLUMNS)
+        last = tables.index(table_name) if table_name else len(tables) - 1
+        for table in tables[:last + 1]:
+            buffer = self._buffers.get(table)
+            if buffer and buffer[0]:
+                self._copy(table, TABLE_COLUMNS[table], buffer[0])
+                buffer[0] = []
+                buffer[1] = 0
+    
+    def update_columns(self, table_name: str, columns: Tuple[str, ...], rows: Iterable[Tuple]):
+        """
+        Overwrite `columns` of already loaded rows, matched on id.
+        
+        Rows are (id, *values). They are copied into a temporary table which is
+        then joined in a single UPDATE.
+        """
+        self.flush()
+        temp_table = f'{table_name}_updates'
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        self._cursor.execute(f'CREATE TEMP TABLE "{temp_table}" ON COMMIT DROP AS '
+                             f'SELECT "id", {column_list} FROM "{table_name}" WITH NO DATA')
+        encode = self._encoder(table_name, ('id',) + tuple(columns))
+        chunks = []
+        size = 0
+        for row in rows:
+            chunk = encode(row)
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.buffer_bytes:
+                self._copy(temp_table, ('id',) + tuple(columns), chunks)
+                chunks = []
+                size = 0
+        if chunks:
+            self._copy(temp_table, ('id',) + tuple(columns), chunks)
+        
+        assignments = ', '.join(f'"{column}" = u."{column}"' for column in columns)
+        self._cursor.execute(f'UPDATE "{table_name}" AS t SET {assignments} '
+                             f'FROM "{temp_table}" AS u WHERE t."id" = u."id"')
+        updated = self._cursor.rowcount
+        self._cursor.execute(f'DROP TABLE "{temp_table}"')
+        return updated
+    
+    def commit(self):
+        """Send what is left and commit, keeping the connection open"""
+        self.flush()
+        self.conn.commit()
+    
+    def close(self):
+        """Send what is left, commit and close the connection"""
+        if self.conn.closed:
+            return
+        self.commit()
+        self._cursor.close()
+        self.conn.close()
+        total = sum(count for table, count in self.row_counts.items() if table not in self.failed)
+        if total and self.copy_seconds:
+            print(f"🐘 COPY ({self.copy_format}) loaded {total} rows in {self.copy_seconds:.2f}s "
+                  f"({total / self.copy_seconds:,.0f} rows/s)")
+
+_POSTGRES_LOADER = {'loader': None}
+
+def open_postgres_loader() -> bool:
+    """Connect the run-wide loader used by the 'postgres' output format; False if unavailable"""
+    conn = get_postgres_connection()
+    if conn is None:
+        return False
+    _POSTGRES_LOADER['loader'] = PostgresCopyLoader(conn)
+    return True
+
+def close_postgres_loader():
+    loader = _POSTGRES_LOADER['loader']
+    if loader is not None:
+        loader.close()
+        _POSTGRES_LOADER['loader'] = None
+
+class PostgresCopyWriter:
+    """Send a table's rows to the run-wide PostgresCopyLoader (same interface as TableWriter)"""
+    
+    def __init__(self, table_name: str, directory: str = None):
+        self.table_name = table_name
+        self.fieldnames = TABLE_COLUMNS[table_name]
+        self.row_count = 0
+        self._loader = _POSTGRES_LOADER['loader']
+    
+    def write(self, row: Tuple):
+        """Write one row given positionally, in TABLE_COLUMNS order"""
+        self._loader.write_rows(self.table_name, (row,))
+        self.row_count += 1
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        before = self._loader.row_counts[self.table_name]
+        self._loader.write_rows(self.table_name, rows)
+        self.row_count += self._loader.row_counts[self.table_name] - before
+    
+    def write_columns(self, columns: List[List]):
+        self.write_rows(zip(*columns))
+    
+    def close(self):
+        self._loader.flush(self.table_name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+# ============================================================================
+# GENERATION STATE (delta runs)
+# ============================================================================
+
+# Saved next to every run's output so a later delta run can continue from it.
+# Only plain tuples/lists/arrays are pickled (the row namedtuples live in __main__);
+# the lookups are indexed by entity index, as in the run (see entity_uuid).
+GENERATION_STATE_FILE = 'generation_state.pkl'
+GENERATION_STATE_VERSION = 5
+# Settings a base run takes over so its rows match the run that saved the state
+STATE_CONFIG_KEYS = ('engine', 'block_size', 'order_shard_size', 'num_consumers', 'num_sellers',
+                     'num_commodities', 'num_orders', 'address_per_consumer_range',
+                     'cards_per_consumer_range', 'items_per_order_range', 'faker_pool_size', 'faker_locale')
+
+def save_generation_state(directory: str, state: Dict):
+    """Write the dimension lookups and cumulative aggregates a delta run needs"""
+    state = dict(state, version=GENERATION_STATE_VERSION)
+    with open(os.path.join(directory, GENERATION_STATE_FILE), 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_generation_state(directory: str) -> Dict:
+    """Read the state saved by an earlier run (see save_generation_state)"""
+    path = os.path.join(directory, GENERATION_STATE_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {GENERATION_STATE_FILE} in {directory!r}; "
+                                f"delta and base runs need the output directory of a run that saved its state")
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != GENERATION_STATE_VERSION:
+        raise ValueError(f"{path} has state version {state.get('version')}, "
+                         f"expected {GENERATION_STATE_VERSION}; regenerate the base run")
+    return state
+
+# Days a full run's created_at dates span for each delta volume (see random_date_in_range):
+# a delta run adds the rows of its window at the full run's rate
+DELTA_VOLUME_DAYS = {'num_consumers': 730, 'num_commodities': 180, 'num_orders': 90}
+
+def delta_volumes(state: Dict) -> Dict[str, int]:
+    """New rows of a delta run on `state`: CONFIG['delta_volumes'], else the base volumes scaled to the window"""
+    base = state['base_volumes']
+    volumes = {key: round(base[key] * CONFIG['delta_window_days'] / days) for key, days in DELTA_VOLUME_DAYS.items()}
+    volumes.update(CONFIG['delta_volumes'] or {})
+    return volumes
+
+def begin_delta_run(directory: str, reseed: bool = True) -> Dict:
+    """
+    Load an earlier run's state and switch this run to its delta window.
+    
+    New timestamps fall in the delta_window_days before the reference time, and the
+    run is seeded from (base seed, reference time) so each delta day gets fresh ids;
+    the new-row volumes come from delta_volumes. A resumed run passes reseed=False:
+    its seed and random states come from the checkpoint.
+    """
+    state = load_generation_state(directory)
+    if CONFIG['reference_time'] is None:
+        print("💡 The delta window ends now: pass --reference-time to reproduce this delta run")
+    reference = run_reference_time()
+    if reference <= state['reference_time']:
+        print(f"⚠️  Reference time {format_timestamp(reference)} is not after the previous run's "
+              f"({format_timestamp(state['reference_time'])}); delta rows will overlap it")
+    _RUN_CLOCK['window'] = CONFIG['delta_window_days'] * SECONDS_PER_DAY
+    if reseed:
+        CONFIG['seed'] = derive_seed(state['seed'], 'delta', reference)
+        random.seed(CONFIG['seed'])
+        fake.seed_instance(CONFIG['seed'])
+    CONFIG.update(delta_volumes(state))
+    print(f"🔁 Delta run on {directory} ({state['consumer_count']} consumers, "
+          f"{state['seller_count']} sellers, {len(state['commodity_prices'])} commodities)")
+    print(f"   New rows: {CONFIG['num_consumers']} consumers, {CONFIG['num_commodities']} commodities, "
+          f"{CONFIG['num_orders']} orders")
+    return state
+
+def delta_first_indexes(state: Dict) -> Dict[str, int]:
+    """Index of the first entity a delta run on `state` adds (its rows follow the earlier runs')"""
+    return {'consumers': state['consumer_count'], 'sellers': state['seller_count'],
+            'commodities': len(state['commodity_prices']), 'orders': state['order_count']}
+
+def restore_order_aggregates(saved: Dict[str, Dict[str, array]], sizes: Dict[str, int]) -> Dict[str, Dict[str, array]]:
+    """Accumulators holding saved aggregates, extended with zeros to at least `sizes` entities"""
+    aggregates = new_order_aggregates(sizes)
+    for table, stats in saved.items():
+        for field, values in stats.items():
+            column = array('q', values)
+            column.frombytes(bytes(8 * max(sizes[table] - len(column), 0)))
+            aggregates[table][field] = column
+    return aggregates
+
+def aggregate_update_rows(table_name: str, indexes: Iterable[int], update_row) -> Iterator[Tuple]:
+    """(id, *AGGREGATE_COLUMNS) of the entities at `indexes`, with the columns filled in by update_row"""
+    columns = AGGREGATE_COLUMNS[table_name]
+    blank = ROW_TYPES[table_name]._make([''] * len(TABLE_COLUMNS[table_name]))
+    for index in indexes:
+        entity_id = entity_uuid(table_name, index)
+        row = update_row(blank._replace(id=entity_id), index)
+        yield (entity_id,) + tuple(getattr(row, column) for column in columns)
+
+# ============================================================================
+# RUN CHECKPOINTS
+# ============================================================================
+
+CHECKPOINT_DIR = '.checkpoint'
+CHECKPOINT_PHASES = ('verticals', 'users', 'seller_vertical', 'address_books', 'commodities', 'cards', 'orders',
+                     'consumers_aggregates', 'sellers_aggregates', 'commodities_aggregates')
+
+def _write_pickle(path: str, data):
+    """Pickle to a temporary file and rename it, so a crash never leaves a torn checkpoint"""
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+def _read_pickle(path: str):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+class RunCheckpoint:
+    """
+    Phase checkpoints of generate_and_export_all, kept in <output_dir>/.checkpoint until the run completes.
+    
+    The tables of a completed phase are already on disk; <phase>.pkl holds the lookups the
+    later phases need (same plain layout as the generation state). progress.pkl records the
+    last completed phase, the run's CONFIG, the random/Faker states and the row counts, and
+    during the orders phase the next shard, the partial aggregates and the fact file sizes.
+    """
+    
+    def __init__(self, directory: str, progress: Dict = None):
+        self.directory = os.path.join(directory, CHECKPOINT_DIR)
+        self.progress = progress or {'phase': None, 'counts': {}}
+        self.enabled = True
+    
+    @classmethod
+    def load(cls, directory: str) -> 'RunCheckpoint':
+        """Read an interrupted run's checkpoint and restore its CONFIG (output_dir becomes `directory`)"""
+        path = os.path.join(directory, CHECKPOINT_DIR, 'progress.pkl')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No checkpoint in {directory!r}; nothing to resume")
+        checkpoint = cls(directory, _read_pickle(path))
+        CONFIG.update(checkpoint.progress['config'])
+        CONFIG['output_dir'] = directory
+        return checkpoint
+    
+    @property
+    def phase(self) -> str:
+        return self.progress['phase']
+    
+    def done(self, phase: str) -> bool:
+        """Whether `phase` completed before the run was interrupted"""
+        return self.phase is not None and CHECKPOINT_PHASES.index(phase) <= CHECKPOINT_PHASES.index(self.phase)
+    
+    def lookups(self, phase: str) -> Dict:
+        return _read_pickle(os.path.join(self.directory, f'{phase}.pkl'))
+    
+    def restore_random_state(self):
+        """Put random and Faker back where the last completed phase left them"""
+        if self.phase is not None:
+            random.setstate(self.progress['random_state'])
+            fake.random.setstate(self.progress['faker_state'])
+    
+    def _save_progress(self, counts: Dict[str, int], **progress):
+        config = {key: value for key, value in CONFIG.items() if key != 'postgres'}
+        config['reference_time'] = format_timestamp(run_reference_time())
+        if _INLINE_VALIDATION['validator'] is not None:
+            progress['validation'] = _INLINE_VALIDATION['validator'].snapshot()
+        self.progress.update(progress, config=config, counts=dict(counts))
+        os.makedirs(self.directory, exist_ok=True)
+        _write_pickle(os.path.join(self.directory, 'progress.pkl'), self.progress)
+    
+    def save(self, phase: str, counts: Dict[str, int], **lookups):
+        """Record a completed phase with the lookups it produced"""
+        if not self.enabled:
+            RUN_METRICS.phase_done(phase, counts)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        _write_pickle(os.path.join(self.directory, f'{phase}.pkl'), lookups)
+        self.progress.pop('orders', None)
+        self._save_progress(counts, phase=phase, random_state=random.getstate(),
+                            faker_state=fake.random.getstate())
+        RUN_METRICS.phase_done(phase, counts)
+    
+    def save_orders(self, next_shard: int, aggregates: Dict[str, Dict[str, array]], writers: List['TableWriter']):
+        """Record the order shards written so far (fact files are flushed first)"""
+        if not self.enabled:
+            return
+        sizes = [writer.flush() for writer in writers]
+        self._save_progress(self.progress['counts'], orders={
+            'next_shard': next_shard,
+            'aggregates': aggregates,
+            'sizes': sizes,
+            'row_counts': [writer.row_count for writer in writers],
+        })
+    
+    def clear(self):
+        """Drop the checkpoint once the run has completed"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def order_shards_resumable() -> bool:
+    """Whether the fact tables can be continued mid-phase (plain, unsplit CSV files only)"""
+    return CONFIG['output_formats'] == ('csv',) and not csv_split_output()
+
+# ============================================================================
+# TABLE SELECTION
+# ============================================================================
+# CONFIG['tables'] limits a run to the listed tables plus the parents their foreign keys
+# reference (TABLE_DEPENDENCIES); phases none of whose tables are needed are skipped.
+# Foreign keys are derived from the parent's index (entity_uuid), but some generators
+# need a parent's lookups (GENERATION_DEPENDENCIES): those phases run without writing
+# their tables. Every block of CONFIG['block_size'] entities
+# (and every order shard) is seeded from (seed, table, block), so skipping a phase does
+# not change the rows of the others: a subset reproduces a full run's rows.
+# With CONFIG['base_run'] the listed tables are regenerated against the lookups an earlier
+# run saved (generation_state.pkl) instead of regenerating the phases they depend on.
+# CONFIG['index_range'] = (start, end) narrows the listed tables to the rows of those
+# entity indexes (RANGE_KEYS): consumers/sellers/commodities/orders in generation order,
+# users in users.csv order (consumers then sellers). A range only generates the seed
+# blocks it overlaps; tables with aggregate columns need a base run for their totals.
+
+GENERATION_DEPENDENCIES = {
+    'seller_vertical': ('verticals',),
+    'commodities': ('seller_vertical', 'verticals'),   # a commodity's vertical is one its seller sells in
+    'orders': ('address_books', 'cards', 'commodities'),  # delivery address, payment card, line items
+    # The other order tables come out of the orders phase (see PHASE_TABLES)
+    'order_commodities': ('orders',),
+    'transactions': ('orders',),
+    'reviews': ('orders',),
+}
+ORDER_TABLES = ('orders', 'order_commodities', 'transactions', 'reviews')
+# Phase that generates each table (the *_aggregates phases rewrite the staged tables)
+TABLE_PHASES = {table: phase for phase, tables in PHASE_TABLES.items()
+                if not phase.endswith('_aggregates') for table in tables}
+
+# Entity whose index an index_range counts for each table (child rows follow their parent)
+RANGE_KEYS = {
+    'users': 'users',
+    'consumers': 'consumers',
+    'address_books': 'consumers',
+    'cards': 'consumers',
+    'sellers': 'sellers',
+    'seller_vertical': 'sellers',
+    'verticals': 'verticals',
+    'commodities': 'commodities',
+    'orders': 'orders',
+    'order_commodities': 'orders',
+    'transactions': 'orders',
+    'reviews': 'orders',
+}
+
+_TABLE_SELECTION = {'written': frozenset(TABLE_COLUMNS)}
+
+def table_closure(tables: Iterable[str], *graphs: Dict[str, Tuple[str, ...]]) -> set:
+    """`tables` plus everything they reach through the dependency graphs"""
+    closure = set()
+    pending = list(tables)
+    while pending:
+        table = pending.pop()
+        if table not in closure:
+            closure.add(table)
+            for graph in graphs:
+                pending.extend(graph.get(table, ()))
+    return closure
+
+def resolve_table_selection() -> Tuple[frozenset, frozenset]:
+    """(tables written, tables generated) for CONFIG['tables'] and CONFIG['base_run']"""
+    requested = CONFIG['tables']
+    if not requested:
+        if CONFIG['index_range'] is not None:
+            raise ValueError("An index range needs a table selection")
+        return frozenset(TABLE_COLUMNS), frozenset(TABLE_COLUMNS)
+    unknown = set(requested) - set(TABLE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown tables {', '.join(sorted(unknown))}; expected some of {', '.join(TABLE_COLUMNS)}")
+    if CONFIG['delta_from']:
+        raise ValueError("Delta runs generate every table; drop the table selection or delta_from")
+    key = range_key()
+    if CONFIG['base_run']:
+        return frozenset(requested), frozenset(requested)
+    written = set(requested) if key else table_closure(requested, TABLE_DEPENDENCIES)
+    return frozenset(written), frozenset(table_closure(written, GENERATION_DEPENDENCIES))
+
+def range_key() -> str:
+    """Entity CONFIG['index_range'] counts (see RANGE_KEYS), or None without a range"""
+    if CONFIG['index_range'] is None:
+        return None
+    start, end = CONFIG['index_range']
+    if not 0 <= start < end:
+        raise ValueError(f"Index range {start}:{end} is empty; expected 0 <= start < end")
+    keys = {RANGE_KEYS[table] for table in CONFIG['tables'] or ()}
+    if len(keys) != 1:
+        raise ValueError("An index range needs tables indexed by the same entity, "
+                         "e.g. orders order_commodities transactions reviews (see RANGE_KEYS)")
+    return keys.pop()
+
+def entity_index_ranges() -> Dict[str, Tuple[int, int]]:
+    """
+    (start, end) indexes each generator covers: every entity of the run (after the earlier
+    runs' in a delta run, which adds no sellers), unless CONFIG['index_range'] narrows the
+    range's entity. A consumer or seller range generates no users of the other kind.
+    """
+    num_consumers, num_sellers = CONFIG['num_consumers'], CONFIG['num_sellers']
+    volumes = {'consumers': num_consumers, 'sellers': 0 if CONFIG['delta_from'] else num_sellers,
+               'commodities': CONFIG['num_commodities'], 'orders': CONFIG['num_orders']}
+    ranges = {entity: (block_origin(entity), block_origin(entity) + count) for entity, count in volumes.items()}
+    ranges['verticals'] = (0, None)  # As many as the master file holds
+    key = range_key()
+    if key is None:
+        return ranges
+    start, end = CONFIG['index_range']
+    if key == 'users':
+        ranges['consumers'] = (min(start, num_consumers), min(end, num_consumers))
+        ranges['sellers'] = (min(max(start - num_consumers, 0), num_sellers),
+                             min(max(end - num_consumers, 0), num_sellers))
+        return ranges
+    if key in ('consumers', 'sellers'):
+        ranges['sellers' if key == 'consumers' else 'consumers'] = (0, 0)
+    count = volumes.get(key, end)
+    ranges[key] = (min(start, count), min(end, count))
+    return ranges
+
+def table_selected(table_name: str) -> bool:
+    """Whether the run writes `table_name` (rows of other generated tables are dropped)"""
+    return table_name in _TABLE_SELECTION['written']
+
+def rows_read(table_name: str) -> bool:
+    """Whether anything reads the rows of `table_name`: its writers, or the inline validator (ids of referenced tables)"""
+    return table_selected(table_name) or (_INLINE_VALIDATION['validator'] is not None
+                                          and table_name in validate_csv.REFERENCED_TABLES)
+
+class SkippedTableWriter:
+    """
+    Takes the rows of a table that is generated for its lookups but not written.
+    The ids of a table foreign keys reference still go to the inline validator.
+    row_count stays 0 (nothing is written); generated_count counts the rows taken.
+    """
+    
+    def __init__(self, table_name: str, directory: str = None):
+        self.table_name = table_name
+        self.row_count = 0
+        self.generated_count = 0
+        self.keep_ids = rows_read(table_name)
+    
+    def write(self, row: Tuple):
+        self.write_rows((row,))
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        if self.keep_ids:
+            rows = list(rows)
+            add_validation_ids(self.table_name, (row.id for row in rows))
+        for _ in rows:
+            self.generated_count += 1
+    
+    def write_columns(self, columns: List[List]):
+        if columns:
+            if self.keep_ids:
+                add_validation_ids(self.table_name, columns[TABLE_COLUMNS[self.table_name].index('id')])
+            self.generated_count += len(columns[0])
+    
+    def flush(self) -> int:
+        return 0
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def begin_base_run(directory: str) -> Dict:
+    """Load an earlier run's lookups and take over its seed, reference time and generation settings"""
+    state = load_generation_state(directory)
+    CONFIG.update(state['config'])
+    CONFIG['seed'] = state['seed']
+    CONFIG['reference_time'] = format_timestamp(state['reference_time'])
+    _RUN_CLOCK['reference'] = state['reference_time']
+    index_range = CONFIG['index_range']
+    print(f"🔁 Regenerating {', '.join(CONFIG['tables'])}"
+          + (f" (indexes {index_range[0]}:{index_range[1]})" if index_range else "")
+          + f" against {directory} (reference time {CONFIG['reference_time']})")
+    return state
+
+# ============================================================================
+# TABLE OUTPUT
+# ============================================================================
+
+OUTPUT_WRITERS = {
+    'csv': open_csv_writer,
+    'parquet': ParquetTableWriter,
+    'postgres': PostgresCopyWriter,
+}
+FILE_OUTPUT_FORMATS = ('csv', 'parquet')
+
+def file_output_formats() -> Tuple[str, ...]:
+    """Configured output formats that write files into the output directory"""
+    return tuple(fmt for fmt in CONFIG['output_formats'] if fmt in FILE_OUTPUT_FORMATS)
+
+class MultiFormatWriter:
+    """Send every row to one writer per output format"""
+    
+    def __init__(self, writers: List):
+        self.writers = writers
+    
+    @property
+    def row_count(self) -> int:
+        return self.writers[0].row_count
+    
+    def write(self, row: Tuple):
+        for writer in self.writers:
+            writer.write(row)
+    
+    def write_rows(self, rows: Iterable[Tuple]):
+        for row in rows:
+            for writer in self.writers:
+                writer.write(row)
+    
+    def write_columns(self, columns: List[List]):
+        for writer in self.writers:
+            writer.write_columns(columns)
+    
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_table_writer(table_name: str, directory: str = None, formats: Tuple[str, ...] = None):
+    """Writer for a final output table in every format of CONFIG['output_formats'] (or `formats`)"""
+    if not table_selected(table_name):
+        return SkippedTableWriter(table_name)
+    writers = [OUTPUT_WRITERS[fmt](table_name, directory) for fmt in formats or CONFIG['output_formats']]
+    return writers[0] if len(writers) == 1 else MultiFormatWriter(writers)
+
+def write_batch(writer, rows):
+    """Write a list of rows, or a ColumnBatch column by column (see TableWriter.write_columns)"""
+    if isinstance(rows, ColumnBatch):
+        writer.write_columns(rows)
+    else:
+        writer.write_rows(rows)
+
+def export_table(table_name: str, data: Iterable[Tuple], directory: str = None,
+                 formats: Tuple[str, ...] = None) -> int:
+    """Stream rows into a table's outputs; returns the number of rows written (0 for a table not selected)"""
+    formats = formats or CONFIG['output_formats']
+    with open_table_writer(table_name, directory, formats) as writer:
+        writer.write_rows(data)
+    
+    if isinstance(writer, SkippedTableWriter):
+        print(f"📋 {writer.generated_count} {table_name} rows generated for lookups, not written")
+    else:
+        print(f"📁 Exported {writer.row_count} rows to {table_name} ({', '.join(formats)})")
+    return writer.row_count
+
+def read_table_rows(table_name: str, directory: str = None) -> Iterator:
+    """Stream a finished table back from its CSV file(s), or its Parquet file for Parquet-only output"""
+    directory = directory or CONFIG['output_dir']
+    if 'csv' in CONFIG['output_formats']:
+        if csv_split_output():
+            return chain.from_iterable(map(read_csv_rows, csv_part_paths(table_name, directory)))
+        return read_csv_rows(os.path.join(directory, f'{table_name}.csv'))
+    return read_parquet_rows(os.path.join(directory, f'{table_name}.parquet'))
+
+def open_staging_writer(table_name: str, staging_dir: str):
+    """
+    Writer for a dimension table whose aggregate columns are only known after the orders.
+    
+    File outputs are staged as CSV and rewritten by finalize_staged_table; the
+    'postgres' output loads the rows right away (the orders reference them) and
+    gets the aggregate columns as an UPDATE.
+    """
+    if not table_selected(table_name):
+        return SkippedTableWriter(table_name)
+    writers = []
+    if file_output_formats():
+        writers.append(TableWriter(table_name, staging_dir))
+    if 'postgres' in CONFIG['output_formats']:
+        writers.append(PostgresCopyWriter(table_name))
+    return writers[0] if len(writers) == 1 else MultiFormatWriter(writers)
+
+def finalize_staged_table(table_name: str, staging_dir: str, update_row, first_index: int,
+                          stats: Dict[str, array], previous_count: int = 0):
+    """
+    Fill in a staged dimension table's denormalized columns in every output.
+    
+    The staged rows have entity indexes first_index, first_index + 1, ... and update_row
+    takes (row, index). `stats` holds this run's aggregates: in a delta run the entities
+    below `previous_count` among them were exported by an earlier run and get a
+    <table>_delta.csv row instead.
+    """
+    touched = [row[0] for row in aggregate_rows(stats)]
+    file_formats = file_output_formats()
+    if file_formats:
+        staged_path = os.path.join(staging_dir, f'{table_name}.csv')
+        make_row = ROW_TYPES[table_name]._make
+        export_table(table_name, (update_row(make_row(values), index)
+                                  for index, values in enumerate(read_csv_rows(staged_path), start=first_index)),
+                     formats=file_formats)
+        os.remove(staged_path)
+        if previous_count:
+            with TableWriter(f'{table_name}_delta') as writer:
+                writer.write_rows(aggregate_update_rows(
+                    table_name, (index for index in touched if index < previous_count), update_row))
+            print(f"📁 Exported {writer.row_count} updated {table_name} aggregates to {table_name}_delta")
+    
+    if 'postgres' in CONFIG['output_formats']:
+        # Only entities with orders differ from the values loaded with the staged rows
+        updated = _POSTGRES_LOADER['loader'].update_columns(
+            table_name, AGGREGATE_COLUMNS[table_name], aggregate_update_rows(table_name, touched, update_row))
+        print(f"🐘 Updated {updated} {table_name} rows with their aggregates")
+
+def generate_and_export_all(checkpoint: RunCheckpoint = None) -> Dict[str, int]:
+    """
+    Generate every table and stream rows to CSV as they are produced.
+    
+    Memory is bounded by the dimension lookups the order loop needs (delivery addresses and
+    cards per consumer, commodity prices, all indexed by entity index) plus the aggregate
+    accumulators, so it does not grow with the number of orders. Consumers, sellers and commodities are staged
+    without aggregates and rewritten once all orders have been generated.
+    
+    With CONFIG['delta_from'] set, the dimension lookups and aggregates are restored from
+    that run and only the new rows are written (see begin_delta_run).
+    CONFIG['tables'] and CONFIG['index_range'] restrict the run to some tables and rows (see TABLE SELECTION).
+    Completed phases are recorded in `checkpoint`; a checkpoint loaded with
+    RunCheckpoint.load skips them and continues with identical output.
+    Returns the row count per table.
+    """
+    checkpoint = checkpoint or RunCheckpoint(CONFIG['output_dir'])
+    RUN_METRICS.start(CONFIG['output_dir'], resumed=checkpoint.phase is not None)
+    if CONFIG['progress'] == 'tqdm' and not load_tqdm():
+        print("⚠️  tqdm not available, reporting progress as log lines. Install with: pip install tqdm")
+        CONFIG['progress'] = 'log'
+    written, generated = resolve_table_selection()
+    _TABLE_SELECTION['written'] = written
+    phases = {TABLE_PHASES[table] for table in generated}
+    phases.update(f'{table}_aggregates' for table in AGGREGATE_COLUMNS if table in written)
+    if CONFIG['tables']:
+        extra = generated - written
+        print(f"📋 Tables: {', '.join(table for table in TABLE_COLUMNS if table in written)}"
+              + (f" (also generating {', '.join(sorted(extra))} for their lookups)" if extra else ""))
+        if not CONFIG['base_run'] and len(generated) > len(CONFIG['tables']):
+            print(f"💡 Generating {len(generated)} tables for {len(CONFIG['tables'])}: "
+                  f"pass --base-run with a full run's output to regenerate only the requested tables")
+        without_orders = [table for table in AGGREGATE_COLUMNS
+                          if table in written and 'orders' not in generated and not CONFIG['base_run']]
+        if without_orders:
+            print(f"⚠️  No orders generated: the aggregate columns of {', '.join(without_orders)} stay at zero "
+                  f"(regenerate them with a base run to get its totals)")
+    
+    # The base run's generation settings apply before anything is drawn
+    state = None
+    if CONFIG['delta_from']:
+        state = begin_delta_run(CONFIG['delta_from'], reseed=checkpoint.phase is None)
+    elif CONFIG['base_run']:
+        state = begin_base_run(CONFIG['base_run'])
+    delta = state if CONFIG['delta_from'] else None
+    set_id_space(state['seed'] if state else CONFIG['seed'], delta_first_indexes(delta) if delta else None)
+    ranges = entity_index_ranges()
+    for key in ('address_per_consumer_range', 'cards_per_consumer_range', 'items_per_order_range'):
+        if CONFIG[key][1] > CHILD_ID_SLOTS:
+            raise ValueError(f"{key} allows {CONFIG[key][1]} rows per parent; at most {CHILD_ID_SLOTS} get distinct ids")
+    
+    if CONFIG['engine'] == 'numpy' and not load_numpy():
+        print("⚠️  numpy not available, falling back to the python engine. Install with: pip install numpy")
+        CONFIG['engine'] = 'python'
+    
+    if 'parquet' in CONFIG['output_formats'] and not load_pyarrow():
+        print("⚠️  pyarrow not available, writing CSV only. Install with: pip install pyarrow")
+        CONFIG['output_formats'] = tuple(fmt for fmt in CONFIG['output_formats'] if fmt != 'parquet') or ('csv',)
+    
+    if CONFIG['csv_compression'] not in CSV_COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown csv_compression {CONFIG['csv_compression']!r}; "
+                         f"expected one of {', '.join(CSV_COMPRESSION_SUFFIXES)}")
+    if CONFIG['csv_compression'] == 'zstd' and not ZSTANDARD_AVAILABLE:
+        print("⚠️  zstandard not available, compressing CSV parts with gzip. Install with: pip install zstandard")
+        CONFIG['csv_compression'] = 'gzip'
+    
+    if 'postgres' in CONFIG['output_formats'] and not open_postgres_loader():
+        formats = tuple(fmt for fmt in CONFIG['output_formats'] if fmt != 'postgres')
+        if not formats:
+            print("❌ PostgreSQL not reachable and postgres is the only output format; "
+                  "check the connection settings or add --formats csv")
+            sys.exit(1)
+        print(f"⚠️  PostgreSQL not reachable, skipping the postgres output (writing {', '.join(formats)} only)")
+        CONFIG['output_formats'] = formats
+    
+    if CONFIG['faker_pool_size']:
+        FAKER_POOLS.clear()
+        FAKER_POOLS.update(load_or_build_faker_pools(CONFIG['faker_pool_size'], CONFIG['seed'], CONFIG['faker_locale']))
+    
+    output_dir = CONFIG['output_dir']
+    staging_dir = os.path.join(output_dir, '.staging')
+    _INLINE_VALIDATION['validator'] = None
+    if CONFIG['inline_validation']:
+        if 'csv' in CONFIG['output_formats'] and not csv_split_output():
+            _INLINE_VALIDATION['validator'] = InlineValidator(output_dir, checkpoint.progress.get('validation'))
+        else:
+            print("⚠️  Inline validation needs single uncompressed CSV files, skipping it "
+                  "(validate_csv.py checks the parts afterwards)")
+    if file_output_formats():
+        os.makedirs(staging_dir, exist_ok=True)
+    if checkpoint.phase is not None:
+        print(f"⏩ Resuming {output_dir} after the {checkpoint.phase} phase")
+        checkpoint.restore_random_state()
+    elif CONFIG['checkpoints'] and 'postgres' in CONFIG['output_formats']:
+        print("⚠️  Checkpoints are off with the postgres output (a resumed run cannot rewind the database)")
+    checkpoint.enabled = (CONFIG['checkpoints'] and bool(file_output_formats())
+                          and 'postgres' not in CONFIG['output_formats'])
+    counts = dict(checkpoint.progress['counts'])
+    # Entities up to the end of each range exist once the run is done (lookups are indexed by them)
+    consumer_count, seller_count = ranges['consumers'][1], ranges['sellers'][1]
+    
+    def done(phase: str) -> bool:
+        """Whether a phase completed before a resume, or is not needed by the table selection"""
+        return phase not in phases or checkpoint.done(phase)
+    
+    def saved_lookups(phase: str) -> Dict:
+        """Lookups of a completed phase, or the previous run's (to extend in a delta run)"""
+        return checkpoint.lookups(phase) if phase in phases and checkpoint.done(phase) else (state or {})
+    
+    # A base run's lookups are complete already: the rows it regenerates are not added again
+    extend_lookups = delta is not None or state is None
+    
+    # Step 1: Generate verticals (persistent; a delta run keeps the previous run's)
+    if done('verticals'):
+        verticals = [VerticalRow._make(vertical) for vertical in saved_lookups('verticals').get('verticals', [])]
+    else:
+        if state:
+            verticals = [VerticalRow._make(vertical) for vertical in state['verticals']]
+        else:
+            verticals = load_or_generate_verticals()
+        counts['verticals'] = export_table('verticals', () if delta else verticals[slice(*ranges['verticals'])])
+        checkpoint.save('verticals', counts, verticals=[tuple(vertical) for vertical in verticals])
+    add_validation_ids('verticals', (vertical.id for vertical in verticals))
+    
+    # Step 2: Generate users and profiles (after the previous run's in a delta run)
+    if not done('users'):
+        with open_table_writer('users') as users_writer:
+            with open_staging_writer('consumers', staging_dir) as consumers_writer:
+                for user, consumer in generate_users_and_consumers(*ranges['consumers']):
+                    users_writer.write(user)
+                    consumers_writer.write(consumer)
+            counts['consumers'] = consumers_writer.row_count
+            
+            with open_staging_writer('sellers', staging_dir) as sellers_writer:
+                for user, seller in generate_sellers(*ranges['sellers']):
+                    users_writer.write(user)
+                    sellers_writer.write(seller)
+            counts['sellers'] = sellers_writer.row_count
+        counts['users'] = users_writer.row_count
+        checkpoint.save('users', counts)
+    # Consumers and sellers are staged until the aggregates are known: their ids are derived
+    add_validation_ids('consumers', (entity_uuid('consumers', index) for index in range(consumer_count)))
+    add_validation_ids('sellers', (entity_uuid('sellers', index) for index in range(seller_count)))
+    
+    # Step 3: Generate related data, keeping only the lookups later steps need
+    # Parent -> child lookups are CSR indexes (see AdjacencyIndex), extended as the children are written
+    seller_to_verticals = AdjacencyIndex.restore(saved_lookups('seller_vertical').get('seller_to_verticals'))
+    if not done('seller_vertical'):
+        with open_table_writer('seller_vertical') as writer:
+            for seller, vertical, rel in generate_seller_verticals(verticals, *ranges['sellers']):
+                writer.write(rel)
+                if extend_lookups:
+                    seller_to_verticals.add(seller, vertical)
+        counts['seller_vertical'] = writer.row_count
+        checkpoint.save('seller_vertical', counts, seller_to_verticals=seller_to_verticals.snapshot())
+    seller_to_verticals.pad(seller_count)
+    
+    consumer_addresses = AdjacencyIndex.restore(saved_lookups('address_books').get('consumer_addresses'),
+                                                DeliveryAddress)
+    if not done('address_books'):
+        # The orders' delivery columns read the address text too
+        address_text = table_selected('address_books') or table_selected('orders')
+        with faker_text(address_text), open_table_writer('address_books') as writer:
+            for consumer, address in generate_address_books(*ranges['consumers']):
+                writer.write(address)
+                if extend_lookups:
+                    consumer_addresses.add(consumer, DeliveryAddress(
+                        address.address_line_1, address.postal_code, address.receiver_name, address.phone,
+                        address.city, address.country, address.latitude, address.longitude))
+        counts['address_books'] = writer.row_count
+        checkpoint.save('address_books', counts, consumer_addresses=consumer_addresses.snapshot())
+    consumer_addresses.pad(consumer_count)
+    
+    commodity_prices = [CommodityPrice._make(price)
+                        for price in saved_lookups('commodities').get('commodity_prices', [])]
+    if not done('commodities'):
+        with faker_text(table_selected('commodities')), open_staging_writer('commodities', staging_dir) as writer:
+            for commodity in generate_commodities(verticals, seller_to_verticals, *ranges['commodities']):
+                writer.write(commodity)
+                if extend_lookups:
+                    commodity_prices.append(CommodityPrice(commodity.price, commodity.cost_price))
+        counts['commodities'] = writer.row_count
+        checkpoint.save('commodities', counts, commodity_prices=[tuple(price) for price in commodity_prices])
+    add_validation_ids('commodities', (entity_uuid('commodities', index) for index in range(len(commodity_prices))))
+    
+    # Card indexes (consumer index * CHILD_ID_SLOTS + position) per consumer
+    consumer_cards = AdjacencyIndex.restore(saved_lookups('cards').get('consumer_cards'))
+    if not done('cards'):
+        with faker_text(table_selected('cards')), open_table_writer('cards') as writer:
+            for consumer, card in generate_cards(*ranges['consumers']):
+                writer.write(card)
+                if extend_lookups:
+                    consumer_cards.add(consumer, consumer * CHILD_ID_SLOTS + consumer_cards.count(consumer))
+        counts['cards'] = writer.row_count
+        checkpoint.save('cards', counts, consumer_cards=consumer_cards.snapshot())
+    consumer_cards.pad(consumer_count)
+    add_validation_ids('cards', (entity_uuid('cards', card) for card in consumer_cards.values))
+    
+    # Step 4: Generate orders and related data, one shard at a time
+    fact_tables = ('orders', 'order_commodities', 'transactions', 'reviews')
+    sizes = {'consumers': consumer_count, 'sellers': seller_count, 'commodities': ranges['commodities'][1]}
+    if done('orders'):
+        aggregates = restore_order_aggregates(saved_lookups('orders').get('aggregates', {}), sizes)
+    else:
+        aggregates = new_order_aggregates(sizes)
+        first_shard = (ranges['orders'][0] - block_origin('orders')) // CONFIG['order_shard_size']
+        progress = checkpoint.progress.get('orders') if order_shards_resumable() else None
+        if progress:
+            # Continue after the last checkpointed shard: its rows are already in the files
+            first_shard = progress['next_shard']
+            aggregates = restore_order_aggregates(progress['aggregates'], sizes)
+            writers = [TableWriter(table, offset=size) if table_selected(table) else SkippedTableWriter(table)
+                       for table, size in zip(fact_tables, progress['sizes'])]
+            for writer, row_count in zip(writers, progress['row_counts']):
+                writer.row_count = row_count
+            print(f"⏩ Continuing the orders at shard {first_shard}")
+        else:
+            writers = [open_table_writer(table) for table in fact_tables]
+        try:
+            batches = generate_orders_and_related(seller_count, commodity_prices, consumer_cards, consumer_addresses,
+                                                  aggregates, first_shard, ranges['orders'])
+            for shard_index, batch in enumerate(batches, start=first_shard):
+                for writer, rows in zip(writers, batch):
+                    write_batch(writer, rows)
+                if order_shards_resumable() and (shard_index + 1) % CONFIG['checkpoint_shards'] == 0:
+                    checkpoint.save_orders(shard_index + 1, aggregates, writers)
+        finally:
+            for writer in writers:
+                writer.close()
+        for table, writer in zip(fact_tables, writers):
+            counts[table] = writer.row_count
+            if table_selected(table):
+                print(f"✅ Created {writer.row_count} {table} rows")
+        checkpoint.save('orders', counts, aggregates=aggregates)
+    
+    # Step 5: Rewrite the staged dimension tables with the denormalized aggregates
+    # (cumulative over the previous runs in a delta run)
+    print("📊 Updating denormalized aggregates...")
+    totals = aggregates
+    previous_counts = {'consumers': 0, 'sellers': 0, 'commodities': 0}
+    if delta:
+        totals = restore_order_aggregates(delta['aggregates'], sizes)
+        merge_order_stats(totals, *(aggregate_rows(aggregates[table]) for table in AGGREGATE_FIELDS))
+        previous_counts = {table: first for table, first in delta_first_indexes(delta).items() if table in sizes}
+    elif state:
+        # Tables regenerated against a base run get that run's totals
+        aggregates = totals = restore_order_aggregates(state['aggregates'], sizes)
+    apply_aggregates = {
+        'consumers': apply_consumer_aggregates,
+        'sellers': apply_seller_aggregates,
+        'commodities': apply_commodity_aggregates,
+    }
+    for table, apply in apply_aggregates.items():
+        if done(f'{table}_aggregates'):
+            continue
+        finalize_staged_table(table, staging_dir, lambda row, index: apply(row, index, totals[table]),
+                              ranges[table][0], aggregates[table], previous_counts[table])
+        checkpoint.save(f'{table}_aggregates', counts)
+    if file_output_formats():
+        os.rmdir(staging_dir)
+    close_postgres_loader()
+    
+    os.makedirs(output_dir, exist_ok=True)
+    # A table subset's lookups are incomplete: it cannot be the base of a delta or base run
+    if not CONFIG['tables']:
+        save_generation_state(output_dir, {
+            'seed': state['seed'] if state else CONFIG['seed'],
+            'reference_time': run_reference_time(),
+            'config': {key: CONFIG[key] for key in STATE_CONFIG_KEYS},
+            # The full run's volumes, which every later delta run scales to its window
+            'base_volumes': delta['base_volumes'] if delta else {key: CONFIG[key] for key in DELTA_VOLUME_DAYS},
+            'verticals': [tuple(vertical) for vertical in verticals],
+            'consumer_count': consumer_count,
+            'seller_count': seller_count,
+            'order_count': ranges['orders'][1],
+            'seller_to_verticals': seller_to_verticals.snapshot(),
+            'consumer_addresses': consumer_addresses.snapshot(),
+            'consumer_cards': consumer_cards.snapshot(),
+            'commodity_prices': [tuple(price) for price in commodity_prices],
+            'aggregates': totals,
+        })
+    finish_inline_validation()
+    checkpoint.clear()
+    
+    if 'csv' in CONFIG['output_formats'] and csv_split_output():
+        script_path = write_manifest_copy_script(output_dir)
+        print(f"📝 COPY script for the manifests: {script_path}")
+    RUN_METRICS.phase_done('finalize', rows=0)
+    
+    print(f"\n✅ All data exported to '{output_dir}' directory")
+    return {table: count for table, count in counts.items() if table_selected(table)}
+
+def generate_index_range(tables: List[str], start: int, end: int, base_run: str = None,
+                         output_dir: str = None) -> Dict[str, int]:
+    """
+    Write the rows of entity indexes start..end-1 of `tables` (all indexed by the same entity,
+    see RANGE_KEYS), byte-identical to those rows of a full run with the same settings, or of
+    `base_run` (whose settings, lookups and aggregate totals are reused). Returns the row counts.
+    """
+    CONFIG.update(tables=list(tables), index_range=(start, end), base_run=base_run)
+    if output_dir:
+        CONFIG['output_dir'] = output_dir
+    return generate_and_export_all()
+
+# ============================================================================
+# POSTGRESQL INSERTION
+# ============================================================================
+
+def get_postgres_connection():
+    """Connect to PostgreSQL"""
+    if not load_psycopg2():
+        print("❌ PostgreSQL insertion skipped - psycopg2 not available")
+        return None
+    
+    try:
+        conn = psycopg2.connect(**CONFIG['postgres'])
+        print(f"✅ Connected to PostgreSQL: {CONFIG['postgres']['database']}")
+        return conn
+    except Exception as e:
+        print(f"❌ PostgreSQL connection failed: {e}")
+        return None
+
+# Foreign key parents of every table (sql/create_schema.sql); a table is loaded
+# once all of its parents are committed, tables without a path between them in parallel
+TABLE_DEPENDENCIES = {
+    'users': (),
+    'consumers': ('users',),
+    'sellers': ('users',),
+    'verticals': (),
+    'seller_vertical': ('sellers', 'verticals'),
+    'address_books': ('consumers',),
+    'cards': ('consumers',),
+    'commodities': ('sellers', 'verticals'),
+    'orders': ('consumers', 'sellers'),
+    'order_commodities': ('orders', 'commodities'),
+    'transactions': ('orders', 'cards'),
+    'reviews': ('orders', 'commodities', 'consumers', 'sellers'),
+}
+
+class TableLoadScheduler:
+    """
+    Load finished tables into PostgreSQL over a shared connection pool.
+    
+    Tables start as soon as their TABLE_DEPENDENCIES are committed, up to
+    `workers` at a time. A table with more than `chunk_rows` rows is read once
+    and its row blocks are spread over several connections, each COPYing and
+    committing its own chunk (a failed chunk does not undo the others). Tables
+    that reference a table whose load failed are skipped.
+    """
+    
+    BLOCK_ROWS = 10000
+    
+    def __init__(self, pool, workers: int = None, chunk_rows: int = None):
+        self.pool = pool
+        self.workers = workers or CONFIG['postgres_load_workers']
+        self.chunk_rows = chunk_rows or CONFIG['postgres_chunk_rows']
+        self.results = {}
+        self._connections = threading.BoundedSemaphore(self.workers)
+    
+    def _connection(self):
+        # ThreadedConnectionPool raises instead of waiting when it is exhausted
+        self._connections.acquire()
+        return self.pool.getconn()
+    
+    def _release(self, conn):
+        self.pool.putconn(conn)
+        self._connections.release()
+    
+    def _load_rows(self, table_name: str, rows: Iterable[Tuple]) -> Tuple[int, str]:
+        """COPY rows into one table over one pooled connection; (rows, error)"""
+        conn = self._connection()
+        try:
+            loader = PostgresCopyLoader(conn, report_errors=False)
+            loader.write_rows(table_name, rows)
+            loader.flush()
+            if table_name in loader.failed:
+                conn.rollback()
+                return 0, loader.failed[table_name]
+            loader.commit()
+            return loader.row_counts[table_name], None
+        except Exception as e:
+            conn.rollback()
+            return 0, str(e)
+        finally:
+            self._release(conn)
+    
+    def _load_chunked(self, table_name: str, rows: Iterable[Tuple], chunks: int) -> Tuple[int, str]:
+        """Read a table once and COPY its row blocks over `chunks` connections"""
+        blocks = queue.Queue(maxsize=chunks * 2)
+        results = []
+        
+        def worker():
+            exhausted = False
+            def chunk_rows():
+                nonlocal exhausted
+                while True:
+                    block = blocks.get()
+                    if block is None:
+                        exhausted = True
+                        return
+                    yield from block
+            count, error = self._load_rows(table_name, chunk_rows())
+            # A chunk that stopped early still takes its share so the reader never blocks
+            if not exhausted:
+                while blocks.get() is not None:
+                    pass
+            results.append((count, error))
+        
+        threads = [threading.Thread(target=worker, name=f'{table_name}-chunk{i}') for i in range(chunks)]
+        for thread in threads:
+            thread.start()
+        rows = iter(rows)
+        try:
+            while True:
+                block = list(islice(rows, self.BLOCK_ROWS))
+                if not block:
+                    break
+                blocks.put(block)
+        finally:
+            for _ in threads:
+                blocks.put(None)
+        for thread in threads:
+            thread.join()
+        
+        errors = [error for _, error in results if error]
+        return sum(count for count, _ in results), errors[0] if errors else None
+    
+    def _load_table(self, table_name: str, rows: Iterable[Tuple], expected_rows: int) -> bool:
+        chunks = max(1, min(self.workers, expected_rows // self.chunk_rows))
+        started = datetime.now()
+        if chunks > 1:
+            count, error = self._load_chunked(table_name, rows, chunks)
+        else:
+            count, error = self._load_rows(table_name, rows)
+        seconds = (datetime.now() - started).total_seconds()
+        self.results[table_name] = {'rows': count, 'seconds': seconds, 'chunks': chunks, 'error': error}
+        RUN_METRICS.table_loaded(table_name, count, seconds, chunks, error)
+        
+        if error:
+            print(f"❌ Error inserting into {table_name}: {error}")
+        elif count:
+            rate = count / seconds if seconds else 0
+            chunk_note = f", {chunks} chunks" if chunks > 1 else ""
+            print(f"✅ Inserted {count} rows into {table_name} in {seconds:.2f}s ({rate:,.0f} rows/s{chunk_note})")
+        else:
+            print(f"⚠️  Skipping {table_name} - no data")
+        return error is None
+    
+    def run(self, read_rows, row_counts: Dict[str, int]):
+        """
+        Load the tables of row_counts in TABLE_DEPENDENCIES order; read_rows(table) streams a table's rows.
+        Parents outside row_counts (a table subset) must already be in the database.
+        """
+        pending = {table: tuple(parent for parent in parents if parent in row_counts)
+                   for table, parents in TABLE_DEPENDENCIES.items() if table in row_counts}
+        done = set()
+        failed = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for table_name, parents in list(pending.items()):
+                    if any(parent in failed for parent in parents):
+                        print(f"⚠️  Skipping {table_name} - a table it references failed to load")
+                        failed.add(table_name)
+                        del pending[table_name]
+                    elif all(parent in done for parent in parents):
+                        future = executor.submit(self._load_table, table_name, read_rows(table_name),
+                                                 row_counts.get(table_name, 0))
+                        running[future] = table_name
+                        del pending[table_name]
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    table_name = running.pop(future)
+                    (done if future.result() else failed).add(table_name)
+        return self.results
+
+def load_tables_into_postgres(read_rows, row_counts: Dict[str, int]):
+    """Insert every exported table into PostgreSQL with the TableLoadScheduler"""
+    if not load_psycopg2():
+        print("❌ PostgreSQL insertion skipped - psycopg2 not available")
+        return
+    
+    workers = CONFIG['postgres_load_workers']
+    try:
+        pool = ThreadedConnectionPool(1, workers, **CONFIG['postgres'])
+    except Exception as e:
+        print(f"❌ PostgreSQL connection failed: {e}")
+        return
+    print(f"✅ Connected to PostgreSQL: {CONFIG['postgres']['database']} ({workers} pooled connections)")
+    
+    started = datetime.now()
+    try:
+        results = TableLoadScheduler(pool, workers).run(read_rows, row_counts)
+    finally:
+        pool.closeall()
+    seconds = (datetime.now() - started).total_seconds()
+    total = sum(result['rows'] for result in results.values())
+    RUN_METRICS.phase_done('postgres_load', rows=total)
+    print(f"🐘 Loaded {total} rows in {seconds:.2f}s ({total / seconds if seconds else 0:,.0f} rows/s overall)")
+
+def apply_delta_files(directory: str = None):
+    """Update the rows loaded by earlier runs with a delta run's <table>_delta.csv aggregates"""
+    directory = directory or CONFIG['output_dir']
+    conn = get_postgres_connection()
+    if conn is None:
+        return
+    loader = PostgresCopyLoader(conn)
+    for table_name, columns in AGGREGATE_COLUMNS.items():
+        path = os.path.join(directory, f'{table_name}_delta.csv')
+        if os.path.exists(path):
+            updated = loader.update_columns(table_name, columns, read_csv_rows(path))
+            print(f"🐘 Updated {updated} {table_name} rows from {table_name}_delta")
+    loader.close()
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+# Volumes multiplied by --scale-factor (scale factor 1 = the CONFIG volumes)
+SCALED_VOLUMES = ('num_consumers', 'num_sellers', 'num_commodities', 'num_orders')
+
+def apply_scale_factor(scale_factor: float):
+    """Scale the CONFIG volumes, keeping at least one row of each"""
+    for key in SCALED_VOLUMES:
+        CONFIG[key] = max(1, round(CONFIG[key] * scale_factor))
+
+def parse_index_range(text: str) -> Tuple[int, int]:
+    """'START:END' -> (start, end) for --range"""
+    start, sep, end = text.partition(':')
+    try:
+        index_range = (int(start), int(end)) if sep else None
+    except ValueError:
+        index_range = None
+    if index_range is None or not 0 <= index_range[0] < index_range[1]:
+        raise argparse.ArgumentTypeError(f"expected START:END with 0 <= START < END, got {text!r}")
+    return index_range
+
+def parse_reference_time(text: str) -> str:
+    """'YYYY-MM-DD HH:MM:SS' for --reference-time (checked here, not when the run starts)"""
+    try:
+        datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected 'YYYY-MM-DD HH:MM:SS', got {text!r}")
+    return text
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the e-commerce simulator data set (defaults: see CONFIG)")
+    parser.add_argument('--resume', metavar='OUTPUT_DIR',
+                        help="continue an interrupted run from the last checkpoint in OUTPUT_DIR "
+                             "(with the settings of that run)")
+    
+    generation = parser.add_argument_group('generation')
+    generation.add_argument('--scale-factor', type=float, metavar='SF',
+                            help="multiply the consumer, seller, commodity and order volumes by SF")
+    generation.add_argument('--tables', nargs='+', metavar='TABLE', choices=list(TABLE_COLUMNS),
+                            help="write only these tables and the parent tables their foreign keys reference; "
+                                 "the tables they are drawn from are still generated, without the text and "
+                                 "rows nobody reads (an order table still runs the order loop's draws), so "
+                                 "--base-run makes a subset faster still")
+    generation.add_argument('--base-run', metavar='OUTPUT_DIR',
+                            help="regenerate the tables given with --tables against the lookups and "
+                                 "settings of an earlier full run in OUTPUT_DIR, skipping the tables "
+                                 "they would otherwise be generated with")
+    generation.add_argument('--range', type=parse_index_range, metavar='START:END', dest='index_range',
+                            help="write only the rows of entity indexes START..END-1 of the --tables "
+                                 "(orders for the order tables, consumers for address_books/cards, ...)")
+    generation.add_argument('--delta-from', metavar='OUTPUT_DIR',
+                            help="generate a delta run continuing the run in OUTPUT_DIR: new rows only, "
+                                 "dated within --delta-window-days of the reference time (fix it with "
+                                 "--reference-time to reproduce the delta)")
+    generation.add_argument('--delta-window-days', type=int, metavar='N', help="days a delta run covers")
+    generation.add_argument('--delta-volumes', type=int, nargs=3, metavar=('CONSUMERS', 'COMMODITIES', 'ORDERS'),
+                            help="new rows of a delta run (default: the base run's volumes scaled to the window)")
+    generation.add_argument('--seed', type=int, help="random seed")
+    generation.add_argument('--reference-time', type=parse_reference_time, metavar="'YYYY-MM-DD HH:MM:SS'",
+                            help="instant every timestamp is relative to (default: now); fix it to "
+                                 "reproduce a run's rows")
+    generation.add_argument('--engine', choices=('python', 'numpy'), help="generation engine")
+    generation.add_argument('--workers', type=int, metavar='N', help="processes generating the orders")
+    generation.add_argument('--faker-pool-size', type=int, metavar='N',
+                            help="sample Faker text from pools of N values per provider (0: call Faker per row)")
+    
+    output = parser.add_argument_group('output')
+    output.add_argument('--output-dir', metavar='DIR', help="directory for the output files")
+    output.add_argument('--formats', nargs='+', choices=list(OUTPUT_WRITERS), help="output formats")
+    output.add_argument('--csv-compression', choices=list(CSV_COMPRESSION_SUFFIXES),
+                        help="compress the CSV files (splits them into parts with COPY manifests)")
+    output.add_argument('--csv-parts', type=int, metavar='N', help="split every CSV file into N parts")
+    output.add_argument('--csv-part-target-mb', type=float, metavar='MB',
+                        help="split the CSV files into parts of about MB megabytes")
+    output.add_argument('--parquet-row-group-size', type=int, metavar='ROWS', help="rows per Parquet row group")
+    output.add_argument('--parquet-compression', choices=('snappy', 'gzip', 'zstd', 'lz4', 'brotli', 'none'),
+                        help="Parquet compression codec")
+    output.add_argument('--inline-validation', action='store_true',
+                        help="validate the CSV rows while writing them (validation_report.json)")
+    output.add_argument('--metrics-file', metavar='PATH',
+                        help="write run metrics as JSON lines (or Prometheus text for *.prom)")
+    output.add_argument('--profile', action='store_true', help="dump a cProfile of every phase")
+    output.add_argument('--progress', choices=('log', 'tqdm', 'none'), help="progress display")
+    
+    loader = parser.add_argument_group('PostgreSQL loading')
+    loader.add_argument('--no-load', action='store_true',
+                        help="do not insert the exported files into PostgreSQL")
+    loader.add_argument('--copy-format', choices=('text', 'binary'), help="COPY format")
+    loader.add_argument('--load-workers', type=int, metavar='N', help="pooled connections loading tables")
+    
+    args = parser.parse_args(argv)
+    if args.base_run and not args.tables:
+        parser.error("--base-run needs --tables")
+    if args.index_range and not args.tables:
+        parser.error("--range needs --tables")
+    if args.delta_from and args.base_run:
+        parser.error("--delta-from and --base-run cannot be combined")
+    if args.delta_volumes and not args.delta_from:
+        parser.error("--delta-volumes needs --delta-from")
+    if args.reference_time and args.base_run:
+        parser.error("--reference-time and --base-run cannot be combined (a base run keeps its reference time)")
+    return args
+
+def apply_args(args: argparse.Namespace):
+    """Put the command-line settings into CONFIG (a resumed run keeps its own generation settings)"""
+    if not args.resume:
+        if args.scale_factor is not None:
+            apply_scale_factor(args.scale_factor)
+        if args.seed is not None:
+            CONFIG['seed'] = args.seed
+            random.seed(args.seed)
+            load_faker()
+            Faker.seed(args.seed)
+        settings = {
+            'tables': args.tables, 'base_run': args.base_run, 'index_range': args.index_range,
+            'delta_from': args.delta_from, 'delta_window_days': args.delta_window_days,
+            'delta_volumes': dict(zip(DELTA_VOLUME_DAYS, args.delta_volumes)) if args.delta_volumes else None,
+            'reference_time': args.reference_time, 'engine': args.engine, 'faker_pool_size': args.faker_pool_size,
+            'order_workers': args.workers, 'output_dir': args.output_dir,
+            'output_formats': tuple(args.formats) if args.formats else None,
+            'csv_compression': args.csv_compression, 'csv_parts': args.csv_parts,
+            'csv_part_target_mb': args.csv_part_target_mb,
+            'parquet_row_group_size': args.parquet_row_group_size,
+            'parquet_compression': args.parquet_compression,
+            'inline_validation': args.inline_validation or None,
+        }
+        CONFIG.update((key, value) for key, value in settings.items() if value is not None)
+    settings = {
+        'metrics_file': args.metrics_file, 'profile': args.profile or None, 'progress': args.progress,
+        'postgres_copy_format': args.copy_format, 'postgres_load_workers': args.load_workers,
+        'load_into_postgres': False if args.no_load else None,
+    }
+    CONFIG.update((key, value) for key, value in settings.items() if value is not None)
+
+def main(argv: List[str] = None):
+    """Main execution flow"""
+    args = parse_args(argv)
+    apply_args(args)
+    checkpoint = RunCheckpoint.load(args.resume) if args.resume else None
+    if checkpoint is not None:
+        apply_args(args)
+    
+    print("=" * 60)
+    print("🚀 E-COMMERCE DATA GENERATOR")
+    print("=" * 60)
+    print(f"Output directory: {CONFIG['output_dir']}")
+    print(f"Delimiter: '{CONFIG['delimiter']}'")
+    print(f"Output formats: {', '.join(CONFIG['output_formats'])}")
+    if 'csv' in CONFIG['output_formats'] and csv_split_output():
+        parts = (f"~{CONFIG['csv_part_target_mb']} MB parts" if CONFIG['csv_part_target_mb'] > 0
+                 else f"{CONFIG['csv_parts']} parts")
+        print(f"CSV split: {parts}, {CONFIG['csv_compression']} compression, manifests for {CONFIG['csv_s3_prefix']}")
+    if not CONFIG['delta_from']:
+        # A delta run prints its new-row volumes once it has read the earlier run's state
+        print(f"Consumers: {CONFIG['num_consumers']}")
+        print(f"Sellers: {CONFIG['num_sellers']}")
+        print(f"Commodities: {CONFIG['num_commodities']}")
+        print(f"Orders: {CONFIG['num_orders']}")
+    print(f"Engine: {CONFIG['engine']}")
+    print(f"Reference time: {format_timestamp(run_reference_time())}")
+    if CONFIG['delta_from']:
+        print(f"Delta from: {CONFIG['delta_from']} (last {CONFIG['delta_window_days']} day(s); new rows only)")
+    if CONFIG['tables']:
+        print(f"Tables: {', '.join(CONFIG['tables'])}"
+              + (f" (indexes {CONFIG['index_range'][0]}:{CONFIG['index_range'][1]})" if CONFIG['index_range'] else "")
+              + (f" (base run {CONFIG['base_run']})" if CONFIG['base_run'] else ""))
+    print("=" * 60)
+    
+    # Steps 1-5: Generate all tables, streaming rows to every output
+    counts = generate_and_export_all(checkpoint)
+    
+    # Step 6: Insert into PostgreSQL, streaming rows back from the exported files
+    # (the 'postgres' output format already loaded them with COPY while generating)
+    # IMPORTANT: TABLE_DEPENDENCIES orders the loads for the foreign keys
+    if CONFIG['load_into_postgres'] and 'postgres' not in CONFIG['output_formats']:
+        print("=" * 60)
+        print("🔄 INSERTING DATA INTO POSTGRESQL...")
+        print("=" * 60)
+        
+        load_tables_into_postgres(read_table_rows, counts)
+        if CONFIG['delta_from']:
+            apply_delta_files()
+    RUN_METRICS.finish(counts)
     
     # Summary
     print("\n" + "=" * 60)
     print("🎉 DATA GENERATION COMPLETED!")
     print("=" * 60)
-    print(f"📁 CSV files: {CONFIG['output_dir']}/")
+    if file_output_formats():
+        print(f"📁 Output files ({', '.join(file_output_formats())}): {CONFIG['output_dir']}/")
+    if 'postgres' in CONFIG['output_formats']:
+        print(f"🐘 Loaded into PostgreSQL: {CONFIG['postgres']['database']}")
     print(f"📊 Total records generated:")
-    print(f"   - Users: {len(all_users)}")
-    print(f"   - Consumers: {len(consumers)}")
-    print(f"   - Sellers: {len(sellers)}")
-    print(f"   - Verticals: {len(verticals)}")
-    print(f"   - Seller-Verticals: {len(seller_verticals)}")
-    print(f"   - Address Books: {len(address_books)}")
-    print(f"   - Commodities: {len(commodities)}")
-    print(f"   - Cards: {len(cards)}")
-    print(f"   - Orders: {len(orders)}")
-    print(f"   - Order Items: {len(order_commodities)}")
-    print(f"   - Transactions: {len(transactions)}")
-    print(f"   - Reviews: {len(reviews)}")
+    labels = {
+        'users': 'Users', 'consumers': 'Consumers', 'sellers': 'Sellers', 'verticals': 'Verticals',
+        'seller_vertical': 'Seller-Verticals', 'address_books': 'Address Books', 'commodities': 'Commodities',
+        'cards': 'Cards', 'orders': 'Orders', 'order_commodities': 'Order Items',
+        'transactions': 'Transactions', 'reviews': 'Reviews',
+    }
+    for table, label in labels.items():
+        if table in counts:
+            print(f"   - {label}: {counts[table]}")
     print("=" * 60)
 
 if __name__ == '__main__':
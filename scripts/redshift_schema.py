@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Column definitions parsed from sql/redshift_schema.sql (and sql/create_schema.sql for PostgreSQL)
+Used by the exporters and loaders that need real column types (e.g. Parquet output, binary COPY)
+"""
+
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sql')
+DEFAULT_SCHEMA_FILE = os.path.join(SQL_DIR, 'redshift_schema.sql')
+POSTGRES_SCHEMA_FILE = os.path.join(SQL_DIR, 'create_schema.sql')
+
+# One column of a CREATE TABLE statement.
+# type is the base SQL type (VARCHAR, TEXT, INTEGER, NUMERIC, TIMESTAMP, DATE, BOOLEAN, UUID,
+# or a user-defined enum name such as ORDER_STATUS), upper-cased;
+# length is set for VARCHAR/CHAR, precision/scale for NUMERIC/DECIMAL.
+ColumnSpec = namedtuple('ColumnSpec', ['name', 'type', 'length', 'precision', 'scale', 'nullable'])
+
+_TABLE_RE = re.compile(r'CREATE TABLE\s+"?(\w+)"?\s*\((.*?)\n\)', re.DOTALL | re.IGNORECASE)
+_COLUMN_RE = re.compile(r'^\s*"?(\w+)"?\s+"?([A-Z_]\w*)"?(?:\s*\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?(.*)$', re.IGNORECASE)
+_CONSTRAINT_WORDS = {'PRIMARY', 'FOREIGN', 'UNIQUE', 'CONSTRAINT', 'CHECK'}
+
+def parse_redshift_schema(sql: str) -> Dict[str, List[ColumnSpec]]:
+    """Parse CREATE TABLE statements into {table: [ColumnSpec, ...]} in declaration order"""
+    tables = {}
+    for table_name, body in _TABLE_RE.findall(sql):
+        columns = []
+        for line in body.splitlines():
+            line = line.split('--', 1)[0].strip().rstrip(',')
+            if not line:
+                continue
+            match = _COLUMN_RE.match(line)
+            if not match or match.group(1).upper() in _CONSTRAINT_WORDS:
+                continue
+            name, sql_type, first, second, rest = match.groups()
+            sql_type = sql_type.upper()
+            length = precision = scale = None
+            if sql_type in ('NUMERIC', 'DECIMAL'):
+                precision = int(first) if first else 18
+                scale = int(second) if second else 0
+            elif first:
+                length = int(first)
+            nullable = 'NOT NULL' not in rest.upper()
+            columns.append(ColumnSpec(name, sql_type, length, precision, scale, nullable))
+        tables[table_name] = columns
+    return tables
+
+def load_redshift_schema(path: str = None) -> Dict[str, List[ColumnSpec]]:
+    """Read and parse the Redshift DDL file (defaults to sql/redshift_schema.sql)"""
+    with open(path or DEFAULT_SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        return parse_redshift_schema(f.read())
+
+def load_postgres_schema(path: str = None) -> Dict[str, List[ColumnSpec]]:
+    """Read and parse the PostgreSQL DDL file (defaults to sql/create_schema.sql)"""
+    return load_redshift_schema(path or POSTGRES_SCHEMA_FILE)
+
+if __name__ == '__main__':
+    for table, columns in load_redshift_schema().items():
+        print(f"{table}:")
+        for column in columns:
+            sql_type = column.type
+            if column.precision:
+                sql_type += f"({column.precision},{column.scale})"
+            elif column.length:
+                sql_type += f"({column.length})"
+            print(f"   {column.name}: {sql_type}{'' if column.nullable else ' NOT NULL'}")
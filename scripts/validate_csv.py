@@ -2,248 +2,791 @@
 """
 CSV Data Validation Script
 Validates the generated CSV files before loading to Redshift
+
+Columns, types, VARCHAR lengths, NUMERIC precision/scale and NOT NULL flags are read
+from sql/redshift_schema.sql, and every column of every row is checked against them.
+
+Every file is read exactly once: the column checks and the collection of the keys
+needed by the referential integrity checks happen in the same pass, and the files
+are validated in parallel worker processes.
+
+A table written as several parts (generate_data.py --csv-parts, --csv-part-target-mb or
+--csv-compression) is validated part by part, in manifest order, as one file: every part
+starts with the header and rows are numbered across the parts.
 """
 
 import os
+import io
 import csv
+import gzip
 import sys
-from collections import defaultdict
+import math
+import hashlib
+import mmap
+import json
+import re
+import uuid
+import argparse
+import functools
+import multiprocessing
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
-def validate_csv_file(filepath, required_fields, table_name):
-    """Validate a single CSV file"""
-    print(f"\n📋 Validating {table_name}...")
+from redshift_schema import DEFAULT_SCHEMA_FILE, load_redshift_schema
+
+# OPTIONAL: numpy keeps the key sets as 16-byte binary UUIDs instead of Python strings
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# OPTIONAL: zstandard reads zstd-compressed parts
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+DELIMITER = '|'
+MAX_ERRORS = 100     # Row checks of a file stop after this many errors (the pass still collects keys)
+BATCH_ROWS = 10000   # Rows parsed per batch
+CHUNK_BYTES = 64 * 1024 * 1024  # Files are split into byte ranges of about this size, parsed in parallel
+COMPRESSED_SUFFIXES = ('.gz', '.zst')  # Compressed parts are read whole, as one range
+
+# Column names, types and NOT NULL flags of every table come from the Redshift DDL
+TABLES = load_redshift_schema()
+
+# Foreign keys checked once every file has been read: table -> [(column, referenced table)]
+FOREIGN_KEYS = {
+    'seller_vertical': [('seller_id', 'sellers'), ('vertical_id', 'verticals')],
+    'commodities': [('seller_id', 'sellers'), ('vertical_id', 'verticals')],
+    'orders': [('consumer_id', 'consumers'), ('seller_id', 'sellers')],
+    'order_commodities': [('order_id', 'orders'), ('commodity_id', 'commodities')],
+    'transactions': [('order_id', 'orders'), ('card_id', 'cards')],
+}
+REFERENCED_TABLES = {table for references in FOREIGN_KEYS.values() for _, table in references}
+
+# ============================================================================
+# KEY SETS
+# ============================================================================
+
+_UUID_HYPHENS = [8, 13, 18, 23]
+_UUID_HEX_DIGITS = [i for i in range(36) if i not in _UUID_HYPHENS]
+if NUMPY_AVAILABLE:
+    # Lower-case hex digit -> value, anything else -> 255 (str(uuid.UUID) is lower case)
+    _HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+    _HEX_VALUES[np.frombuffer(b'0123456789abcdef', dtype=np.uint8)] = np.arange(16, dtype=np.uint8)
+
+def pack_uuids(values):
+    """
+    Canonical UUID strings -> 'S16' array of their 16 bytes, vectorized.
     
-    if not os.path.exists(filepath):
-        print(f"❌ File not found: {filepath}")
-        return False
+    Returns (packed, other): values that are not canonical lower-case UUIDs are
+    returned unchanged in `other` so they can still be compared as strings.
+    """
+    other = []
+    lengths = list(map(len, values))
+    text = ''.join(values)
+    if lengths and (min(lengths) != 36 or max(lengths) != 36 or not text.isascii()):
+        other = [value for value in values if len(value) != 36 or not value.isascii()]
+        values = [value for value in values if len(value) == 36 and value.isascii()]
+        text = ''.join(values)
+    grid = np.frombuffer(text.encode('ascii'), dtype=np.uint8).reshape(len(values), 36)
+    digits = _HEX_VALUES[grid[:, _UUID_HEX_DIGITS]]
+    valid = (grid[:, _UUID_HYPHENS] == ord('-')).all(axis=1) & (digits < 16).all(axis=1)
+    if not valid.all():
+        other += [value for value, ok in zip(values, valid.tolist()) if not ok]
+        digits = digits[valid]
+    packed = (digits[:, 0::2] << 4) | digits[:, 1::2]
+    return np.ascontiguousarray(packed).view('S16').ravel(), other
+
+def unpack_uuid(packed):
+    """'S16' item (numpy strips trailing zero bytes) -> UUID string"""
+    return str(uuid.UUID(bytes=packed.ljust(16, b'\0')))
+
+class KeySet:
+    """
+    Distinct values of a key column.
     
-    errors = []
-    warnings = []
-    row_count = 0
+    With numpy, UUIDs are kept as a sorted, de-duplicated 'S16' array (16 bytes per key
+    instead of ~100 for a str in a set) and looked up in vectorized batches with
+    searchsorted; other values, and every value without numpy, go to a plain set.
+    Columns that repeat values (foreign keys) are de-duplicated batch by batch.
+    """
+    
+    def __init__(self, repeats=False):
+        self.repeats = repeats
+        self._batches = []
+        self.uuids = None
+        self.other = set()
+    
+    def update(self, values):
+        if not NUMPY_AVAILABLE:
+            self.other.update(values)
+            return
+        packed, other = pack_uuids(values)
+        self._batches.append(np.unique(packed) if self.repeats else packed)
+        self.other.update(other)
+    
+    def freeze(self):
+        """Merge the collected batches (call once the column has been read)"""
+        if NUMPY_AVAILABLE:
+            self.uuids = np.unique(np.concatenate(self._batches)) if self._batches else np.empty(0, dtype='S16')
+        self._batches = None
+        return self
+    
+    @classmethod
+    def merge(cls, key_sets):
+        """One KeySet with the values of several frozen ones (e.g. the ranges of a file)"""
+        merged = cls(repeats=key_sets[0].repeats if key_sets else False)
+        for keys in key_sets:
+            merged.other |= keys.other
+            if keys.uuids is not None:
+                merged._batches.append(keys.uuids)
+        return merged.freeze()
+    
+    def __len__(self):
+        return (0 if self.uuids is None else len(self.uuids)) + len(self.other)
+    
+    def contains(self, packed):
+        """Membership of a batch of packed UUIDs (boolean array)"""
+        if not len(self.uuids):
+            return np.zeros(len(packed), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.uuids, packed), len(self.uuids) - 1)
+        return self.uuids[positions] == packed
+    
+    def missing_from(self, parent):
+        """Values of this set that are not in `parent` (a KeySet or BloomKeySet), as strings"""
+        missing = sorted(self.other - parent.other)
+        if self.uuids is not None and len(self.uuids):
+            absent = self.uuids[~parent.contains(self.uuids)]
+            missing = sorted(missing + [unpack_uuid(value) for value in absent.tolist()])
+        return missing
+
+class BloomKeySet:
+    """
+    Bloom filter over a KeySet's UUIDs (about 1.2 bytes per key at a 1% false positive rate).
+    
+    A key the filter rejects is certainly absent, so every violation it reports is exact;
+    the false positive rate bounds the share of violations that can go unnoticed.
+    The bit positions come straight from the key bytes, which are already random.
+    """
+    
+    def __init__(self, keys, false_positive_rate):
+        count = max(len(keys.uuids), 1)
+        self.size = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / count * math.log(2)))
+        self.other = keys.other
+        bits = np.zeros(self.size, dtype=bool)
+        for start in range(0, len(keys.uuids), 1 << 20):
+            for positions in self._positions(keys.uuids[start:start + (1 << 20)]):
+                bits[positions] = True
+        self.bits = np.packbits(bits)
+    
+    def _positions(self, packed):
+        """Double hashing: bit i of a key is (h1 + i * h2) mod size"""
+        halves = np.ascontiguousarray(packed).view(np.uint64).reshape(-1, 2)
+        h1, h2 = halves[:, 0] % self.size, (halves[:, 1] % self.size) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+    
+    def contains(self, packed):
+        found = np.ones(len(packed), dtype=bool)
+        for positions in self._positions(packed):
+            found &= (self.bits[positions >> 3] >> (7 - (positions & 7)).astype(np.uint8)) & 1 == 1
+        return found
+
+# ============================================================================
+# SCHEMA CHECKS
+# ============================================================================
+
+INTEGER_RANGES = {'SMALLINT': 2 ** 15, 'INTEGER': 2 ** 31, 'INT': 2 ** 31, 'BIGINT': 2 ** 63}
+TEXT_TYPES = {'VARCHAR', 'CHAR', 'TEXT', 'CHARACTER', 'BPCHAR'}
+DEFAULT_VARCHAR_LENGTH = 256  # Redshift stores TEXT (and VARCHAR without a length) as VARCHAR(256)
+BOOLEAN_VALUES = {'t', 'true', 'y', 'yes', '1', 'f', 'false', 'n', 'no', '0'}
+
+_UUID = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+# Days valid in every year; February 29th is left to the field-by-field check
+_DATE = r'\d{4}-(?:(?:0[13578]|1[02])-(?:0[1-9]|[12]\d|3[01])|(?:0[469]|11)-(?:0[1-9]|[12]\d|30)|02-(?:0[1-9]|1\d|2[0-8]))'
+_TIMESTAMP = _DATE + r' (?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d{1,6})?'
+_UUID_RE = re.compile(_UUID)
+_INTEGER_RE = re.compile(r'[-+]?\d+')
+_NUMERIC_RE = re.compile(r'[-+]?(\d*)(?:\.(\d*))?')
+_DATETIME_PATTERNS = {'DATE': _DATE, 'TIMESTAMP': _TIMESTAMP}
+# Calendar validity of the field-by-field check comes from datetime.fromisoformat
+_DATETIME_RES = {'DATE': re.compile(r'\d{4}-\d\d-\d\d'),
+                 'TIMESTAMP': re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d{1,6})?')}
+
+def _is_uuid_column(column):
+    """Key columns (id, *_id) stored as VARCHAR(36) hold canonical UUIDs"""
+    return column.type == 'UUID' or (column.type in TEXT_TYPES and column.length == 36
+                                      and (column.name == 'id' or column.name.endswith('_id')))
+
+def _max_bytes(column):
+    """Byte limit of a character column (Redshift counts VARCHAR lengths in bytes)"""
+    if column.type not in TEXT_TYPES:
+        return None
+    return column.length or DEFAULT_VARCHAR_LENGTH
+
+def _value_pattern(column):
+    """
+    Regex of the values the whole-row fast path accepts for a column.
+    
+    It may be stricter than _value_error (e.g. 10-digit integers or quoted values):
+    rows it rejects are only re-checked field by field, never reported on its say-so.
+    """
+    if column is None:
+        return r'[^|"\r\n]*'
+    if _is_uuid_column(column):
+        pattern = _UUID
+    elif column.type in INTEGER_RANGES:
+        pattern = r'-?\d{1,%d}' % (len(str(INTEGER_RANGES[column.type])) - 1)
+    elif column.type in ('NUMERIC', 'DECIMAL'):
+        digits = column.precision - column.scale
+        pattern = r'-?\d{1,%d}' % digits if digits else r'-?0?'
+        if column.scale:
+            pattern += r'(?:\.\d{1,%d})?' % column.scale
+    elif column.type in _DATETIME_PATTERNS:
+        pattern = _DATETIME_PATTERNS[column.type]
+    elif column.type == 'BOOLEAN':
+        pattern = r'(?i:t|true|y|yes|1|f|false|n|no|0)'
+    elif _max_bytes(column):
+        # Characters, not bytes: the fast path only takes ASCII rows
+        pattern = r'[^|"\r\n]{0,%d}' % _max_bytes(column)
+    else:
+        pattern = r'[^|"\r\n]*'
+    if column.nullable:
+        return f'(?:{pattern})?'
+    if _max_bytes(column) is None or _is_uuid_column(column):
+        return pattern  # Never matches a blank value
+    # NOT NULL text: EMPTYASNULL/BLANKSASNULL would load an empty or blank value as NULL
+    return r'(?![ \t]*(?:\||$))%s' % pattern
+
+def _value_error(column, value):
+    """Why a value cannot be loaded into a column, or None"""
+    if value.strip() == '':
+        return None if column.nullable else f"Empty required field '{column.name}'"
+    if _is_uuid_column(column):
+        if not _UUID_RE.fullmatch(value):
+            return f"Invalid UUID in {column.name}: {value!r}"
+    elif column.type in INTEGER_RANGES:
+        limit = INTEGER_RANGES[column.type]
+        if not _INTEGER_RE.fullmatch(value) or not -limit <= int(value) < limit:
+            return f"{column.name}: {value!r} is not a valid {column.type}"
+    elif column.type in ('NUMERIC', 'DECIMAL'):
+        match = _NUMERIC_RE.fullmatch(value)
+        if not match or not (match.group(1) or match.group(2)):
+            return f"{column.name}: {value!r} is not a valid {column.type}"
+        if len(match.group(1).lstrip('0')) > column.precision - column.scale:
+            return f"{column.name}: {value!r} overflows {column.type}({column.precision},{column.scale})"
+        if len(match.group(2) or '') > column.scale:
+            return f"{column.name}: {value!r} has more than {column.scale} decimals"
+    elif column.type in _DATETIME_RES:
+        try:
+            valid = _DATETIME_RES[column.type].fullmatch(value) and datetime.fromisoformat(value)
+        except ValueError:  # e.g. February 30th
+            valid = False
+        if not valid:
+            return f"{column.name}: {value!r} is not a valid {column.type}"
+    elif column.type == 'BOOLEAN':
+        if value.lower() not in BOOLEAN_VALUES:
+            return f"{column.name}: {value!r} is not a valid BOOLEAN"
+    elif _max_bytes(column):
+        size = len(value.encode('utf-8'))
+        if size > _max_bytes(column):
+            return f"{column.name}: {size} bytes exceeds {column.type}({_max_bytes(column)})"
+    return None
+
+@functools.lru_cache(maxsize=None)
+def compile_row_check(columns):
+    """
+    Whole-row regex of a file's columns (ColumnSpecs in header order, None for columns
+    the schema does not know), compiled once per table: a row it matches is valid.
+    """
+    return re.compile(r'\|'.join(_value_pattern(column) for column in columns)).fullmatch
+
+def parse_lines(lines):
+    """
+    Parsed rows of a batch of lines. csv.reader drops a trailing carriage return but
+    rejects line breaks inside unquoted values, so lines with those are split on the
+    delimiter as is.
+    """
+    try:
+        return list(csv.reader(lines, delimiter=DELIMITER))
+    except csv.Error:
+        return [line.removesuffix('\r').split(DELIMITER) if '\r' in line or '\n' in line
+                else next(csv.reader([line], delimiter=DELIMITER), []) for line in lines]
+
+def check_lines(lines, first_row, header, columns, errors, rows=None):
+    """
+    Schema checks of a batch of raw lines (without their line endings); `rows` are
+    the same lines parsed, or None to parse only the lines that need it.
+    
+    Each line is matched against the compiled row regex; only ASCII lines that
+    match it are skipped, every other row is checked field by field.
+    """
+    match = compile_row_check(columns)
+    width = len(columns)
+    suspects = [offset for offset, line in enumerate(lines) if not (match(line) and line.isascii())]
+    for offset in suspects:
+        row = rows[offset] if rows is not None else parse_lines([lines[offset]])[0]
+        i = first_row + offset
+        if lines[offset].endswith('\r'):
+            errors.append((i, "Windows line ending (\\r\\n), files need Unix line endings"))
+        if len(row) != width:
+            errors.append((i, f"Expected {width} fields, found {len(row)}"))
+            continue
+        for field, column, value in zip(header, columns, row):
+            # Pipes would break the delimiter, carriage returns the line endings
+            if DELIMITER in value:
+                errors.append((i, f"Pipe character found in {field}"))
+            if '\r' in value:
+                errors.append((i, f"Carriage return found in {field} (files need Unix line endings)"))
+            if '\n' in value:
+                errors.append((i, f"Newline found in {field} (each row must be a single line)"))
+            error = _value_error(column, value) if column else None
+            if error:
+                errors.append((i, error))
+        
+        if len(errors) >= MAX_ERRORS:
+            return
+
+def split_csv_ranges(filepath, chunk_bytes=CHUNK_BYTES):
+    """
+    Byte ranges (start, end) covering a file's data rows, each about chunk_bytes long.
+    
+    Ranges start right after a newline: export_to_csv writes Unix line endings and
+    strips newlines from values, so every \n ends a row. A compressed file is one range.
+    """
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return [(0, 0)]
+    if str(filepath).endswith(COMPRESSED_SUFFIXES):
+        return [(0, size)]
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = data.find(b'\n') + 1 or size  # Skip the header
+        ranges = []
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_bytes, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges or [(size, size)]
+
+def open_compressed_csv(filepath):
+    """Binary stream of a .gz or .zst file's decompressed bytes"""
+    if str(filepath).endswith('.gz'):
+        return gzip.open(filepath, 'rb')
+    if not ZSTANDARD_AVAILABLE:
+        raise RuntimeError("zstandard not available to read .zst files. Install with: pip install zstandard")
+    stream = zstandard.ZstdDecompressor().stream_reader(open(filepath, 'rb'), read_across_frames=True, closefd=True)
+    return io.BufferedReader(stream)
+
+def line_batches(f, start, end):
+    """
+    Lists of up to BATCH_ROWS lines (without their newlines) of bytes [start, end) of an
+    open CSV file, or of the rest of a compressed stream (start is None).
+    """
+    if start is None:
+        for block in iter(lambda: list(islice(f, BATCH_ROWS)), []):
+            lines = b''.join(block).decode('utf-8').split('\n')
+            if lines[-1] == '':
+                lines.pop()
+            yield lines
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        lines = data[start:end].decode('utf-8').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    for first in range(0, len(lines), BATCH_ROWS):
+        yield lines[first:first + BATCH_ROWS]
+
+def validate_csv_range(filepath, columns, table_name, start, end):
+    """
+    Validate the rows in bytes [start, end) of a CSV file (see split_csv_ranges)
+    against the table's schema columns (ColumnSpecs from redshift_schema).
+    
+    Returns a partial result: the row count, (row, message) errors with row numbers
+    counted from the start of the range, and the KeySets the referential integrity
+    checks need. The range starting right after the header also checks the header;
+    a compressed file is read whole (see split_csv_ranges).
+    """
+    result = {'table': table_name, 'path': str(filepath), 'found': os.path.exists(filepath), 'rows': 0,
+              'errors': [], 'warnings': [], 'ids': None, 'references': {}}
+    if not result['found']:
+        return result
+    errors = result['errors']
+    compressed = str(filepath).endswith(COMPRESSED_SUFFIXES)
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
+        with open_compressed_csv(filepath) if compressed else open(filepath, 'rb') as f:
+            header_line = f.readline()
+            header = next(csv.reader([header_line.decode('utf-8').rstrip('\n')], delimiter=DELIMITER), [])
             
-            # Check headers
-            if set(reader.fieldnames) != set(required_fields):
-                missing = set(required_fields) - set(reader.fieldnames)
-                extra = set(reader.fieldnames) - set(required_fields)
+            # Check headers: COPY maps columns by position, so the order matters too
+            names = [column.name for column in columns]
+            if start <= len(header_line) and header != names:
+                missing = set(names) - set(header)
+                extra = set(header) - set(names)
                 if missing:
-                    errors.append(f"Missing fields: {missing}")
+                    errors.append((None, f"Missing fields: {missing}"))
                 if extra:
-                    warnings.append(f"Extra fields: {extra}")
+                    result['warnings'].append(f"Extra fields: {extra}")
+                if not missing and not extra:
+                    errors.append((None, f"Fields out of schema order: {header}"))
             
-            # Validate rows
-            for i, row in enumerate(reader, start=1):
-                row_count = i
-                
-                # Check for required fields
-                for field in required_fields:
-                    if field not in row or row[field] == '':
-                        # Allow empty values for certain fields
-                        if field not in ['parent_id', 'level', 'description', 'rating_avg', 
-                                       'address_line_2', 'technical_info', 'guarantee_info',
-                                       'manufacturer_name', 'confirmed_at', 'paid_at',
-                                       'shipped_at', 'delivered_at', 'completed_at',
-                                       'days_to_ship', 'days_to_deliver', 'authorized_at',
-                                       'completed_at', 'comment', 'introduction', 'first_order_date']:
-                            errors.append(f"Row {i}: Empty required field '{field}'")
-                
-                # Check for pipe characters in data (would break delimiter)
-                for field, value in row.items():
-                    if value and '|' in value:
-                        errors.append(f"Row {i}: Pipe character found in {field}")
-                
-                # Stop after 100 errors to avoid spam
-                if len(errors) >= 100:
-                    errors.append("... (more than 100 errors, stopping validation)")
-                    break
-        
-        # Summary
-        print(f"   Rows: {row_count:,}")
-        
-        if errors:
-            print(f"   ❌ {len(errors)} errors found:")
-            for error in errors[:10]:  # Show first 10 errors
-                print(f"      • {error}")
-            if len(errors) > 10:
-                print(f"      ... and {len(errors) - 10} more errors")
-            return False
-        
-        if warnings:
-            print(f"   ⚠️  {len(warnings)} warnings:")
-            for warning in warnings:
-                print(f"      • {warning}")
-        
-        print(f"   ✅ Valid")
+            specs = {column.name: column for column in columns}
+            header_columns = tuple(specs.get(field) for field in header)
+            positions = {field: index for index, field in enumerate(header)}
+            key_columns = []
+            if table_name in REFERENCED_TABLES and 'id' in positions:
+                result['ids'] = KeySet()
+                key_columns.append((positions['id'], result['ids']))
+            for column, _ in FOREIGN_KEYS.get(table_name, ()):
+                if column in positions:
+                    result['references'][column] = KeySet(repeats=True)
+                    key_columns.append((positions[column], result['references'][column]))
+            
+            if end > start:
+                for batch in line_batches(f, None if compressed else start, end):
+                    rows = parse_lines(batch)
+                    if len(rows) != len(batch):
+                        # A quoted value spanned lines: treat every line as a row, like the ranges do
+                        rows = [parse_lines([line])[0] for line in batch]
+                    if len(errors) < MAX_ERRORS:
+                        check_lines(batch, result['rows'] + 1, header, header_columns, errors, rows)
+                    for index, keys in key_columns:
+                        try:
+                            keys.update(list(map(itemgetter(index), rows)))
+                        except IndexError:  # Short rows (already reported) have no key
+                            keys.update([row[index] for row in rows if len(row) > index])
+                    result['rows'] += len(rows)
+            
+            for _, keys in key_columns:
+                keys.freeze()
+    except Exception as e:
+        result['exception'] = str(e)
+    return result
+
+def merge_range_results(parts, bloom_fpr=None):
+    """
+    Combine the partial results of one table's ranges (in file order, over all its parts)
+    into its result.
+    
+    Row numbers become global, errors are capped at MAX_ERRORS and formatted, and the
+    KeySets are merged ('ids' becomes a BloomKeySet when bloom_fpr is set).
+    A missing part makes the table's result not found.
+    """
+    result = dict(next((part for part in parts if not part['found']), parts[0]), rows=0, errors=[], warnings=[],
+                  parts=len({part['path'] for part in parts}))
+    for part in parts:
+        for row, message in part['errors']:
+            if len(result['errors']) < MAX_ERRORS:
+                result['errors'].append(message if row is None else f"Row {result['rows'] + row}: {message}")
+            else:
+                break
+        result['warnings'] += part['warnings']
+        result['rows'] += part['rows']
+        if 'exception' in part:
+            result.setdefault('exception', part['exception'])
+    if len(result['errors']) >= MAX_ERRORS:
+        result['errors'].append(f"... (more than {MAX_ERRORS} errors, stopping validation)")
+    
+    if result['ids'] is not None:
+        result['ids'] = KeySet.merge([part['ids'] for part in parts if part['ids'] is not None])
+        if bloom_fpr:
+            result['ids'] = BloomKeySet(result['ids'], bloom_fpr)
+    result['references'] = {column: KeySet.merge([part['references'][column] for part in parts
+                                                  if column in part['references']])
+                            for column in result['references']}
+    return result
+
+def validate_csv_file(filepath, columns, table_name, bloom_fpr=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Validate a single CSV file in one pass, range by range in this process.
+    
+    Returns a result dict with the row count, errors and warnings, plus the KeySets the
+    referential integrity checks need: the file's ids if other tables reference it
+    ('ids', a BloomKeySet when bloom_fpr is set) and its foreign key columns ('references').
+    """
+    ranges = split_csv_ranges(filepath, chunk_bytes) if os.path.exists(filepath) else [(0, 0)]
+    parts = [validate_csv_range(filepath, columns, table_name, start, end) for start, end in ranges]
+    return merge_range_results(parts, bloom_fpr)
+
+def report_csv_file(result):
+    """Print one file's validation result; returns whether it is valid"""
+    print(f"\n📋 Validating {result['table']}...")
+    
+    if not result['found']:
+        print(f"❌ File not found: {result['path']}")
+        return False
+    if 'exception' in result:
+        print(f"   ❌ Error reading file: {result['exception']}")
+        return False
+    
+    # Summary
+    errors = result['errors']
+    warnings = result['warnings']
+    print(f"   Rows: {result['rows']:,}" + (f" in {result['parts']} parts" if result.get('parts', 1) > 1 else ""))
+    if result.get('trusted'):
+        print(f"   ✅ Valid (checked while generating, checksum matches {VALIDATION_REPORT_FILE})")
         return True
     
-    except Exception as e:
-        print(f"   ❌ Error reading file: {e}")
+    if errors:
+        print(f"   ❌ {len(errors)} errors found:")
+        for error in errors[:10]:  # Show first 10 errors
+            print(f"      • {error}")
+        if len(errors) > 10:
+            print(f"      ... and {len(errors) - 10} more errors")
         return False
+    
+    if warnings:
+        print(f"   ⚠️  {len(warnings)} warnings:")
+        for warning in warnings:
+            print(f"      • {warning}")
+    
+    print(f"   ✅ Valid")
+    return True
 
-def validate_referential_integrity(output_dir):
-    """Validate foreign key relationships"""
+def validate_referential_integrity(results):
+    """Validate foreign key relationships with the keys collected by validate_csv_file"""
     print("\n🔗 Validating referential integrity...")
     
     errors = []
+    for table, references in FOREIGN_KEYS.items():
+        print(f"   Checking {table}...")
+        result = results.get(table)
+        if result is None or not result['found']:
+            errors.append(f"{table}: File not found")
+            continue
+        for column, referenced in references:
+            if result.get('trusted') and results.get(referenced, {}).get('trusted'):
+                continue  # Checked while generating
+            values = result['references'].get(column)
+            ids = results[referenced]['ids'] if referenced in results else None
+            if values is None or ids is None:
+                errors.append(f"{table}: Cannot check {column} (column or {referenced} ids missing)")
+                continue
+            for value in values.missing_from(ids):
+                errors.append(f"{table}: Invalid {column} {value}")
+    
+    if errors:
+        print(f"   ❌ {len(errors)} referential integrity errors:")
+        for error in errors[:10]:
+            print(f"      • {error}")
+        if len(errors) > 10:
+            print(f"      ... and {len(errors) - 10} more errors")
+        return False
     
+    print("   ✅ All references valid")
+    return True
+
+# ============================================================================
+# VALIDATION REPORT
+# ============================================================================
+# generate_data.py with CONFIG['inline_validation'] runs the checks above on every
+# row as it writes it and records each file's result in validation_report.json.
+# A file the report marks valid whose SHA-256 still matches is not read again.
+
+VALIDATION_REPORT_FILE = 'validation_report.json'
+VALIDATION_REPORT_VERSION = 1
+
+def file_sha256(path, block_bytes=8 * 1024 * 1024):
+    """Hex SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(functools.partial(f.read, block_bytes), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_validation_report(output_dir, files, schema_path=DEFAULT_SCHEMA_FILE):
+    """
+    Write validation_report.json; `files` maps each CSV file name to its
+    {'table', 'rows', 'bytes', 'sha256', 'errors'}. Returns the path.
+    """
+    report = {
+        'version': VALIDATION_REPORT_VERSION,
+        'schema': os.path.basename(schema_path),
+        'schema_sha256': file_sha256(schema_path),
+        'foreign_keys': {table: [f'{column} -> {referenced}.id' for column, referenced in references]
+                         for table, references in FOREIGN_KEYS.items()},
+        'files': files,
+    }
+    path = os.path.join(output_dir, VALIDATION_REPORT_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def trusted_files(output_dir, tables, schema_path=DEFAULT_SCHEMA_FILE):
+    """
+    {table: report entry} of the files validation_report.json marks valid and whose
+    size and SHA-256 still match. Nothing is trusted when the report was written
+    against another schema.
+    """
+    path = Path(output_dir) / VALIDATION_REPORT_FILE
     try:
-        # Load all IDs
-        ids = defaultdict(set)
-        
-        # Users
-        with open(f"{output_dir}/users.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['users'].add(row['id'])
-        
-        # Verticals
-        with open(f"{output_dir}/verticals.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['verticals'].add(row['id'])
-        
-        # Sellers
-        with open(f"{output_dir}/sellers.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['sellers'].add(row['id'])
-        
-        # Consumers
-        with open(f"{output_dir}/consumers.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['consumers'].add(row['id'])
-        
-        # Commodities
-        with open(f"{output_dir}/commodities.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['commodities'].add(row['id'])
-        
-        # Orders
-        with open(f"{output_dir}/orders.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['orders'].add(row['id'])
-        
-        # Cards
-        with open(f"{output_dir}/cards.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for row in reader:
-                ids['cards'].add(row['id'])
-        
-        # Validate seller_vertical references
-        print("   Checking seller_vertical...")
-        with open(f"{output_dir}/seller_vertical.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for i, row in enumerate(reader, start=1):
-                if row['seller_id'] not in ids['sellers']:
-                    errors.append(f"seller_vertical row {i}: Invalid seller_id {row['seller_id']}")
-                if row['vertical_id'] not in ids['verticals']:
-                    errors.append(f"seller_vertical row {i}: Invalid vertical_id {row['vertical_id']}")
-        
-        # Validate commodities references
-        print("   Checking commodities...")
-        with open(f"{output_dir}/commodities.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for i, row in enumerate(reader, start=1):
-                if row['seller_id'] not in ids['sellers']:
-                    errors.append(f"commodities row {i}: Invalid seller_id {row['seller_id']}")
-                if row['vertical_id'] not in ids['verticals']:
-                    errors.append(f"commodities row {i}: Invalid vertical_id {row['vertical_id']}")
-        
-        # Validate orders references
-        print("   Checking orders...")
-        with open(f"{output_dir}/orders.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for i, row in enumerate(reader, start=1):
-                if row['consumer_id'] not in ids['consumers']:
-                    errors.append(f"orders row {i}: Invalid consumer_id {row['consumer_id']}")
-                if row['seller_id'] not in ids['sellers']:
-                    errors.append(f"orders row {i}: Invalid seller_id {row['seller_id']}")
-        
-        # Validate order_commodities references
-        print("   Checking order_commodities...")
-        with open(f"{output_dir}/order_commodities.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for i, row in enumerate(reader, start=1):
-                if row['order_id'] not in ids['orders']:
-                    errors.append(f"order_commodities row {i}: Invalid order_id")
-                if row['commodity_id'] not in ids['commodities']:
-                    errors.append(f"order_commodities row {i}: Invalid commodity_id")
-        
-        # Validate transactions references
-        print("   Checking transactions...")
-        with open(f"{output_dir}/transactions.csv", 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='|')
-            for i, row in enumerate(reader, start=1):
-                if row['order_id'] not in ids['orders']:
-                    errors.append(f"transactions row {i}: Invalid order_id")
-                if row['card_id'] not in ids['cards']:
-                    errors.append(f"transactions row {i}: Invalid card_id")
-        
-        if errors:
-            print(f"   ❌ {len(errors)} referential integrity errors:")
-            for error in errors[:10]:
-                print(f"      • {error}")
-            if len(errors) > 10:
-                print(f"      ... and {len(errors) - 10} more errors")
-            return False
-        
-        print("   ✅ All references valid")
-        return True
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if report.get('version') != VALIDATION_REPORT_VERSION or report.get('schema_sha256') != file_sha256(schema_path):
+        return {}
     
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
+    trusted = {}
+    for table_name in tables:
+        entry = report['files'].get(f'{table_name}.csv')
+        filepath = Path(output_dir) / f'{table_name}.csv'
+        if (entry and not entry['errors'] and filepath.exists() and filepath.stat().st_size == entry['bytes']
+                and file_sha256(filepath) == entry['sha256']):
+            trusted[table_name] = entry
+    return trusted
+
+_PART_FILE_RE = r'\.part\d{4}\.csv(?:\.gz|\.zst)?'
+
+def table_files(output_dir, table_name):
+    """
+    A table's CSV files in row order: <table>.csv, or the parts of split output listed in
+    <table>.manifest (or found as <table>.partNNNN.csv[.gz|.zst] without one).
+    A table without files gives [<table>.csv], which is reported as not found.
+    """
+    output_dir = Path(output_dir)
+    single = output_dir / f"{table_name}.csv"
+    manifest = output_dir / f"{table_name}.manifest"
+    if single.exists():
+        return [single]
+    if manifest.exists():
+        with open(manifest, 'r', encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+        # Entries point at the upload location; the parts are next to the manifest
+        return [output_dir / entry['url'].rsplit('/', 1)[-1] for entry in entries]
+    parts = sorted(path for path in output_dir.glob(f"{table_name}.part*")
+                   if re.fullmatch(re.escape(table_name) + _PART_FILE_RE, path.name))
+    return parts or [single]
+
+def _validate_range_task(task):
+    return validate_csv_range(*task)
+
+def validate_output_dir(output_dir, workers=None, bloom_fpr=None, chunk_bytes=CHUNK_BYTES, tables=None,
+                        trusted=None):
+    """
+    Validate the file (or parts, see table_files) of every schema table (default: TABLES)
+    in an output directory; returns {table: result}
+    
+    Files are split into byte ranges (compressed parts are one range each) and a pool of
+    worker processes validates the ranges of all files, so one large file does not keep
+    a single core busy.
+    Files in `trusted` (see trusted_files) are only read when a foreign key links
+    them to a file that is not trusted, for its ids or references.
+    """
+    tables = tables or TABLES
+    trusted = trusted or {}
+    linked = set()
+    for table_name, references in FOREIGN_KEYS.items():
+        for _, referenced in references:
+            if (table_name in trusted) != (referenced in trusted):
+                linked.update((table_name, referenced))
+    
+    results = {table_name: {'table': table_name, 'path': str(Path(output_dir) / f"{table_name}.csv"),
+                            'found': True, 'rows': entry['rows'], 'errors': [], 'warnings': [],
+                            'ids': None, 'references': {}, 'trusted': True}
+               for table_name, entry in trusted.items() if table_name not in linked}
+    files = [(table_files(output_dir, table_name), columns, table_name)
+             for table_name, columns in tables.items() if table_name not in results]
+    # Largest tables first so their ranges do not start last
+    files.sort(key=lambda file: sum(path.stat().st_size for path in file[0] if path.exists()), reverse=True)
+    tasks = []
+    for paths, columns, table_name in files:
+        for path in paths:
+            ranges = split_csv_ranges(path, chunk_bytes) if path.exists() else [(0, 0)]
+            tasks += [(path, columns, table_name, start, end) for start, end in ranges]
+    range_counts = Counter(task[2] for task in tasks)
+    
+    if not tasks:
+        return results
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    parts = pool.imap(_validate_range_task, tasks) if pool else map(_validate_range_task, tasks)
+    
+    # imap yields in task order, so each file's ranges arrive in file order
+    pending = defaultdict(list)
+    try:
+        for part in parts:
+            table_name = part['table']
+            pending[table_name].append(part)
+            if len(pending[table_name]) == range_counts[table_name]:
+                results[table_name] = merge_range_results(pending.pop(table_name), bloom_fpr)
+                results[table_name]['trusted'] = table_name in trusted
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return results
 
 def main():
     """Main validation"""
+    parser = argparse.ArgumentParser(description="Validate generated CSV files before loading to Redshift")
+    parser.add_argument('output_dir', nargs='?',
+                        help="directory to validate (default: the latest csv_output_* next to this script)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 1024 / 1024,
+                        help="split files into byte ranges of about this many MB, validated in parallel")
+    parser.add_argument('--bloom-fpr', type=float, default=None, metavar='RATE',
+                        help="keep the referenced ids in Bloom filters with this false positive rate "
+                             "(e.g. 0.001) instead of exact sorted arrays; needs numpy")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA_FILE,
+                        help="Redshift DDL the columns are checked against (default: sql/redshift_schema.sql)")
+    parser.add_argument('--ignore-report', action='store_true',
+                        help=f"read every file even if {VALIDATION_REPORT_FILE} says it was validated while generating")
+    args = parser.parse_args()
+    
+    if not NUMPY_AVAILABLE:
+        print("⚠️  numpy not available, keeping keys as Python strings. Install with: pip install numpy")
+        args.bloom_fpr = None
+    if args.bloom_fpr is not None and not 0 < args.bloom_fpr < 1:
+        parser.error("--bloom-fpr must be between 0 and 1")
+    
     print("=" * 60)
     print("🔍 CSV DATA VALIDATION")
     print("=" * 60)
     
-    # Find latest output directory
-    script_dir = Path(__file__).parent
-    output_dirs = sorted([d for d in script_dir.glob("csv_output_*") if d.is_dir()])
-    
-    if not output_dirs:
-        print("❌ No CSV output directories found")
-        sys.exit(1)
-    
-    output_dir = output_dirs[-1]
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+    else:
+        # Find latest output directory
+        script_dir = Path(__file__).parent
+        output_dirs = sorted([d for d in script_dir.glob("csv_output_*") if d.is_dir()])
+        
+        if not output_dirs:
+            print("❌ No CSV output directories found")
+            sys.exit(1)
+        
+        output_dir = output_dirs[-1]
     print(f"Validating: {output_dir.name}")
+    tables = load_redshift_schema(args.schema)
+    print(f"Schema: {Path(args.schema).name} ({len(tables)} tables)")
     
-    # Define schema
-    schemas = {
-        'users.csv': ['id', 'username', 'phone', 'name', 'email', 'status', 'created_at', 'updated_at'],
-        'consumers.csv': ['id', 'birthday', 'gender', 'first_order_date', 'total_orders', 'total_spent', 'customer_segment'],
-        'sellers.csv': ['id', 'type', 'introduction', 'address', 'city', 'province', 'country', 'rating_avg', 'total_sales', 'total_orders'],
-        'verticals.csv': ['id', 'name', 'description', 'status'],
-        'seller_vertical.csv': ['seller_id', 'vertical_id', 'created_at', 'updated_at'],
-        'address_books.csv': ['id', 'user_id', 'address_line_1', 'address_line_2', 'city', 'province', 'country', 'postal_code', 'phone', 'receiver_name', 'is_default', 'latitude', 'longitude', 'created_at', 'updated_at'],
-        'commodities.csv': ['id', 'seller_id', 'sku', 'name', 'price', 'cost_price', 'quantity', 'reserved_quantity', 'reorder_level', 'reorder_quantity', 'weight_kg', 'description', 'technical_info', 'guarantee_info', 'manufacturer_name', 'vertical_id', 'status', 'rating_avg', 'review_count', 'total_sold', 'created_at', 'updated_at'],
-        'cards.csv': ['id', 'consumer_id', 'tk', 'provider', 'last4', 'card_holder', 'exp_year', 'exp_month', 'status', 'is_default', 'created_at', 'updated_at'],
-        'orders.csv': ['id', 'consumer_id', 'seller_id', 'status', 'delivery_address', 'delivery_postal_code', 'delivery_receiver', 'delivery_phone', 'delivery_city', 'delivery_country', 'delivery_latitude', 'delivery_longitude', 'subtotal_amount', 'tax_amount', 'shipping_fee', 'discount_amount', 'total_amount', 'created_at', 'confirmed_at', 'paid_at', 'shipped_at', 'delivered_at', 'completed_at', 'updated_at', 'days_to_ship', 'days_to_deliver'],
-        'order_commodities.csv': ['order_id', 'commodity_id', 'quantity', 'unit_price', 'unit_cost', 'line_total', 'discount_applied'],
-        'transactions.csv': ['id', 'order_id', 'card_id', 'payment_method', 'transaction_type', 'amount', 'status', 'created_at', 'authorized_at', 'completed_at', 'gateway_transaction_id', 'gateway_response_code', 'gateway_response_message', 'ip_address', 'user_agent'],
-        'reviews.csv': ['id', 'order_id', 'commodity_id', 'consumer_id', 'seller_id', 'rate', 'comment', 'status', 'is_verified_purchase', 'helpful_count', 'created_at', 'updated_at', 'published_at'],
-    }
+    # Files validated while generating and unchanged since are not read again
+    trusted = {} if args.ignore_report else trusted_files(output_dir, tables, args.schema)
+    if trusted:
+        print(f"{VALIDATION_REPORT_FILE}: {len(trusted)} of {len(tables)} files unchanged since generation")
+    
+    # Read every other file once, in parallel
+    results = validate_output_dir(output_dir, args.workers, args.bloom_fpr, int(args.chunk_mb * 1024 * 1024),
+                                  tables, trusted)
     
     # Validate each file
     all_valid = True
-    for filename, fields in schemas.items():
-        filepath = output_dir / filename
-        table_name = filename.replace('.csv', '')
-        if not validate_csv_file(filepath, fields, table_name):
+    for table_name in tables:
+        if not report_csv_file(results[table_name]):
             all_valid = False
     
     # Validate referential integrity
-    if not validate_referential_integrity(output_dir):
+    if not validate_referential_integrity(results):
         all_valid = False
     
     # Summary